@@ -0,0 +1,202 @@
+# ============================================================
+# ALMACÉN SQLITE DE LA BASE LIMPIA (consultas con índices)
+# Las salidas limpias son CSV planos: cualquier pregunta implica
+# leer el archivo entero con pandas. Acá se vuelcan a un único
+# archivo SQLite (biblioteca estándar, sin servidor) con:
+#   personas       ← personas_2016_2025_todos_trimestres_limpio.csv
+#   ipc            ← ipc_trimestral.csv
+#   ingreso_train  ← processed/eph_train_ingreso_real.csv
+#   imputaciones   ← processed/missing_imputado_<aglomerado>.csv
+#   tasas_trimestrales ← processed/tasas_streaming.csv
+# índices sobre la CLAVE (codusu, nro_hogar, componente, ano4,
+# trimestre), el período y el aglomerado, y vistas con la
+# desocupación (v_tasas, v_tasas_sexo) e ingresos reales (v_ingresos).
+# personas sólo tiene ESTADO 1/2 (universo de limpieza_tp): la
+# actividad y el empleo, que necesitan a los inactivos, salen de
+# tasas_trimestrales (tasas_streaming, sobre los TXT crudos).
+# La carga es por bloques dentro de una transacción y los índices
+# se crean al final; se escribe a un archivo temporal y se
+# renombra, así una carga cortada no deja la base a medias.
+#   python almacen_sqlite.py                       # arma processed/eph.sqlite
+#   python almacen_sqlite.py "SELECT * FROM tasas_trimestrales WHERE aglomerado = 9"
+# ============================================================
+
+import os
+import sqlite3
+import sys
+import pandas as pd
+from pathlib import Path
+
+from datos_analisis import FUENTE
+
+# ---------------------- Configuración -----------------------
+DB_PATH = Path("processed") / "eph.sqlite"
+CHUNK = 50_000
+
+# tabla → fuentes (las que existan); todas las columnas quedan en minúscula
+TABLAS = {
+    "personas": [FUENTE],
+    "ipc": ["ipc_trimestral.csv"],
+    "ingreso_train": ["processed/eph_train_ingreso_real.csv"],
+    "imputaciones": ["processed/missing_imputado_posadas.csv", "processed/missing_imputado_rada_tilly.csv"],
+    "tasas_trimestrales": ["processed/tasas_streaming.csv"],
+}
+
+CLAVE = ["codusu", "nro_hogar", "componente", "ano4", "trimestre"]
+
+# tabla → [(nombre del índice, columnas)]
+INDICES = {
+    "personas": [("clave", CLAVE), ("periodo", ["ano4", "trimestre"]), ("aglomerado", ["aglomerado", "ano4", "trimestre"])],
+    "ipc": [("periodo", ["ano4", "trimestre"])],
+    "ingreso_train": [("clave", CLAVE), ("periodo", ["ano4", "trimestre"]), ("aglomerado", ["aglomerado", "ano4", "trimestre"])],
+    "imputaciones": [("clave", CLAVE), ("periodo", ["ano4", "trimestre"]), ("aglomerado", ["aglomerado", "ano4", "trimestre"])],
+    "tasas_trimestrales": [("aglomerado", ["aglomerado", "ano4", "trimestre"])],
+}
+
+# Sobre personas (sólo PEA: ESTADO 1/2) sale únicamente la desocupación,
+# con la misma definición que tasas_streaming: desocupados / PEA.
+# Actividad y empleo: tabla tasas_trimestrales.
+_TASAS = """
+    SUM(CASE WHEN estado IN (1, 2) THEN pondera ELSE 0 END)   AS pea,
+    SUM(CASE WHEN estado = 1 THEN pondera ELSE 0 END)         AS ocupados,
+    SUM(CASE WHEN estado = 2 THEN pondera ELSE 0 END)         AS desocupados,
+    100.0 * SUM(CASE WHEN estado = 2 THEN pondera ELSE 0 END)
+          / NULLIF(SUM(CASE WHEN estado IN (1, 2) THEN pondera ELSE 0 END), 0)                AS tasa_desocupacion
+"""
+
+VISTAS = {
+    "v_tasas": f"""
+        SELECT ano4, trimestre, aglomerado, {_TASAS}
+        FROM personas GROUP BY ano4, trimestre, aglomerado""",
+    "v_tasas_sexo": f"""
+        SELECT ano4, trimestre, aglomerado, ch04 AS sexo, {_TASAS}
+        FROM personas GROUP BY ano4, trimestre, aglomerado, ch04""",
+    # ingreso real observado (train) + imputado (faltantes) por persona
+    "v_ingresos": """
+        SELECT codusu, nro_hogar, componente, ano4, trimestre, aglomerado, pondera,
+               p21_real_2025 AS ingreso_real, 0 AS imputado
+        FROM ingreso_train
+        UNION ALL
+        SELECT codusu, nro_hogar, componente, ano4, trimestre, aglomerado, pondera,
+               p21_real_2025_imputado AS ingreso_real, 1 AS imputado
+        FROM imputaciones""",
+}
+
+
+# ---------------------- Carga -------------------------------
+def _tipo_sql(dtype) -> str:
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    return "TEXT"
+
+
+def _columnas_unicas(df: pd.DataFrame) -> pd.DataFrame:
+    """Minúsculas; SQLite no distingue mayúsculas, así que ANO4/ano4 quedan una sola vez."""
+    df = df.rename(columns=str.lower)
+    return df.loc[:, ~df.columns.duplicated()]
+
+
+def _insertar(con, tabla: str, df: pd.DataFrame, columnas: list):
+    """Inserta el bloque respetando las columnas de la tabla (las que falten quedan NULL)."""
+    df = df.reindex(columns=columnas)
+    marcas = ", ".join("?" * len(columnas))
+    filas = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    con.executemany(f'INSERT INTO "{tabla}" VALUES ({marcas})', filas)
+
+
+def cargar_tabla(con, tabla: str, fuentes: list, chunk: int = CHUNK) -> int:
+    """Crea la tabla con los tipos del primer bloque y carga todas las fuentes por bloques."""
+    columnas, filas = None, 0
+    for fuente in fuentes:
+        for bloque in pd.read_csv(fuente, chunksize=chunk, low_memory=False):
+            bloque = _columnas_unicas(bloque)
+            if columnas is None:
+                columnas = list(bloque.columns)
+                defs = ", ".join(f'"{c}" {_tipo_sql(bloque[c].dtype)}' for c in columnas)
+                con.execute(f'CREATE TABLE "{tabla}" ({defs})')
+            _insertar(con, tabla, bloque, columnas)
+            filas += len(bloque)
+    return filas
+
+
+def _crear_indices(con, tabla: str):
+    existentes = {r[1] for r in con.execute(f'PRAGMA table_info("{tabla}")')}
+    for nombre, cols in INDICES.get(tabla, []):
+        if set(cols) <= existentes:
+            lista = ", ".join(f'"{c}"' for c in cols)
+            con.execute(f'CREATE INDEX "ix_{tabla}_{nombre}" ON "{tabla}" ({lista})')
+
+
+def _crear_vistas(con, tablas: set):
+    requeridas = {"v_tasas": {"personas"}, "v_tasas_sexo": {"personas"},
+                  "v_ingresos": {"ingreso_train", "imputaciones"}}
+    for vista, sql in VISTAS.items():
+        if requeridas[vista] <= tablas:
+            con.execute(f'CREATE VIEW "{vista}" AS {sql}')
+
+
+def construir(db_path: Path = DB_PATH, tablas: dict = TABLAS) -> dict:
+    """Arma la base completa en un temporal y la renombra; devuelve filas por tabla."""
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = db_path.with_name(db_path.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+
+    con = sqlite3.connect(tmp)
+    try:
+        # es un archivo nuevo que se descarta si algo falla: sin diario ni fsync
+        con.execute("PRAGMA journal_mode = OFF")
+        con.execute("PRAGMA synchronous = OFF")
+        conteos = {}
+        with con:
+            for tabla, fuentes in tablas.items():
+                fuentes = [f for f in fuentes if Path(f).exists()]
+                if not fuentes:
+                    print(f"   ! {tabla}: no hay archivos fuente, se omite")
+                    continue
+                conteos[tabla] = cargar_tabla(con, tabla, fuentes)
+                print(f"   + {tabla}: {conteos[tabla]} filas")
+            for tabla in conteos:
+                _crear_indices(con, tabla)
+            _crear_vistas(con, set(conteos))
+        con.execute("ANALYZE")
+    finally:
+        con.close()
+
+    os.replace(tmp, db_path)
+    return conteos
+
+
+# ---------------------- Consultas --------------------------
+def conectar(db_path: Path = DB_PATH) -> sqlite3.Connection:
+    """Conexión de sólo lectura a la base ya armada."""
+    if not Path(db_path).exists():
+        raise FileNotFoundError(f"No existe {db_path}: correr primero 'python almacen_sqlite.py'")
+    return sqlite3.connect(f"file:{Path(db_path).as_posix()}?mode=ro", uri=True)
+
+
+def consultar(sql: str, params=(), db_path: Path = DB_PATH) -> pd.DataFrame:
+    """Resultado de una consulta como DataFrame (sólo las filas pedidas)."""
+    con = conectar(db_path)
+    try:
+        return pd.read_sql_query(sql, con, params=params)
+    finally:
+        con.close()
+
+
+# ---------------------- Proceso principal -------------------
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv:
+        print(consultar(" ".join(argv)).to_string(index=False))
+        return
+
+    print(f"1) Cargando CSV en {DB_PATH}…")
+    conteos = construir(DB_PATH)
+    print(f"✅ Listo: {DB_PATH} ({sum(conteos.values())} filas en {len(conteos)} tablas)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# ============================================================
+# BENCHMARK DE MODELOS DE IMPUTACIÓN POR AGLOMERADO
+# Compara árbol (tree) vs boosting por histogramas (boosting) vs
+# Ridge (linear) con la misma partición 80/20 de modelo.py:
+#   - tiempo de entrenamiento
+#   - velocidad de predicción (filas por segundo)
+#   - pico de memoria durante el fit (tracemalloc)
+#   - MAE / RMSE / R²
+# Para elegir modelo mirando velocidad y error juntos.
+# ============================================================
+
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+from sklearn.base import clone
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from modelo import load_clean_data, build_feature_sets, build_pipeline, MODEL_TYPES
+
+# ---------------------- Configuración -----------------------
+OUTPUT_PATH = Path("processed") / "benchmark_modelos.csv"
+
+MIN_FILAS = 200
+REPETICIONES_PREDICT = 5
+
+
+# ---------------------- Medición ---------------------------
+def medir_modelo(X, y, numeric, categorical, model_type, medir_memoria=True) -> dict:
+    """Entrena un modelo y devuelve tiempos, memoria y métricas."""
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+    pipe = build_pipeline(numeric, categorical, model_type)
+
+    t0 = time.perf_counter()
+    pipe.fit(X_train, y_train)
+    t_fit = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    for _ in range(REPETICIONES_PREDICT):
+        pred = pipe.predict(X_test)
+    t_pred = (time.perf_counter() - t0) / REPETICIONES_PREDICT
+
+    fila = {
+        "modelo": model_type,
+        "filas_train": len(X_train),
+        "fit_seg": t_fit,
+        "predict_filas_por_seg": len(X_test) / t_pred if t_pred > 0 else float("nan"),
+        "mae": mean_absolute_error(y_test, pred),
+        "rmse": mean_squared_error(y_test, pred) ** 0.5,
+        "r2": r2_score(y_test, pred),
+    }
+
+    # el pico de memoria se mide en un fit aparte (tracemalloc frena el fit)
+    if medir_memoria:
+        tracemalloc.start()
+        clone(pipe).fit(X_train, y_train)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        fila["pico_memoria_mb"] = pico / 1024 ** 2
+
+    return fila
+
+
+def benchmark(df_train: pd.DataFrame, modelos=MODEL_TYPES, medir_memoria=True) -> pd.DataFrame:
+    """Una fila por aglomerado × modelo."""
+    filas = []
+    for aglo, gr in df_train.groupby("AGLOMERADO"):
+        X, y, numeric, categorical, _ = build_feature_sets(gr)
+        if len(X) < MIN_FILAS:
+            print(f"[AVISO] Aglomerado {aglo}: sólo {len(X)} filas, se omite.")
+            continue
+        for model_type in modelos:
+            fila = medir_modelo(X, y, numeric, categorical, model_type, medir_memoria)
+            fila = {"aglomerado": aglo, **fila}
+            filas.append(fila)
+            print(f"   aglomerado {aglo} | {model_type:8s} | fit {fila['fit_seg']:.2f}s | R² {fila['r2']:.3f}")
+    return pd.DataFrame(filas)
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    print("1) Cargando datos limpios…")
+    df_train, _ = load_clean_data()
+
+    print("2) Benchmark por aglomerado…")
+    tabla = benchmark(df_train)
+
+    OUTPUT_PATH.parent.mkdir(exist_ok=True)
+    tabla.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ Listo: {OUTPUT_PATH}")
+    print(tabla.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
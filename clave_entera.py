@@ -0,0 +1,139 @@
+# ============================================================
+# CLAVE COMPUESTA COMO UN SOLO ENTERO (int64)
+# CLAVE = CODUSU (texto de 29 caracteres) + NRO_HOGAR + COMPONENTE
+#         + ANO4 + TRIMESTRE + AGLOMERADO
+# Cada columna se codifica una vez (factorize ordenado) y los códigos
+# se combinan en base mixta en un único int64, que respeta el mismo
+# orden que groupby(CLAVE). Con eso, y una huella por fila (hash de
+# todas las columnas) para los duplicados exactos, el diagnóstico y
+# la resolución de duplicados son ordenamientos y comparaciones de
+# enteros, sin volver a hashear CODUSU.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+# ---------------------- Configuración -----------------------
+CLAVE = ["CODUSU", "NRO_HOGAR", "COMPONENTE", "ANO4", "TRIMESTRE", "AGLOMERADO"]
+
+# Criterio de "mejor fila" (mismo que elegir_mejor)
+VARS_INFO = ["ESTADO", "CAT_OCUP", "CH04", "CH06", "PP3E_TOT", "PP3F_TOT", "P47T", "PONDERA", "H15"]
+
+
+# ---------------------- Codificación ------------------------
+def codificar_clave(df: pd.DataFrame, clave=CLAVE):
+    """
+    Devuelve (codigo int64, completa bool).
+    - Filas con la misma clave (NA == NA, como en duplicated) tienen el mismo código.
+    - El orden de los códigos es el orden lexicográfico de la clave.
+    - completa: la fila no tiene NA en ninguna columna de la clave.
+    """
+    codigo = np.zeros(len(df), dtype=np.int64)
+    completa = np.ones(len(df), dtype=bool)
+    base_total = 1
+
+    for c in clave:
+        codigos, niveles = pd.factorize(df[c], sort=True, use_na_sentinel=False)
+        base = max(len(niveles), 1)
+        base_total *= base
+        if base_total >= 2 ** 63:
+            # no entra en 64 bits: se numeran las claves distintas (caso raro)
+            return _codificar_por_grupos(df, clave), df[clave].notna().all(axis=1).to_numpy()
+        codigo = codigo * base + codigos
+        completa &= df[c].notna().to_numpy()
+
+    return codigo, completa
+
+
+def _codificar_por_grupos(df: pd.DataFrame, clave) -> np.ndarray:
+    return df.groupby(clave, sort=True, dropna=False).ngroup().to_numpy(np.int64)
+
+
+def huella_filas(df: pd.DataFrame) -> np.ndarray:
+    """Hash de 64 bits de todas las columnas de cada fila (duplicados exactos)."""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+# ---------------------- Utilidades --------------------------
+def _repetidos(valores_ordenados: np.ndarray) -> np.ndarray:
+    """Sobre un array ordenado: True si el valor aparece más de una vez (keep=False)."""
+    n = len(valores_ordenados)
+    igual_ant = np.zeros(n, dtype=bool)
+    if n > 1:
+        igual_ant[1:] = valores_ordenados[1:] == valores_ordenados[:-1]
+    igual_sig = np.zeros(n, dtype=bool)
+    igual_sig[:-1] = igual_ant[1:]
+    return igual_ant | igual_sig
+
+
+def _inicios(valores_ordenados: np.ndarray) -> np.ndarray:
+    """Sobre un array ordenado: True en la primera fila de cada valor."""
+    inicio = np.ones(len(valores_ordenados), dtype=bool)
+    inicio[1:] = valores_ordenados[1:] != valores_ordenados[:-1]
+    return inicio
+
+
+def puntaje_filas(df: pd.DataFrame) -> np.ndarray:
+    """
+    Puntaje de elegir_mejor para todas las filas a la vez:
+      H15 == 1 (x1000) + campos informativos no nulos (x10) + PONDERA no nulo
+    """
+    score = np.zeros(len(df), dtype=np.int64)
+    if "H15" in df.columns:
+        score += 1000 * (df["H15"] == 1).fillna(False).to_numpy(dtype=bool)
+    vars_info = [c for c in VARS_INFO if c in df.columns]
+    if vars_info:
+        score += 10 * df[vars_info].notna().sum(axis=1).to_numpy(np.int64)
+    if "PONDERA" in df.columns:
+        score += df["PONDERA"].notna().to_numpy(dtype=bool)
+    return score
+
+
+# ---------------------- Duplicados --------------------------
+def diagnostico(df: pd.DataFrame, clave=CLAVE) -> dict:
+    """
+    Resumen de duplicados por clave (totales, exactos, conflictivos),
+    con los mismos criterios que duplicated(subset=clave) / duplicated().
+    """
+    codigo, completa = codificar_clave(df, clave)
+    huella = huella_filas(df)
+
+    orden = np.lexsort((huella, codigo))
+    cod_ord = codigo[orden]
+    mask_clave = _repetidos(cod_ord)
+
+    # exacto: misma clave y misma huella que otra fila
+    n = len(orden)
+    igual = np.zeros(n, dtype=bool)
+    if n > 1:
+        igual[1:] = (cod_ord[1:] == cod_ord[:-1]) & (huella[orden][1:] == huella[orden][:-1])
+    mask_exact = igual | np.append(igual[1:], False)
+
+    # grupos con más de una fila (sin contar claves con NA, como value_counts)
+    inicio = mask_clave & completa[orden] & _inicios(cod_ord)
+
+    dups_total = int(mask_clave.sum())
+    exactos = int((mask_clave & mask_exact).sum())
+    return {
+        "filas": len(df),
+        "dups_total_filas": dups_total,
+        "dups_exactos_filas": exactos,
+        "dups_conflictivos_filas": dups_total - exactos,
+        "grupos_clave_con_multiples_filas": int(inicio.sum()),
+    }
+
+
+def resolver(df: pd.DataFrame, clave=CLAVE) -> pd.DataFrame:
+    """
+    Una fila por clave: la de mayor puntaje_filas y, si empata, la primera.
+    Mismo resultado que groupby(clave).apply(elegir_mejor): salida ordenada
+    por clave y sin las filas con NA en la clave (si hay duplicados).
+    """
+    codigo, completa = codificar_clave(df, clave)
+    if not _repetidos(np.sort(codigo)).any():
+        return df.reset_index(drop=True)
+
+    posicion = np.arange(len(df))
+    orden = np.lexsort((posicion, -puntaje_filas(df), codigo))
+    elegidas = orden[_inicios(codigo[orden]) & completa[orden]]
+    return df.iloc[elegidas].reset_index(drop=True)
@@ -1,33 +1,10 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 
-# 1) CARGA Y LIMPIEZA MÍNIMA
-df = pd.read_csv("personas_T2_2016_2025_posadas_comodoro_limpio_final.csv")
+from datos_analisis import cargar_analisis
 
-# Tipos necesarios
-for c in ["ano4", "trimestre", "aglomerado", "estado"]:
-    df[c] = pd.to_numeric(df[c], errors="coerce")
-df["pondera"] = pd.to_numeric(df["pondera"], errors="coerce")
+FUENTE = "personas_T2_2016_2025_posadas_comodoro_limpio_final.csv"
 
-# estados válidos: 1=ocupado, 2=desocupado, 3=inactivo
-df = df[df["estado"].isin([1, 2, 3])].dropna(subset=["ano4", "trimestre", "pondera", "estado"])
-
-# 2) VARIABLE PERIODO
-df["PERIODO"] = df["ano4"].astype(int).astype(str) + "-T" + df["trimestre"].astype(int).astype(str)
-
-orden = (
-    df[["PERIODO", "ano4", "trimestre"]]
-    .drop_duplicates()
-    .sort_values(["ano4", "trimestre"])
-)["PERIODO"]
-
-df["PERIODO"] = pd.Categorical(df["PERIODO"], categories=orden, ordered=True)
-df = df[df["aglomerado"].isin([7, 9])]
-
-# Nombres 
-nombres_aglo = {7: "Posadas", 9: "Comodoro Rivadavia–Rada Tilly"}
-df["aglomerado_str"] = df["aglomerado"].map(nombres_aglo)
 
 # 3) FUNCIONES PARA CALCULAR LAS TRES TASAS
 def tasa_actividad(gr):
@@ -45,53 +22,64 @@ def tasa_desocup(gr):
     des = gr.loc[gr["estado"] == 2, "pondera"].sum()
     return (des / pea * 100) if pea > 0 else np.nan
 
-# Calculamos tasas
-tasas = df.groupby(["PERIODO", "aglomerado_str"], observed=False).apply(
-    lambda g: pd.Series({
-        "actividad": tasa_actividad(g),
-        "empleo": tasa_empleo(g),
-        "desocupacion": tasa_desocup(g)
-    })
-).reset_index()
+
+def calcular_tasas(df, aglomerados=(7, 9)):
+    """Actividad, empleo y desocupación por PERIODO y aglomerado_str."""
+    df = df[df["aglomerado"].isin(list(aglomerados))].copy()
+    df["aglomerado_str"] = df["aglomerado_str"].cat.remove_unused_categories()
+
+    return df.groupby(["PERIODO", "aglomerado_str"], observed=False).apply(
+        lambda g: pd.Series({
+            "actividad": tasa_actividad(g),
+            "empleo": tasa_empleo(g),
+            "desocupacion": tasa_desocup(g)
+        })
+    ).reset_index()
+
 
 # 4) HELPERS PARA LÍMITES
 def ylims(s, margen=1):
     m, M = s.min(), s.max()
     return max(0, m - margen), M + margen
 
-# 5) GRAFICO 1 – POSADAS
-df_pos = tasas[tasas["aglomerado_str"] == "Posadas"].sort_values("PERIODO")
-ymin, ymax = ylims(pd.concat([df_pos["actividad"], df_pos["empleo"], df_pos["desocupacion"]]))
-
-plt.figure(figsize=(11,5))
-plt.plot(df_pos["PERIODO"], df_pos["actividad"], marker="o", linewidth=2, label="Actividad")
-plt.plot(df_pos["PERIODO"], df_pos["empleo"], marker="o", linewidth=2, label="Empleo")
-plt.plot(df_pos["PERIODO"], df_pos["desocupacion"], marker="o", linewidth=2, label="Desocupación")
-
-plt.ylim(ymin, ymax)
-plt.title("Tasas Laborales – Posadas (2016–2025, T2)", fontsize=14, weight="bold")
-plt.ylabel("Tasa (%)")
-plt.xticks(rotation=90)
-plt.legend()
-plt.grid(alpha=0.3)
-plt.tight_layout()
-plt.show()
-
-
-# 6) GRAFICO 2 – COMODORO RIVADAVIA–RADA TILLY
-df_com = tasas[tasas["aglomerado_str"] == "Comodoro Rivadavia–Rada Tilly"].sort_values("PERIODO")
-ymin, ymax = ylims(pd.concat([df_com["actividad"], df_com["empleo"], df_com["desocupacion"]]))
-
-plt.figure(figsize=(11,5))
-plt.plot(df_com["PERIODO"], df_com["actividad"], marker="o", linewidth=2, label="Actividad")
-plt.plot(df_com["PERIODO"], df_com["empleo"], marker="o", linewidth=2, label="Empleo")   
-plt.plot(df_com["PERIODO"], df_com["desocupacion"], marker="o", linewidth=2, label="Desocupación")
-
-plt.ylim(ymin, ymax)
-plt.title("Tasas Laborales – Comodoro Rivadavia–Rada Tilly (2016–2025, T2)", fontsize=14, weight="bold")
-plt.ylabel("Tasa (%)")
-plt.xticks(rotation=90)
-plt.legend()
-plt.grid(alpha=0.3)
-plt.tight_layout()
-plt.show()
+
+def graficar_aglomerado(tasas, nombre, titulo):
+    import matplotlib.pyplot as plt
+
+    d = tasas[tasas["aglomerado_str"] == nombre].sort_values("PERIODO")
+    ymin, ymax = ylims(pd.concat([d["actividad"], d["empleo"], d["desocupacion"]]))
+
+    plt.figure(figsize=(11,5))
+    plt.plot(d["PERIODO"], d["actividad"], marker="o", linewidth=2, label="Actividad")
+    plt.plot(d["PERIODO"], d["empleo"], marker="o", linewidth=2, label="Empleo")
+    plt.plot(d["PERIODO"], d["desocupacion"], marker="o", linewidth=2, label="Desocupación")
+
+    plt.ylim(ymin, ymax)
+    plt.title(titulo, fontsize=14, weight="bold")
+    plt.ylabel("Tasa (%)")
+    plt.xticks(rotation=90)
+    plt.legend()
+    plt.grid(alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+
+def main():
+    # 1) CARGA Y LIMPIEZA MÍNIMA + 2) VARIABLE PERIODO
+    # (tipos, estados válidos 1/2/3, PERIODO ordenado y nombres de aglomerado;
+    #  armado una sola vez y cacheado en processed/cache)
+    df = cargar_analisis(FUENTE)
+
+    # Calculamos tasas
+    tasas = calcular_tasas(df, aglomerados=(7, 9))
+
+    # 5) GRAFICO 1 – POSADAS
+    graficar_aglomerado(tasas, "Posadas", "Tasas Laborales – Posadas (2016–2025, T2)")
+
+    # 6) GRAFICO 2 – COMODORO RIVADAVIA–RADA TILLY
+    graficar_aglomerado(tasas, "Comodoro Rivadavia–Rada Tilly",
+                        "Tasas Laborales – Comodoro Rivadavia–Rada Tilly (2016–2025, T2)")
+
+
+if __name__ == "__main__":
+    main()
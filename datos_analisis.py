@@ -0,0 +1,109 @@
+# ============================================================
+# CARGA COMPARTIDA DEL DATASET DE ANÁLISIS (tasas)
+# tasaEmpleo / tasaActividad / tasaDesocupacion / comparacionTasas
+# leían el CSV limpio completo y repetían el mismo tipado y la
+# misma construcción de PERIODO. Acá se hace una sola vez y el
+# resultado queda en un Feather sin comprimir (memory-mappable)
+# en processed/cache/. Si el CSV fuente cambia, se regenera.
+# ============================================================
+
+import json
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+FUENTE = "personas_2016_2025_todos_trimestres_limpio.csv"
+CACHE_DIR = Path("processed") / "cache"
+AGLOMERADOS_JSON = Path("aglomerados_eph_json") / "aglomerados_eph.json"
+
+# Subir si cambia la forma de armar el frame (invalida los caches viejos)
+VERSION_CACHE = 1
+
+# Nombres que usamos en los gráficos del TP
+NOMBRES_TP = {7: "Posadas", 9: "Comodoro Rivadavia–Rada Tilly"}
+
+
+# ---------------------- Helpers ----------------------------
+def nombres_aglomerados() -> dict:
+    """Código EPH → nombre (del GeoJSON de aglomerados), con los nombres del TP."""
+    nombres = {}
+    if AGLOMERADOS_JSON.exists():
+        with open(AGLOMERADOS_JSON, encoding="utf-8") as fh:
+            geo = json.load(fh)
+        for feat in geo["features"]:
+            prop = feat["properties"]
+            nombres.setdefault(int(prop["eph_codagl"]), prop["eph_aglome"])
+    nombres.update(NOMBRES_TP)
+    return nombres
+
+
+def _firma_fuente(path: Path) -> dict:
+    st = path.stat()
+    return {
+        "fuente": str(path.resolve()),
+        "tamano": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "version": VERSION_CACHE,
+    }
+
+
+# ---------------------- Frame tipado -----------------------
+def construir_frame(path) -> pd.DataFrame:
+    """
+    Lee el CSV limpio y arma el frame de análisis:
+      - ano4, trimestre, aglomerado, estado, pondera numéricos
+      - sólo estados 1/2/3 y filas completas
+      - PERIODO categórico ordenado ('2016-T1' < '2016-T2' < …)
+      - aglomerado_str con el nombre del aglomerado
+    """
+    df = pd.read_csv(path)
+
+    for c in ["ano4", "trimestre", "aglomerado", "estado"]:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    df["pondera"] = pd.to_numeric(df["pondera"], errors="coerce")
+
+    df = df[df["estado"].isin([1, 2, 3])].dropna(subset=["ano4", "trimestre", "pondera", "estado"])
+    df = df.reset_index(drop=True)
+
+    df["PERIODO"] = df["ano4"].astype(int).astype(str) + "-T" + df["trimestre"].astype(int).astype(str)
+    orden = (df[["PERIODO", "ano4", "trimestre"]].drop_duplicates()
+             .sort_values(["ano4", "trimestre"]))["PERIODO"]
+    df["PERIODO"] = pd.Categorical(df["PERIODO"], categories=orden, ordered=True)
+
+    df["aglomerado_str"] = df["aglomerado"].map(nombres_aglomerados()).astype("category")
+    return df
+
+
+# ---------------------- Carga con cache --------------------
+def cargar_analisis(path=FUENTE, cache_dir=CACHE_DIR, usar_cache=True) -> pd.DataFrame:
+    """
+    Devuelve el frame de análisis. La primera vez lo arma desde el CSV y lo
+    guarda como Feather; después lo abre con memory map (varios procesos
+    comparten las páginas del archivo). Sin pyarrow, arma el frame directo.
+    """
+    path = Path(path)
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        print("   [AVISO] pyarrow no está instalado: se lee el CSV sin cache.")
+        return construir_frame(path)
+
+    cache_dir = Path(cache_dir)
+    destino = cache_dir / f"{path.stem}.feather"
+    meta = cache_dir / f"{path.stem}.json"
+    firma = _firma_fuente(path)
+
+    if usar_cache and destino.exists() and meta.exists():
+        with open(meta, encoding="utf-8") as fh:
+            if json.load(fh) == firma:
+                tabla = feather.read_table(destino, memory_map=True)
+                return tabla.to_pandas(split_blocks=True)
+
+    df = construir_frame(path)
+    if usar_cache:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        feather.write_feather(df, destino, compression="uncompressed")
+        with open(meta, "w", encoding="utf-8") as fh:
+            json.dump(firma, fh, indent=2)
+        print(f"   cache de análisis → {destino}")
+    return df
@@ -0,0 +1,208 @@
+# ============================================================
+# DESESTACIONALIZACIÓN Y TENDENCIA DE TODAS LAS SERIES DE TASAS
+# Los gráficos de tasas muestran la serie trimestral cruda y la
+# estacionalidad tapa la tendencia al comparar aglomerados.
+# Acá todas las series (tasa × aglomerado) se ponen en una sola
+# matriz series × trimestres y la descomposición clásica aditiva
+# se hace de una vez para todas:
+#   tendencia   = media móvil centrada 2×4 (ignora trimestres faltantes)
+#   estacional  = promedio por trimestre de (serie - tendencia), centrado
+#   desest.     = serie - estacional
+# Los trimestres que faltan quedan como NaN en la matriz.
+# Las tasas salen de processed/tasas_streaming.csv (TXT crudos: con
+# inactivos y todos los aglomerados); el frame de análisis no sirve
+# porque sólo tiene ESTADO 1/2 de Posadas y Comodoro.
+# El resultado se cachea en processed/cache (clave = hash de la matriz).
+# ============================================================
+
+import hashlib
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from datos_analisis import CACHE_DIR, nombres_aglomerados
+from panel_vinculacion import indice_periodo, etiqueta_periodo
+from tasas_streaming import (
+    OUTPUT_PATH as TASAS_PATH, INPUT_DIR, archivos_txt, tasas_desde_parciales, tasas_streaming,
+)
+
+# ---------------------- Configuración -----------------------
+OUTPUT_PATH = Path("processed") / "tasas_desestacionalizadas.csv"
+
+TASAS = ["tasa_actividad", "tasa_empleo", "tasa_desocupacion"]
+
+# Media móvil 2×4 (trimestral): pesos 1/8, 1/4, 1/4, 1/4, 1/8
+PESOS_2X4 = np.array([1, 2, 2, 2, 1]) / 8
+
+# Mínimo de peso observado en la ventana para dar la tendencia.
+# 1.0 = descomposición clásica: NaN en los bordes y junto a huecos.
+# Con menos (ej. 0.75) la media se reescala sobre lo observado y hay
+# tendencia también en los bordes, pero ya no es el método clásico.
+MIN_PESO = 1.0
+
+
+# ---------------------- Matriz de series -------------------
+def tasas_por_aglomerado(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tasas por ano4 × trimestre × aglomerado desde un frame por persona.
+    Actividad y empleo sólo tienen sentido si el frame incluye inactivos.
+    """
+    sumas = df.groupby(["ano4", "trimestre", "aglomerado", "estado"])["pondera"].sum()
+    return tasas_desde_parciales(sumas)
+
+
+def cargar_tasas(path: Path = TASAS_PATH, input_dir: Path = INPUT_DIR) -> pd.DataFrame:
+    """Tasas de tasas_streaming (se regeneran desde los TXT si falta o hay alguno más nuevo)."""
+    path = Path(path)
+    files = archivos_txt(input_dir)
+    if path.exists() and (not files or path.stat().st_mtime >= max(f.stat().st_mtime for f in files)):
+        return pd.read_csv(path)
+    tasas = tasas_streaming(input_dir)
+    path.parent.mkdir(exist_ok=True)
+    tasas.to_csv(path, index=False)
+    return tasas
+
+
+def matriz_series(tasas: pd.DataFrame, columnas=TASAS):
+    """
+    Pasa la tabla larga de tasas a una matriz (series × trimestres).
+    Devuelve (Y, series, periodos): series = DataFrame [tasa, aglomerado],
+    periodos = índices correlativos (indice_periodo) sin huecos.
+    """
+    p = indice_periodo(tasas["ano4"].to_numpy(int), tasas["trimestre"].to_numpy(int))
+    periodos = np.arange(p.min(), p.max() + 1)
+
+    aglos, a = np.unique(tasas["aglomerado"].to_numpy(int), return_inverse=True)
+    n_a, n_t = len(aglos), len(periodos)
+
+    Y = np.full((len(columnas), n_a, n_t), np.nan)
+    for k, c in enumerate(columnas):
+        Y[k, a, p - periodos[0]] = tasas[c].to_numpy(float)
+
+    series = pd.DataFrame({
+        "tasa": np.repeat(columnas, n_a),
+        "aglomerado": np.tile(aglos, len(columnas)),
+    })
+    return Y.reshape(len(columnas) * n_a, n_t), series, periodos
+
+
+# ---------------------- Descomposición ---------------------
+def media_movil_2x4(Y: np.ndarray, min_peso: float = MIN_PESO) -> np.ndarray:
+    """
+    Media móvil centrada 2×4 por fila, ignorando NaN: cada valor se
+    divide por el peso efectivamente observado en la ventana. Si ese
+    peso es menor que min_peso (bordes o muchos faltantes) → NaN.
+    """
+    obs = ~np.isnan(Y)
+    valores = np.where(obs, Y, 0.0)
+    n_t = Y.shape[1]
+    suma = np.zeros_like(valores)
+    peso = np.zeros_like(valores)
+
+    # 5 desplazamientos de la ventana (cada uno sobre toda la matriz)
+    for j, w in enumerate(PESOS_2X4):
+        d = j - 2
+        origen = slice(max(d, 0), n_t + min(d, 0))
+        destino = slice(max(-d, 0), n_t - max(d, 0))
+        suma[:, destino] += w * valores[:, origen]
+        peso[:, destino] += w * obs[:, origen]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        tendencia = suma / peso
+    tendencia[peso < min_peso] = np.nan
+    return tendencia
+
+
+def descomponer(Y: np.ndarray, trimestre: np.ndarray, min_peso: float = MIN_PESO) -> dict:
+    """
+    Descomposición aditiva de todas las filas de Y a la vez.
+    trimestre: 0..3 para cada columna de Y.
+    """
+    tendencia = media_movil_2x4(Y, min_peso)
+    desvio = Y - tendencia
+
+    # factor por trimestre: promedio del desvío de ese trimestre (NaN-aware)
+    factores = np.full((Y.shape[0], 4), np.nan)
+    for q in range(4):
+        cols = desvio[:, trimestre == q]
+        n = (~np.isnan(cols)).sum(axis=1)
+        factores[:, q] = np.where(n > 0, np.nansum(cols, axis=1) / np.maximum(n, 1), np.nan)
+
+    # centrados: suman 0 en el año (si falta algún trimestre, la fila queda NaN)
+    factores = factores - factores.mean(axis=1, keepdims=True)
+
+    estacional = factores[:, trimestre]
+    return {
+        "tendencia": tendencia,
+        "estacional": estacional,
+        "desestacionalizada": Y - estacional,
+        "factores": factores,
+    }
+
+
+# ---------------------- Cache ------------------------------
+def _clave_cache(Y: np.ndarray, trimestre: np.ndarray, min_peso: float) -> str:
+    h = hashlib.sha256()
+    h.update(np.ascontiguousarray(Y).tobytes())
+    h.update(np.asarray(trimestre, dtype=np.int8).tobytes())
+    h.update(repr((Y.shape, min_peso, PESOS_2X4.tolist())).encode())
+    return h.hexdigest()[:20]
+
+
+def descomponer_cacheado(Y, trimestre, min_peso=MIN_PESO, cache_dir=CACHE_DIR) -> dict:
+    """Como descomponer(), pero reusa el resultado si la matriz no cambió."""
+    destino = Path(cache_dir) / f"desest_{_clave_cache(Y, trimestre, min_peso)}.npz"
+    if destino.exists():
+        with np.load(destino) as z:
+            return {k: z[k] for k in z.files}
+
+    res = descomponer(Y, trimestre, min_peso)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(destino, **res)
+    return res
+
+
+# ---------------------- API -------------------------------
+def desestacionalizar(tasas: pd.DataFrame, columnas=TASAS, usar_cache=True) -> pd.DataFrame:
+    """
+    Tabla larga: PERIODO, ano4, trimestre, aglomerado, tasa, valor,
+    tendencia, estacional, desestacionalizada (una fila por serie × trimestre).
+    """
+    Y, series, periodos = matriz_series(tasas, columnas)
+    trimestre = periodos % 4
+    res = descomponer_cacheado(Y, trimestre) if usar_cache else descomponer(Y, trimestre)
+
+    n_s, n_t = Y.shape
+    out = pd.DataFrame({
+        "PERIODO": np.tile([etiqueta_periodo(p) for p in periodos], n_s),
+        "ano4": np.tile(periodos // 4, n_s),
+        "trimestre": np.tile(trimestre + 1, n_s),
+        "aglomerado": np.repeat(series["aglomerado"].to_numpy(), n_t),
+        "tasa": np.repeat(series["tasa"].to_numpy(), n_t),
+        "valor": Y.ravel(),
+        "tendencia": res["tendencia"].ravel(),
+        "estacional": res["estacional"].ravel(),
+        "desestacionalizada": res["desestacionalizada"].ravel(),
+    })
+    return out
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    print(f"1) Tasas por período y aglomerado ({TASAS_PATH})…")
+    tasas = cargar_tasas()
+
+    print("2) Desestacionalizando todas las series…")
+    out = desestacionalizar(tasas)
+    out["aglomerado_str"] = out["aglomerado"].map(nombres_aglomerados())
+
+    OUTPUT_PATH.parent.mkdir(exist_ok=True)
+    out.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ Listo: {OUTPUT_PATH} ({out['tasa'].nunique()} tasas × {out['aglomerado'].nunique()} aglomerados)")
+
+    tp = out[out["aglomerado"].isin([7, 9]) & (out["tasa"] == "tasa_empleo")]
+    print(tp.pivot(index="PERIODO", columns="aglomerado_str", values="desestacionalizada").round(2).tail(8))
+
+
+if __name__ == "__main__":
+    main()
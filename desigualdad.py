@@ -0,0 +1,161 @@
+# ============================================================
+# DISTRIBUCIÓN DEL INGRESO PONDERADA (PONDERA)
+# Cuantiles, deciles, Gini y Palma por grupo (ej. período ×
+# aglomerado) para varias columnas de ingreso a la vez.
+#
+# Para cada variable se hace UN solo ordenamiento (grupo, ingreso)
+# y todo sale de pesos acumulados:
+#   - cuantiles : np.searchsorted sobre (grupo + peso acumulado)
+#   - Gini      : área bajo la curva de Lorenz con np.bincount
+#   - Palma     : 10% más rico / 40% más pobre (curva de Lorenz)
+# ============================================================
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+INPUT_PATH = Path("processed") / "eph_train_ingreso_real.csv"
+OUTPUT_PATH = Path("processed") / "distribucion_ingresos.csv"
+
+GRUPOS = ["ANO4", "TRIMESTRE", "AGLOMERADO"]
+VARIABLES = ["P21", "P47T", "P21_real_2025"]
+PESO = "PONDERA"
+CUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+DECILES = tuple(np.round(np.arange(0.1, 1.0, 0.1), 1))
+
+
+# ---------------------- Motor ------------------------------
+def _ordenar_por_grupo(gid: np.ndarray, x: np.ndarray, w: np.ndarray, n_grupos: int) -> dict:
+    """
+    Ordena por (grupo, x) y arma los acumulados que usan todas las medidas.
+    Sólo entran x > 0 y w > 0 (los códigos -9 / 0 de la EPH quedan afuera).
+    """
+    ok = (gid >= 0) & np.isfinite(x) & np.isfinite(w) & (x > 0) & (w > 0)
+    g, x, w = gid[ok], x[ok], w[ok]
+
+    orden = np.lexsort((x, g))
+    g, x, w = g[orden], x[orden], w[orden]
+
+    n = np.bincount(g, minlength=n_grupos)
+    W = np.bincount(g, weights=w, minlength=n_grupos)
+    Y = np.bincount(g, weights=w * x, minlength=n_grupos)
+
+    inicio_w = np.concatenate([[0.0], np.cumsum(W)[:-1]])
+    inicio_y = np.concatenate([[0.0], np.cumsum(Y)[:-1]])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        p = (np.cumsum(w) - inicio_w[g]) / W[g]          # población acumulada
+        L = (np.cumsum(w * x) - inicio_y[g]) / Y[g]      # ingreso acumulado (Lorenz)
+
+    primero = np.ones(len(g), dtype=bool)
+    primero[1:] = g[1:] != g[:-1]
+    p_prev = np.where(primero, 0.0, np.roll(p, 1))
+    L_prev = np.where(primero, 0.0, np.roll(L, 1))
+
+    return {"g": g, "x": x, "p": p, "L": L, "p_prev": p_prev, "L_prev": L_prev,
+            "n": n, "W": W, "Y": Y, "llave": g + p}
+
+
+def _posiciones(base: dict, qs) -> np.ndarray:
+    """Para cada grupo y q: primera fila con población acumulada >= q."""
+    n_grupos = len(base["n"])
+    objetivo = (np.arange(n_grupos)[:, None] + np.asarray(qs, dtype=float)[None, :]).ravel()
+    pos = np.searchsorted(base["llave"], objetivo - 1e-12, side="left")
+    return np.minimum(pos, max(len(base["x"]) - 1, 0)).reshape(n_grupos, len(qs))
+
+
+def cuantiles_ponderados(base: dict, qs) -> np.ndarray:
+    """Matriz grupos × cuantiles (menor x con F(x) >= q)."""
+    if len(base["x"]) == 0:
+        return np.full((len(base["n"]), len(qs)), np.nan)
+    vals = base["x"][_posiciones(base, qs)]
+    vals[base["n"] == 0] = np.nan
+    return vals
+
+
+def lorenz_en(base: dict, qs) -> np.ndarray:
+    """Participación en el ingreso del q más pobre (interpolando la curva de Lorenz)."""
+    if len(base["x"]) == 0:
+        return np.full((len(base["n"]), len(qs)), np.nan)
+    pos = _posiciones(base, qs)
+    p0, p1 = base["p_prev"][pos], base["p"][pos]
+    L0, L1 = base["L_prev"][pos], base["L"][pos]
+    qs = np.asarray(qs, dtype=float)[None, :]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        frac = np.clip((qs - p0) / (p1 - p0), 0, 1)
+    vals = L0 + (L1 - L0) * frac
+    vals[base["n"] == 0] = np.nan
+    return vals
+
+
+def gini_ponderado(base: dict) -> np.ndarray:
+    """Gini = 1 - Σ (p_i - p_{i-1}) (L_i + L_{i-1}) por grupo."""
+    area = (base["p"] - base["p_prev"]) * (base["L"] + base["L_prev"])
+    g = 1 - np.bincount(base["g"], weights=area, minlength=len(base["n"]))
+    g[base["n"] == 0] = np.nan
+    return g
+
+
+def distribucion_ingresos(df: pd.DataFrame, grupos=GRUPOS, variables=VARIABLES,
+                          peso=PESO, cuantiles=CUANTILES) -> pd.DataFrame:
+    """
+    Tabla prolija: una fila por grupo × variable con
+    n, poblacion, media, cuantiles (pXX), deciles (d1..d9), gini y palma.
+    Grupos sin ingresos válidos para una variable no aparecen.
+    """
+    gb = df.groupby(list(grupos), sort=True, dropna=True, observed=True)
+    gid = gb.ngroup().to_numpy()
+    claves = gb.size().index.to_frame(index=False)
+    n_grupos = len(claves)
+    w = pd.to_numeric(df[peso], errors="coerce").to_numpy(dtype=float)
+
+    tablas = []
+    for var in variables:
+        if var not in df.columns:
+            continue
+        x = pd.to_numeric(df[var], errors="coerce").to_numpy(dtype=float)
+        base = _ordenar_por_grupo(gid, x, w, n_grupos)
+
+        t = claves.copy()
+        t["variable"] = var
+        t["n"] = base["n"]
+        t["poblacion"] = base["W"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t["media"] = base["Y"] / base["W"]
+
+        qs = cuantiles_ponderados(base, list(cuantiles) + list(DECILES))
+        for k, q in enumerate(cuantiles):
+            t[f"p{q * 100:g}"] = qs[:, k]
+        for k in range(len(DECILES)):
+            t[f"d{k + 1}"] = qs[:, len(cuantiles) + k]
+
+        t["gini"] = gini_ponderado(base)
+        l40, l90 = lorenz_en(base, [0.4, 0.9]).T
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t["palma"] = (1 - l90) / l40
+
+        tablas.append(t[t["n"] > 0])
+
+    if not tablas:
+        raise KeyError(f"Ninguna de las variables {list(variables)} está en el DataFrame.")
+    return pd.concat(tablas, ignore_index=True)
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    print("1) Cargando datos…")
+    df = pd.read_csv(INPUT_PATH)
+
+    print("2) Distribución ponderada por período × aglomerado…")
+    tabla = distribucion_ingresos(df)
+    print(f"   Filas: {len(tabla)}")
+
+    tabla.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ Listo: {OUTPUT_PATH}")
+
+    cols = GRUPOS + ["variable", "p50", "gini", "palma"]
+    print(tabla.loc[tabla["variable"] == "P21_real_2025", cols].round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
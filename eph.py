@@ -0,0 +1,103 @@
+# ============================================================
+# PUNTO DE ENTRADA ÚNICO (comando `eph`)
+#   eph <comando> [argumentos del script]
+#   eph limpieza --sample 0.01
+#   eph modelo
+#   eph tasas rate=desocupacion aglomerado=9 period=2019T1..2025T2 by=sexo
+# Cada comando corre el script correspondiente como si fuera
+# `python <script>.py …`: el módulo se importa recién al elegirlo,
+# así que pandas / sklearn / matplotlib se cargan sólo si el
+# comando los usa. `eph tasas` responde una consulta puntual con
+# las mismas funciones del servicio HTTP, sin levantar el servidor.
+# ============================================================
+
+import runpy
+import sys
+
+# ---------------------- Comandos ----------------------------
+# comando → (módulo, descripción)
+COMANDOS = {
+    "limpieza": ("limpieza_tp", "CSV limpio de personas (todos los trimestres)"),
+    "limpieza-sin-outliers": ("limpieza_sin_outliers", "CSV limpio T2 sin outliers de ingreso"),
+    "limpieza-modelo": ("limpiezaModelo", "bases de train / faltantes para el modelo"),
+    "modelo": ("modelo", "árboles por aglomerado + imputación de ingresos"),
+    "benchmark": ("benchmark_modelos", "comparación árbol / boosting / lineal"),
+    "imputacion-multiple": ("imputacion_multiple", "imputación múltiple de ingresos"),
+    "sensibilidad": ("sensibilidad_reglas", "sensibilidad de las reglas de limpieza"),
+    "grafico-empleo": ("tasaEmpleo", "gráficos de la tasa de empleo"),
+    "grafico-actividad": ("tasaActividad", "gráficos de la tasa de actividad"),
+    "grafico-desocupacion": ("tasaDesocupacion", "gráficos de la tasa de desocupación"),
+    "grafico-comparacion": ("comparacionTasas", "las tres tasas por aglomerado"),
+    "tasas-streaming": ("tasas_streaming", "tasas por trimestre leyendo por bloques"),
+    "desestacionalizar": ("desestacionalizacion", "series de tasas desestacionalizadas"),
+    "desigualdad": ("desigualdad", "Gini y deciles de ingreso"),
+    "mincer": ("mincer", "ecuaciones de Mincer + Oaxaca–Blinder"),
+    "panel": ("panel_vinculacion", "vinculación del panel entre trimestres"),
+    "transiciones": ("transiciones_panel", "matrices de transición del panel"),
+    "drift": ("monitor_drift", "deriva de la ola nueva contra la referencia"),
+    "huellas": ("huellas_fuentes", "copias exactas y conflictos de período en data/"),
+    "golden": ("verificacion_golden", "registrar / verificar salidas contra la huella golden"),
+    "memoria": ("memoria_limpieza", "picos de memoria de la limpieza"),
+    "servicio": ("servicio_tasas", "servicio HTTP local de tasas"),
+    "sqlite": ("almacen_sqlite", "arma processed/eph.sqlite o corre una consulta SQL"),
+    "preview": ("sketches", "vista previa aproximada: cortes de ingreso y hogares por trimestre"),
+}
+
+
+def ayuda() -> str:
+    ancho = max(map(len, COMANDOS)) + 2
+    lineas = ["uso: eph <comando> [argumentos]", "", "comandos:"]
+    lineas += [f"  {c:<{ancho}}{desc}" for c, (_, desc) in COMANDOS.items()]
+    lineas.append(f"  {'tasas':<{ancho}}consulta puntual: rate=… aglomerado=… period=… by=…")
+    return "\n".join(lineas)
+
+
+# ---------------------- Consulta puntual -------------------
+def tasas(argumentos: list) -> int:
+    """Misma consulta que GET /tasas?… pero con argumentos clave=valor."""
+    import servicio_tasas
+
+    params = {}
+    for arg in argumentos:
+        nombre, _, valor = arg.lstrip("-").partition("=")
+        params.setdefault(nombre, []).append(valor)
+
+    # mismas sumas que el servicio: TXT crudos con inactivos (cacheadas en processed/)
+    servicio_tasas.cargar()
+    try:
+        clave = servicio_tasas.normalizar_consulta(params)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(servicio_tasas.consultar(clave).decode("utf-8"))
+    return 0
+
+
+# ---------------------- Proceso principal -------------------
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] in ("-h", "--help", "ayuda"):
+        print(ayuda())
+        return 0
+
+    comando, resto = argv[0], argv[1:]
+    if comando == "tasas":
+        return tasas(resto)
+    if comando not in COMANDOS:
+        print(f"comando desconocido: {comando!r}\n\n{ayuda()}", file=sys.stderr)
+        return 2
+
+    modulo = COMANDOS[comando][0]
+    sys.argv = [modulo, *resto]  # el script lee sus flags (--sample, …) de sys.argv
+    try:
+        runpy.run_module(modulo, run_name="__main__", alter_sys=True)
+    except SystemExit as e:
+        if isinstance(e.code, str):  # ej. "--sample necesita una fracción…"
+            print(e.code, file=sys.stderr)
+            return 1
+        return e.code or 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
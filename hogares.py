@@ -0,0 +1,126 @@
+# ============================================================
+# BASE DE HOGARES (usu_hogar) + UNIÓN CON PERSONAS
+# Los pipelines leen sólo usu_individual. Acá leemos los TXT de
+# hogares (sólo las columnas pedidas) y los pegamos a las personas
+# por CODUSU + NRO_HOGAR + período.
+#
+# La unión no es un merge de strings: la clave se codifica en un
+# int64, se ordena una vez la base de hogares y cada persona busca
+# su hogar con np.searchsorted.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+INPUT_DIR = Path("data")   # mismos TXT que usan las limpiezas
+
+CLAVE_HOGAR = ["CODUSU", "NRO_HOGAR", "ANO4", "TRIMESTRE"]
+
+# Columnas de hogar que se traen por defecto
+HOGAR_COLS = ["ITF", "IPCF", "IX_TOT"]
+
+
+# ---------------------- Helpers ----------------------------
+def es_archivo_hogar(f: Path) -> bool:
+    """Los TXT de hogares traen 'hogar' en el nombre (usu_hogar_T117.txt)."""
+    return "hogar" in f.name.lower()
+
+
+def _clave_entera(codigos: np.ndarray, nro_hogar: pd.Series, ano4: pd.Series, trimestre: pd.Series) -> np.ndarray:
+    """
+    (CODUSU codificado, NRO_HOGAR, período) → int64.
+    NRO_HOGAR < 100 y ANO4*4 + TRIMESTRE-1 < 10000.
+    """
+    hogar = pd.to_numeric(nro_hogar, errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    ano = pd.to_numeric(ano4, errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    tri = pd.to_numeric(trimestre, errors="coerce").fillna(-1).to_numpy(dtype=np.int64)
+    clave = (codigos.astype(np.int64) * 100 + hogar) * 10000 + ano * 4 + (tri - 1)
+    invalida = (codigos < 0) | (hogar < 0) | (ano < 0) | (tri < 1)
+    clave[invalida] = -1
+    return clave
+
+
+# ---------------------- Carga ------------------------------
+def _leer_hogares(fh, pedidas):
+    df = pd.read_csv(
+        fh, sep=";", usecols=lambda c: c in pedidas,
+        dtype={"CODUSU": str}, encoding="latin-1"
+    )
+    df["CODUSU"] = df["CODUSU"].str.strip()
+    for c in df.columns.drop("CODUSU"):
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df
+
+
+def cargar_hogares(input_dir: Path = INPUT_DIR, columnas=HOGAR_COLS, fraccion=None) -> pd.DataFrame:
+    """
+    Lee todos los usu_hogar de input_dir (sueltos o dentro de los ZIP)
+    con sólo la clave + columnas pedidas. Con fraccion, sólo los hogares
+    de la submuestra (los mismos que en las bases de personas).
+    """
+    from lectura_zip import listar_fuentes, leer_fuentes, nombre_fuente
+
+    pedidas = set(CLAVE_HOGAR) | set(columnas)
+    fuentes = listar_fuentes(input_dir, "hogar")
+    if not fuentes:
+        raise FileNotFoundError(f"No se encontraron TXT de hogares en {input_dir.resolve()}")
+
+    frames = []
+    for fuente, df in leer_fuentes(fuentes, lambda fh: _leer_hogares(fh, pedidas), fraccion=fraccion):
+        if isinstance(df, Exception):
+            print(f"   ! error leyendo {nombre_fuente(fuente)}: {df}")
+            continue
+        frames.append(df)
+        print(f"   + leído: {nombre_fuente(fuente)} | hogares: {len(df)}")
+
+    if not frames:
+        raise ValueError("No se pudo leer ningún archivo de hogares.")
+    return pd.concat(frames, ignore_index=True)
+
+
+# ---------------------- Unión ------------------------------
+def unir_hogar_personas(personas: pd.DataFrame, hogares: pd.DataFrame, columnas=HOGAR_COLS) -> pd.DataFrame:
+    """
+    Agrega a `personas` (en el lugar) las columnas de hogar pedidas.
+    Acepta columnas de personas en mayúscula o minúscula; las columnas
+    que ya existen en personas no se pisan. Personas sin hogar → NaN.
+    """
+    minus = "codusu" in personas.columns
+    mayus = {c.upper(): c for c in personas.columns}
+    nuevas = [c for c in columnas if c in hogares.columns and c not in mayus]
+    if not nuevas:
+        return personas
+
+    # diccionario de CODUSU armado sobre la base de hogares
+    cod_h, categorias = pd.factorize(hogares["CODUSU"])
+    clave_h = _clave_entera(cod_h, hogares["NRO_HOGAR"], hogares["ANO4"], hogares["TRIMESTRE"])
+
+    codusu_p = personas[mayus["CODUSU"]].astype("string").str.strip()
+    cod_p = pd.Categorical(codusu_p, categories=categorias).codes
+    clave_p = _clave_entera(
+        cod_p, personas[mayus["NRO_HOGAR"]], personas[mayus["ANO4"]], personas[mayus["TRIMESTRE"]]
+    )
+    del codusu_p, cod_p
+
+    if len(clave_h) == 0:
+        for c in nuevas:
+            personas[c.lower() if minus else c] = np.nan
+        return personas
+
+    orden = np.argsort(clave_h, kind="stable")
+    clave_h = clave_h[orden]
+
+    pos = np.searchsorted(clave_h, clave_p)
+    pos_ok = np.minimum(pos, len(clave_h) - 1)
+    encontrado = (clave_p >= 0) & (pos < len(clave_h)) & (clave_h[pos_ok] == clave_p)
+    fila_h = orden[pos_ok]
+
+    for c in nuevas:
+        valores = hogares[c].to_numpy(dtype=float)[fila_h]
+        valores[~encontrado] = np.nan
+        personas[c.lower() if minus else c] = valores
+
+    print(f"   Personas con hogar encontrado: {int(encontrado.sum())} de {len(personas)}")
+    return personas
@@ -0,0 +1,163 @@
+# ============================================================
+# HUELLAS DE LAS FUENTES (pre-pasada antes de parsear)
+# En data/ suelen quedar copias del mismo trimestre: el TXT
+# re-descargado, el renombrado a mano, el que también está dentro
+# del ZIP de INDEC… Todas se parseaban completas y recién se
+# colapsaban en resolver_duplicados. Acá, antes de leer nada con
+# pandas, a cada fuente se le toma una huella barata:
+#   - tamaño (os.stat o ZipInfo.file_size, sin descomprimir)
+#   - blake2b del encabezado + primer bloque
+#   - ANO4 / TRIMESTRE de las primeras filas
+# Sólo si dos fuentes coinciden en tamaño y bloque inicial se
+# calcula el hash completo: las copias exactas se descartan y las
+# fuentes distintas que dicen ser el mismo período se informan
+# como conflicto (se leen igual; resolver_duplicados decide).
+# ============================================================
+
+import hashlib
+import zipfile
+from collections import defaultdict
+
+from lectura_zip import abrir_fuente, nombre_fuente
+
+# ---------------------- Configuración -----------------------
+BLOQUE = 1 << 16          # bytes del bloque inicial (64 KB)
+BLOQUE_COMPLETO = 1 << 20  # lectura del hash completo (1 MB por vez)
+PERIODO = ("ANO4", "TRIMESTRE")
+
+
+# ---------------------- Huellas -----------------------------
+def tamano_fuente(fuente) -> int:
+    """Tamaño en bytes del contenido (descomprimido si es un miembro de ZIP)."""
+    ruta, miembro = fuente
+    if miembro is None:
+        return ruta.stat().st_size
+    with zipfile.ZipFile(ruta) as z:
+        return z.getinfo(miembro).file_size
+
+
+def _periodos(bloque: bytes, sep: bytes = b";") -> tuple:
+    """(ANO4, TRIMESTRE) distintos en las líneas completas del bloque inicial."""
+    lineas = bloque.split(b"\n")
+    nombres = [c.strip().strip(b'"').upper() for c in lineas[0].rstrip(b"\r").split(sep)]
+    try:
+        i_ano, i_tri = (nombres.index(c.encode()) for c in PERIODO)
+    except ValueError:
+        return ()
+
+    vistos = set()
+    for linea in lineas[1:-1]:  # la última puede estar cortada
+        campos = linea.split(sep)
+        if len(campos) <= max(i_ano, i_tri):
+            continue
+        try:
+            vistos.add((int(campos[i_ano].strip(b' "')), int(campos[i_tri].strip(b' "'))))
+        except ValueError:
+            continue
+    return tuple(sorted(vistos))
+
+
+def huella(fuente) -> dict:
+    """Huella barata: tamaño, hash del bloque inicial y períodos que declara."""
+    with abrir_fuente(fuente) as fh:
+        bloque = fh.read(BLOQUE)
+    return {
+        "fuente": fuente,
+        "tamano": tamano_fuente(fuente),
+        "inicio": hashlib.blake2b(bloque, digest_size=16).hexdigest(),
+        "periodos": _periodos(bloque),
+    }
+
+
+def hash_completo(fuente) -> str:
+    """blake2b de todo el contenido (sólo para las que empatan en la huella barata)."""
+    h = hashlib.blake2b(digest_size=16)
+    with abrir_fuente(fuente) as fh:
+        for bloque in iter(lambda: fh.read(BLOQUE_COMPLETO), b""):
+            h.update(bloque)
+    return h.hexdigest()
+
+
+# ---------------------- Copias y conflictos ----------------
+def _preferencia(fuente):
+    """Entre copias idénticas: TXT suelto antes que ZIP, y el nombre más corto (el original)."""
+    nombre = nombre_fuente(fuente)
+    return fuente[1] is not None, len(nombre), nombre
+
+
+def clasificar(fuentes: list) -> tuple:
+    """
+    Devuelve (únicas, copias, conflictos):
+      únicas     : fuentes a leer, en el orden original (una por contenido)
+      copias     : [(fuente descartada, fuente que se conserva)]
+      conflictos : [(período, [fuentes distintas que lo declaran])]
+    """
+    huellas = []
+    for f in fuentes:
+        try:
+            huellas.append(huella(f))
+        except (OSError, KeyError, zipfile.BadZipFile) as e:
+            # que el error lo reporte la lectura, como siempre
+            print(f"   ! sin huella para {nombre_fuente(f)}: {e}")
+            huellas.append({"fuente": f, "tamano": None, "inicio": None, "periodos": ()})
+
+    # hash completo sólo dentro de los grupos (tamaño, bloque inicial) con más de una fuente
+    candidatos = defaultdict(list)
+    for h in huellas:
+        if h["tamano"] is not None:
+            candidatos[(h["tamano"], h["inicio"])].append(h)
+
+    original = {}  # fuente → fuente conservada de la que es copia
+    for grupo in candidatos.values():
+        if len(grupo) < 2:
+            continue
+        iguales = defaultdict(list)
+        for h in grupo:
+            iguales[hash_completo(h["fuente"])].append(h["fuente"])
+        for fs in iguales.values():
+            conservada = min(fs, key=_preferencia)
+            original.update((f, conservada) for f in fs if f != conservada)
+
+    unicas = [h for h in huellas if h["fuente"] not in original]
+    copias = list(original.items())
+
+    por_periodo = defaultdict(list)
+    for h in unicas:
+        for p in h["periodos"]:
+            por_periodo[p].append(h["fuente"])
+    conflictos = [(p, fs) for p, fs in sorted(por_periodo.items()) if len(fs) > 1]
+
+    return [h["fuente"] for h in unicas], copias, conflictos
+
+
+def descartar_copias(fuentes: list, informar: bool = True) -> list:
+    """Fuentes sin las copias exactas; informa copias y conflictos de período."""
+    if len(fuentes) < 2:
+        return list(fuentes)
+    unicas, copias, conflictos = clasificar(fuentes)
+    if informar:
+        for f, o in copias:
+            print(f"   = copia exacta, se omite: {nombre_fuente(f)} (igual a {nombre_fuente(o)})")
+        for (ano, tri), fs in conflictos:
+            print(f"   ! {ano}-T{tri} aparece en {len(fs)} fuentes distintas: "
+                  + ", ".join(nombre_fuente(f) for f in fs))
+    return unicas
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    import sys
+    from pathlib import Path
+
+    from lectura_zip import listar_fuentes
+
+    input_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("data")
+    for tipo in ("individual", "hogar"):
+        fuentes = listar_fuentes(input_dir, tipo, sin_copias=False)
+        print(f"{tipo}: {len(fuentes)} fuente(s)")
+        unicas = descartar_copias(fuentes)
+        print(f"   → {len(unicas)} a leer, {len(fuentes) - len(unicas)} copia(s) omitida(s)")
+
+
+if __name__ == "__main__":
+    main()
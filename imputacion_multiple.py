@@ -0,0 +1,133 @@
+# ============================================================
+# IMPUTACIÓN MÚLTIPLE CON DONANTES DE LA MISMA HOJA
+# model_for_city escribe UN valor por fila (la media de la hoja),
+# lo que achica la varianza de los ingresos imputados. Acá se
+# generan M imputaciones: cada una sortea un ingreso observado
+# del train que cayó en la misma hoja del árbol que el receptor.
+#
+# Todo vectorizado: apply() da las hojas, los donantes quedan
+# ordenados por hoja (inicio + cantidad por hoja) y el sorteo de
+# las M imputaciones es una sola indexación con números al azar.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+N_IMPUTACIONES = 20
+SEMILLA = 42
+
+
+# ---------------------- Donantes ---------------------------
+def donantes_por_hoja(pipe, X, y) -> dict:
+    """
+    Ordena los ingresos observados por hoja del árbol.
+    Devuelve y ordenado + inicio y cantidad de donantes por id de nodo.
+    """
+    tree = pipe.named_steps["model"]
+    if not hasattr(tree, "apply"):
+        raise TypeError("La imputación por hoja necesita el modelo 'tree' (DecisionTreeRegressor).")
+
+    hojas = tree.apply(pipe.named_steps["prep"].transform(X))
+    orden = np.argsort(hojas, kind="stable")
+    hojas_ord = hojas[orden]
+
+    n_nodos = tree.tree_.node_count
+    ids, inicio, cantidad = np.unique(hojas_ord, return_index=True, return_counts=True)
+    inicio_nodo = np.zeros(n_nodos, dtype=np.int64)
+    cantidad_nodo = np.zeros(n_nodos, dtype=np.int64)
+    inicio_nodo[ids] = inicio
+    cantidad_nodo[ids] = cantidad
+
+    return {
+        "y": np.asarray(y, dtype=float)[orden],
+        "inicio": inicio_nodo,
+        "cantidad": cantidad_nodo,
+    }
+
+
+def imputar_multiple(pipe, X, y, X_miss, m=N_IMPUTACIONES, semilla=SEMILLA) -> np.ndarray:
+    """
+    Matriz (filas de X_miss) × m con un donante sorteado por imputación.
+    Si una hoja no tiene donantes se usa la predicción del árbol.
+    """
+    don = donantes_por_hoja(pipe, X, y)
+    tree = pipe.named_steps["model"]
+    hojas = tree.apply(pipe.named_steps["prep"].transform(X_miss))
+
+    inicio = don["inicio"][hojas]
+    cantidad = don["cantidad"][hojas]
+
+    rng = np.random.default_rng(semilla)
+    u = rng.random((len(hojas), m))
+    idx = inicio[:, None] + (u * cantidad[:, None]).astype(np.int64)
+    idx = np.minimum(idx, max(len(don["y"]) - 1, 0))
+    valores = don["y"][idx] if len(don["y"]) else np.full(idx.shape, np.nan)
+
+    sin_donantes = cantidad == 0
+    if sin_donantes.any():
+        valores[sin_donantes] = pipe.predict(X_miss[sin_donantes])[:, None]
+
+    return valores.astype(np.float32)
+
+
+# ---------------------- Formatos ---------------------------
+def formato_ancho(valores: np.ndarray, index) -> pd.DataFrame:
+    """Una columna por imputación: imp_1 … imp_M (float32)."""
+    cols = [f"imp_{k + 1}" for k in range(valores.shape[1])]
+    return pd.DataFrame(valores, index=index, columns=cols)
+
+
+def formato_largo(valores: np.ndarray, index) -> pd.DataFrame:
+    """Una fila por (fila original, imputación)."""
+    n, m = valores.shape
+    return pd.DataFrame({
+        "fila": np.repeat(np.asarray(index), m),
+        "imputacion": np.tile(np.arange(1, m + 1, dtype=np.int16), n),
+        "P21_real_2025_imputado": valores.ravel(),
+    })
+
+
+def guardar(df: pd.DataFrame, destino: Path) -> Path:
+    """Parquet si hay pyarrow (más chico); si no, CSV."""
+    try:
+        import pyarrow  # noqa: F401
+        destino = destino.with_suffix(".parquet")
+        df.to_parquet(destino)
+    except ImportError:
+        destino = destino.with_suffix(".csv")
+        df.to_csv(destino)
+    return destino
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    from modelo import (
+        load_clean_data, load_imputer_tables, build_feature_sets, build_pipeline, prepare_missing_features,
+    )
+
+    df_train, df_missing = load_clean_data()
+    tablas = load_imputer_tables(df_train, df_missing)
+    out = Path("processed")
+
+    for city_name, aglo in [("posadas", 7), ("rada_tilly", 9)]:
+        tr = df_train[df_train["AGLOMERADO"] == aglo]
+        mi = df_missing[df_missing["AGLOMERADO"] == aglo]
+        if tr.empty or mi.empty:
+            print(f"[AVISO] No hay datos para {city_name}.")
+            continue
+
+        X, y, numeric, categorical, feature_cols = build_feature_sets(tr)
+        pipe = build_pipeline(numeric, categorical, "tree")
+        pipe.fit(X, y)
+
+        X_miss = prepare_missing_features(mi, feature_cols, tablas)
+        valores = imputar_multiple(pipe, X, y, X_miss, N_IMPUTACIONES)
+
+        destino = guardar(formato_ancho(valores, mi.index), out / f"imputaciones_multiples_{city_name}")
+        print(f"{city_name}: {valores.shape[0]} filas × {valores.shape[1]} imputaciones → {destino}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# ============================================================
+# IMPUTACIÓN JERÁRQUICA POR MEDIANAS (horas y edad)
+# Antes: PP3E_TOT se completaba con un lambda por grupo de CAT_OCUP
+# (una llamada de Python por grupo, sin respaldo si el grupo no
+# tenía datos) y al predecir, model_for_city rellenaba con 0 todo
+# lo que faltara. Acá se aprenden medianas en celdas cada vez más
+# gruesas:
+#   aglomerado × período × CAT_OCUP → aglomerado × CAT_OCUP → global
+# con un groupby().median() por nivel (todas las columnas a la vez)
+# y se completa cada faltante con la celda más fina que tenga al
+# menos MIN_CELDA datos. Las tablas se guardan en JSON: limpiezaModelo
+# las ajusta una vez y modelo.py aplica las mismas al predecir.
+#   tablas = ajustar(df, COLUMNAS)      # "fit"
+#   df = imputar(df, tablas)            # "transform"
+# ============================================================
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+TABLAS_PATH = Path("processed") / "imputador_medianas.json"
+
+# Numéricas continuas del modelo (nombres crudos, antes del RENAME_MAP de
+# modelo.py). Quedan afuera: age2 (se recalcula como CH06² después de
+# imputar), formal (dummy 0/1, NaN a propósito donde PP07H no aplica: esas
+# filas las descarta el dropna de build_feature_sets) y years_education
+# (sale de educ_scale, que ya se completa con 0)
+COLUMNAS = ["PP3E_TOT", "CH06"]
+
+# De la celda más fina a la más gruesa; [] = mediana global
+NIVELES = [
+    ["AGLOMERADO", "ANO4", "TRIMESTRE", "CAT_OCUP"],
+    ["AGLOMERADO", "CAT_OCUP"],
+    [],
+]
+
+MIN_CELDA = 5   # datos no faltantes mínimos para confiar en la mediana de una celda
+
+
+# ---------------------- Ajuste ------------------------------
+def _numericas(df: pd.DataFrame, cols: list) -> pd.DataFrame:
+    """Claves y valores como float (7 y 7.0 caen en la misma celda)."""
+    return pd.DataFrame({c: pd.to_numeric(df[c], errors="coerce").astype("float64") for c in cols},
+                        index=df.index)
+
+
+def ajustar(df: pd.DataFrame, columnas=COLUMNAS, niveles=NIVELES, min_celda: int = MIN_CELDA) -> dict:
+    """
+    Medianas por celda para cada nivel. Las celdas con menos de min_celda
+    datos de una columna quedan en NaN para esa columna (se cae al nivel
+    siguiente). El nivel global siempre tiene valor si hay algún dato.
+    """
+    columnas = [c for c in columnas if c in df.columns]
+    tablas = {"columnas": columnas, "min_celda": min_celda, "niveles": []}
+
+    for claves in niveles:
+        if any(c not in df.columns for c in claves):
+            continue
+        d = _numericas(df, claves + columnas)
+        if claves:
+            g = d.groupby(claves, sort=True)
+            med = g[columnas].median()
+            med = med.where(g[columnas].count() >= min_celda)
+            med = med.dropna(how="all").reset_index()
+        else:
+            med = d[columnas].median().to_frame().T
+        tablas["niveles"].append({"claves": claves, "tabla": med})
+    return tablas
+
+
+# ---------------------- Aplicación --------------------------
+def imputar(df: pd.DataFrame, tablas: dict, informar: bool = False) -> pd.DataFrame:
+    """Completa los NaN de las columnas de tablas con la celda más fina disponible."""
+    columnas = [c for c in tablas["columnas"] if c in df.columns]
+    if not columnas:
+        return df
+
+    valores = _numericas(df, columnas).to_numpy(copy=True)
+    falta = np.isnan(valores)
+    total = int(falta.sum())
+    con_faltantes = falta.any(axis=0)
+    por_nivel = []
+
+    for nivel in tablas["niveles"]:
+        if not falta.any():
+            break
+        claves, med = nivel["claves"], nivel["tabla"]
+        if any(c not in df.columns for c in claves):
+            continue
+        cols = [c for c in columnas if c in med.columns]
+        idx = [columnas.index(c) for c in cols]
+
+        filas = np.flatnonzero(falta.any(axis=1))
+        candidatos = np.full((len(filas), len(columnas)), np.nan)
+        if claves:
+            izq = _numericas(df.iloc[filas], claves)
+            candidatos[:, idx] = izq.merge(med[claves + cols], on=claves, how="left")[cols].to_numpy()
+        else:
+            candidatos[:, idx] = med[cols].to_numpy()[0]
+        sub = valores[filas]
+        hueco = np.isnan(sub)
+        sub[hueco] = candidatos[hueco]
+        valores[filas] = sub
+
+        antes = int(falta.sum())
+        falta = np.isnan(valores)
+        por_nivel.append((" × ".join(claves) or "global", antes - int(falta.sum())))
+
+    if total:
+        df = df.copy()
+        for j, c in enumerate(columnas):
+            if con_faltantes[j]:  # el resto conserva su dtype
+                df[c] = valores[:, j]
+        if informar:
+            detalle = ", ".join(f"{n}: {k}" for n, k in por_nivel)
+            print(f"   Imputación jerárquica: {total} faltantes → {detalle}")
+    return df
+
+
+# ---------------------- Persistencia -----------------------
+def guardar_tablas(tablas: dict, path: Path = TABLAS_PATH):
+    """
+    JSON con una lista de filas [claves…, medianas…] por nivel (NaN → null).
+    "origen" (opcional) identifica los datos con que se ajustaron, para que
+    quien las cargue pueda comprobar que corresponden a lo que va a imputar.
+    """
+    salida = {
+        "columnas": tablas["columnas"],
+        "min_celda": tablas["min_celda"],
+        "origen": tablas.get("origen"),
+        "niveles": [
+            {
+                "claves": n["claves"],
+                "columnas": list(n["tabla"].columns),
+                "filas": n["tabla"].astype(object).where(n["tabla"].notna(), None).to_numpy().tolist(),
+            }
+            for n in tablas["niveles"]
+        ],
+    }
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(salida, fh, indent=1)
+
+
+def cargar_tablas(path: Path = TABLAS_PATH) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        data = json.load(fh)
+    niveles = [
+        {"claves": n["claves"],
+         "tabla": pd.DataFrame(n["filas"], columns=n["columnas"], dtype="float64")}
+        for n in data["niveles"]
+    ]
+    return {"columnas": data["columnas"], "min_celda": data["min_celda"],
+            "origen": data.get("origen"), "niveles": niveles}
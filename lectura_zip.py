@@ -0,0 +1,107 @@
+# ============================================================
+# LECTURA DIRECTA DE LOS ZIP DE INDEC (sin descomprimir a data/)
+# INDEC publica cada trimestre como un ZIP con los TXT adentro, y
+# los nombres cambian según el año:
+#   usu_individual_T117.txt
+#   EPH_usu_1er_Trim_2017_txt/usu_individual_T117.txt.txt
+#   Usu_individual_T416.txt, usu_individual_t324.txt, …
+# Acá se arma una lista de "fuentes" (TXT sueltos + miembros de ZIP)
+# y se leen en paralelo con hilos: la descompresión (zlib) y el
+# parser de pandas liberan el GIL, así que un archivo se descomprime
+# mientras otro se parsea. Cada hilo abre su propio ZipFile.
+# ============================================================
+
+import os
+import re
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from hogares import es_archivo_hogar
+from muestreo import filtrar_lineas
+
+# ---------------------- Configuración -----------------------
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+# Nombres de los miembros dentro del ZIP (tolerante a mayúsculas,
+# separadores y a la doble extensión .txt.txt de algunos años)
+PATRONES = {
+    "individual": re.compile(r"usu[\s_-]*individual[^/]*\.txt$", re.IGNORECASE),
+    "hogar": re.compile(r"usu[\s_-]*hogar[^/]*\.txt$", re.IGNORECASE),
+}
+
+
+# ---------------------- Fuentes -----------------------------
+def miembros_zip(zip_path: Path, tipo: str = "individual") -> list:
+    """Miembros del ZIP que son la base pedida (ignora carpetas y __MACOSX)."""
+    patron = PATRONES[tipo]
+    with zipfile.ZipFile(zip_path) as z:
+        return sorted(
+            n for n in z.namelist()
+            if not n.endswith("/") and "__MACOSX" not in n and patron.search(n)
+        )
+
+
+def listar_fuentes(input_dir: Path, tipo: str = "individual", sin_copias: bool = True) -> list:
+    """
+    Fuentes a leer como (ruta, miembro): miembro es None para un TXT suelto
+    y el nombre interno para un archivo dentro de un ZIP. Con sin_copias,
+    se omiten las copias exactas de una misma fuente (ver huellas_fuentes.py).
+    """
+    input_dir = Path(input_dir)
+    es_hogar = tipo == "hogar"
+
+    fuentes = [(f, None) for f in sorted(input_dir.glob("*.txt")) if es_archivo_hogar(f) == es_hogar]
+    for z in sorted(input_dir.glob("*.zip")):
+        try:
+            fuentes.extend((z, m) for m in miembros_zip(z, tipo))
+        except zipfile.BadZipFile:
+            print(f"   ! ZIP dañado: {z.name}")
+
+    if sin_copias:
+        from huellas_fuentes import descartar_copias  # importa este módulo
+        fuentes = descartar_copias(fuentes)
+    return fuentes
+
+
+def nombre_fuente(fuente) -> str:
+    """'usu_individual_T117.txt' o 'EPH_2017_T1.zip:usu_individual_T117.txt'."""
+    ruta, miembro = fuente
+    return ruta.name if miembro is None else f"{ruta.name}:{Path(miembro).name}"
+
+
+@contextmanager
+def abrir_fuente(fuente):
+    """Archivo binario listo para pd.read_csv (TXT suelto o miembro del ZIP)."""
+    ruta, miembro = fuente
+    if miembro is None:
+        with open(ruta, "rb") as fh:
+            yield fh
+    else:
+        with zipfile.ZipFile(ruta) as z, z.open(miembro) as fh:
+            yield fh
+
+
+# ---------------------- Lectura en paralelo ----------------
+def leer_fuentes(fuentes: list, leer, max_workers: int = MAX_WORKERS, fraccion=None) -> list:
+    """
+    Aplica leer(archivo_binario) a cada fuente con un pool de hilos.
+    Devuelve [(fuente, resultado)] en el mismo orden; si una lectura
+    falla, el resultado es la excepción (el que llama decide qué hacer).
+    Con fraccion, leer() recibe sólo las líneas de los hogares de la
+    submuestra (ver muestreo.py).
+    """
+    def tarea(fuente):
+        try:
+            with abrir_fuente(fuente) as fh:
+                return leer(filtrar_lineas(fh, fraccion) if fraccion else fh)
+        except Exception as e:
+            return e
+
+    if max_workers <= 1 or len(fuentes) <= 1:
+        resultados = [tarea(f) for f in fuentes]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as ex:
+            resultados = list(ex.map(tarea, fuentes))
+    return list(zip(fuentes, resultados))
@@ -2,6 +2,14 @@ import pandas as pd
 import numpy as np
 from pathlib import Path
 
+from hogares import cargar_hogares, unir_hogar_personas
+from lectura_zip import listar_fuentes, leer_fuentes, nombre_fuente
+from muestreo import fraccion_desde_argv, ruta_muestra
+from imputador_jerarquico import (
+    COLUMNAS as IMPUTABLES, TABLAS_PATH, ajustar as ajustar_medianas,
+    imputar as imputar_medianas, guardar_tablas,
+)
+
 # ==========================
 # CONFIG
 # ==========================
@@ -30,22 +38,28 @@ CONFIG = {
 POSADAS = [7]
 RADA_TILLY = [9]
 
+# Variables de la base de hogares que se agregan si están los usu_hogar
+HOUSEHOLD_COLS = ["IX_TOT", "ITF", "IPCF"]
+
 
 # ==========================
 # LOAD ALL TXT
 # ==========================
 
-def load_all_eph(folder="data"):
-    path = Path(folder)
-    files = sorted(path.glob("*.txt"))
+def load_all_eph(folder="data", fraccion=None):
+    # TXT sueltos + usu_individual dentro de los ZIP de INDEC (en paralelo)
+    fuentes = listar_fuentes(Path(folder))
 
-    if not files:
-        raise FileNotFoundError("No hay archivos .txt en /data")
+    if not fuentes:
+        raise FileNotFoundError("No hay archivos .txt ni .zip en /data")
 
     dfs = []
-    for f in files:
-        print(f"Leyendo {f}")
-        dfs.append(pd.read_csv(f, sep=";", encoding="latin-1"))
+    leer = lambda fh: pd.read_csv(fh, sep=";", encoding="latin-1")
+    for fuente, df_f in leer_fuentes(fuentes, leer, fraccion=fraccion):
+        if isinstance(df_f, Exception):
+            raise df_f
+        print(f"Leyendo {nombre_fuente(fuente)}")
+        dfs.append(df_f)
 
     df = pd.concat(dfs, ignore_index=True)
 
@@ -68,7 +82,8 @@ def load_all_eph(folder="data"):
 
 def apply_ipc_deflation(df):
     """
-    Une IPC trimestral y crea P21_real_2025.
+    Une IPC trimestral y crea P21_real_2025
+    (y ITF/IPCF reales si vienen de la base de hogares).
     """
 
     ipc = pd.read_csv("ipc_trimestral.csv")  # ya existe en proyecto
@@ -89,6 +104,11 @@ def apply_ipc_deflation(df):
     # ingreso real
     df["P21_real_2025"] = df["P21"] * (ipc_ref / df["IPC"])
 
+    # ingreso del hogar real (total y per cápita)
+    for col in ["ITF", "IPCF"]:
+        if col in df.columns:
+            df[f"{col}_real_2025"] = pd.to_numeric(df[col], errors="coerce") * (ipc_ref / df["IPC"])
+
     return df
 
 
@@ -113,10 +133,10 @@ def select_occupied(df):
     ].copy()
 
 
-def remove_invalid_obs(df):
+def remove_invalid_obs(df, age_range=(18, 85), hours_range=(0, 80)):
     c = CONFIG
-    df = df[(df[c["age"]].between(18, 85))].copy()
-    df = df[(df[c["hours"]] > 0) & (df[c["hours"]] <= 80)].copy()
+    df = df[(df[c["age"]].between(*age_range))].copy()
+    df = df[(df[c["hours"]] > hours_range[0]) & (df[c["hours"]] <= hours_range[1])].copy()
     return df
 
 
@@ -164,10 +184,13 @@ def create_variables(df):
 # FALTANTES
 # ==========================
 
-def handle_missing(df):
-    df["PP3E_TOT"] = df.groupby("CAT_OCUP")["PP3E_TOT"].transform(
-        lambda x: x.fillna(x.median())
-    )
+def handle_missing(df, tablas=None):
+    # horas y edad: medianas jerárquicas
+    # (aglomerado × período × CAT_OCUP → aglomerado × CAT_OCUP → global)
+    if tablas is None:
+        tablas = ajustar_medianas(df, IMPUTABLES)
+    df = imputar_medianas(df, tablas, informar=True)
+    df["age2"] = df["CH06"] ** 2
     df["educ_scale"] = df["educ_scale"].fillna(0)
     df["PP04D_COD"] = df["PP04D_COD"].fillna("Desconocido")
     return df
@@ -198,26 +221,39 @@ def split_income_real(df):
 # MAIN PIPELINE
 # ==========================
 
-def clean_eph():
-    df = load_all_eph("data")
+def clean_eph(fraccion=None):
+    # fraccion: submuestra determinística de hogares (--sample), ver muestreo.py
+    df = load_all_eph("data", fraccion)
 
     df = filter_periods(df)
     df = select_occupied(df)
     df = remove_invalid_obs(df)
 
+    # variables del hogar (si están los usu_hogar en /data)
+    hh_cols = [c for c in HOUSEHOLD_COLS if c not in df.columns]
+    if hh_cols and listar_fuentes(Path("data"), "hogar"):
+        df = unir_hogar_personas(df, cargar_hogares(Path("data"), hh_cols, fraccion), hh_cols)
+
     # IPC + ingreso real
     df = apply_ipc_deflation(df)
 
     df = map_education(df)
     df = create_variables(df)
-    df = handle_missing(df)
+
+    # las medianas se ajustan una vez y se guardan: modelo.py aplica las mismas
+    tablas = ajustar_medianas(df, IMPUTABLES)
+    df = handle_missing(df, tablas)
 
     df_train, df_missing = split_income_real(df)
 
+    # con las filas de cada CSV, modelo.py verifica que las tablas sean de estos datos
+    tablas["origen"] = {"fraccion": fraccion, "train": len(df_train), "missing": len(df_missing)}
+    guardar_tablas(tablas, ruta_muestra(TABLAS_PATH, fraccion))
+
     Path("processed").mkdir(exist_ok=True)
 
-    df_train.to_csv("processed/eph_train_ingreso_real.csv", index=False)
-    df_missing.to_csv("processed/eph_missing_ingreso_real.csv", index=False)
+    df_train.to_csv(ruta_muestra("processed/eph_train_ingreso_real.csv", fraccion), index=False)
+    df_missing.to_csv(ruta_muestra("processed/eph_missing_ingreso_real.csv", fraccion), index=False)
 
     print("Limpieza completa con ingreso real.")
     print("Filas TRAIN:", len(df_train))
@@ -225,4 +261,5 @@ def clean_eph():
 
 
 if __name__ == "__main__":
-    clean_eph()
+    import sys
+    clean_eph(fraccion_desde_argv(sys.argv[1:]))
@@ -15,6 +15,11 @@
 import pandas as pd
 from pathlib import Path
 
+from clave_entera import resolver, puntaje_filas
+from lectura_zip import listar_fuentes, leer_fuentes, nombre_fuente
+from muestreo import fraccion_desde_argv, ruta_muestra
+from limpieza_tp import activar_copy_on_write
+
 # ---------------------- CONFIG -----------------------
 INPUT_DIR  = Path("data")   # Carpeta con todos los TXT
 OUTPUT_PATH = "personas_2016_2025_todos_trimestres_limpio_sin_outliers.csv"
@@ -37,26 +42,35 @@ INT_COLS = ["ANO4","TRIMESTRE","AGLOMERADO","NRO_HOGAR","COMPONENTE",
 # CARGA DE ARCHIVOS
 # ============================================================
 
-def cargar_multiples_txt(input_dir: Path) -> pd.DataFrame:
+def _leer_personas(fh):
+    df = pd.read_csv(fh, sep=";", dtype=str, usecols=lambda c: c in COLS_KEEP)
+    cols = [c for c in COLS_KEEP if c in df.columns]
+    if not cols:
+        return None
+
+    df = df[cols].copy()
+    df["CODUSU"] = df["CODUSU"].astype(str).str.strip()
+    return df
+
+
+def cargar_multiples_txt(input_dir: Path, fraccion=None) -> pd.DataFrame:
+    # TXT sueltos + usu_individual dentro de los ZIP de INDEC, leídos en paralelo
     frames = []
-    files = sorted(input_dir.glob("*.txt"))
-    if not files:
-        raise FileNotFoundError(f"No se encontraron TXT en {input_dir.resolve()}")
-
-    for f in files:
-        try:
-            df = pd.read_csv(f, sep=";", dtype=str)
-            cols = [c for c in COLS_KEEP if c in df.columns]
-            if not cols:
-                continue
-
-            df = df[cols].copy()
-            df["CODUSU"] = df["CODUSU"].astype(str).str.strip()
-            df["__archivo_origen"] = f.name
-            frames.append(df)
-            print(f"   + leído: {f.name} | filas: {len(df)}")
-        except Exception as e:
-            print(f"   ! error leyendo {f.name}: {e}")
+    fuentes = listar_fuentes(input_dir)
+    if not fuentes:
+        raise FileNotFoundError(f"No se encontraron TXT ni ZIP en {input_dir.resolve()}")
+
+    for fuente, df in leer_fuentes(fuentes, _leer_personas, fraccion=fraccion):
+        nombre = nombre_fuente(fuente)
+        if isinstance(df, Exception):
+            print(f"   ! error leyendo {nombre}: {df}")
+            continue
+        if df is None:
+            continue
+
+        df["__archivo_origen"] = nombre
+        frames.append(df)
+        print(f"   + leído: {nombre} | filas: {len(df)}")
 
     return pd.concat(frames, ignore_index=True)
 
@@ -65,8 +79,9 @@ def cargar_multiples_txt(input_dir: Path) -> pd.DataFrame:
 # TIPADO
 # ============================================================
 
-def tipar_columnas(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+def tipar_columnas(df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
+    if copiar:
+        df = df.copy()
     for c in INT_COLS:
         if c in df:
             df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
@@ -85,20 +100,17 @@ def tipar_columnas(df: pd.DataFrame) -> pd.DataFrame:
 # OUTLIERS DE INGRESO
 # ============================================================
 
-def eliminar_outliers_ingresos_por_anio(df: pd.DataFrame, col="P47T", q=0.995) -> pd.DataFrame:
-    df = df.copy()
+def eliminar_outliers_ingresos_por_anio(df: pd.DataFrame, col="P47T", q=0.995, copiar: bool = True) -> pd.DataFrame:
+    if copiar:
+        df = df.copy()
     if col not in df.columns:
         return df
 
-    def _clean(gr):
-        valid = gr[col].dropna()
-        if valid.empty:
-            return gr
-        lim = valid.quantile(q)
-        gr.loc[gr[col] > lim, col] = pd.NA
-        return gr
-
-    return df.groupby("ANO4", group_keys=False).apply(_clean)
+    # límite del año alineado a cada fila: no depende de que apply() conserve
+    # la columna ANO4 (pandas 3 la saca de los grupos) ni reordena las filas
+    lim = df.groupby("ANO4")[col].transform("quantile", q)
+    df.loc[df[col] > lim, col] = pd.NA
+    return df
 
 
 # ============================================================
@@ -106,39 +118,37 @@ def eliminar_outliers_ingresos_por_anio(df: pd.DataFrame, col="P47T", q=0.995) -
 # ============================================================
 
 def filtrar_universo(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+    # Todas las reglas en una sola máscara, aplicada una vez (una sola copia)
 
     # AÑOS DEL TP
-    df = df[df["ANO4"].between(2016, 2025)]
+    mask = df["ANO4"].between(2016, 2025)
 
     # Aglomerados del TP
-    df = df[df["AGLOMERADO"].isin([7, 9])]
+    mask &= df["AGLOMERADO"].isin([7, 9])
 
     # Entrevista individual realizada
-    df = df[df["H15"] == 1]
+    mask &= df["H15"] == 1
 
-    # Edad >= 18 (con control de edades imposibles)
-    df.loc[(df["CH06"] < 0) | (df["CH06"] > 110), "CH06"] = pd.NA
-    df = df[df["CH06"].notna()]
-    df = df[df["CH06"] >= 18]
+    # Edad >= 18 (con control de edades imposibles: <0 o >110)
+    mask &= df["CH06"].between(0, 110) & (df["CH06"] >= 18)
 
-    # ESTADO: solo ocupados (1) y desocupados (2)
-    df.loc[df["ESTADO"].isin([9,99,999]), "ESTADO"] = pd.NA
-    df = df[df["ESTADO"].isin([1,2])]
+    # ESTADO: solo ocupados (1) y desocupados (2); Ns/Nr 9/99/999 quedan afuera
+    mask &= df["ESTADO"].isin([1,2])
 
-    return df
+    return df[mask.fillna(False).astype(bool)]
 
 
 # ============================================================
 # SANIDAD BÁSICA
 # ============================================================
 
-def sanidad_basica(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+def sanidad_basica(df: pd.DataFrame, max_horas: float = 168, copiar: bool = True) -> pd.DataFrame:
+    if copiar:
+        df = df.copy()
 
     for c in ["PP3E_TOT","PP3F_TOT"]:
         if c in df:
-            df.loc[(df[c] < 0) | (df[c] > 168), c] = pd.NA
+            df.loc[(df[c] < 0) | (df[c] > max_horas), c] = pd.NA
 
     if "CAT_OCUP" in df:
         df.loc[df["CAT_OCUP"].isin([9,99,999]), "CAT_OCUP"] = pd.NA
@@ -151,36 +161,24 @@ def sanidad_basica(df: pd.DataFrame) -> pd.DataFrame:
 # ============================================================
 
 def elegir_mejor(gr: pd.DataFrame) -> pd.DataFrame:
-    vars_info = [c for c in
-                 ["ESTADO","CAT_OCUP","CH04","CH06","PP3E_TOT","PP3F_TOT","P47T","PONDERA","H15"]
-                 if c in gr.columns]
-
-    s1 = (gr["H15"] == 1).astype(int)
-    s2 = gr[vars_info].notna().sum(axis=1)
-    s3 = gr["PONDERA"].notna().astype(int)
-
-    score = s1*1000 + s2*10 + s3
+    # mismo puntaje que usa resolver_duplicados (clave_entera.puntaje_filas)
+    score = pd.Series(puntaje_filas(gr), index=gr.index)
     return gr.loc[[score.idxmax()]]
 
 
-def resolver_duplicados(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
-    if not df.duplicated(subset=CLAVE).any():
-        return df.reset_index(drop=True)
-
-    return (
-        df.groupby(CLAVE, group_keys=False)
-          .apply(lambda g: g if len(g)==1 else elegir_mejor(g))
-          .reset_index(drop=True)
-    )
+def resolver_duplicados(df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
+    if copiar:
+        df = df.copy()
+    # CLAVE codificada como int64: orden + primera fila de cada clave
+    return resolver(df, CLAVE)
 
 
 # ============================================================
 # NORMALIZAR NOMBRES
 # ============================================================
 
-def normalizar_nombres(df: pd.DataFrame) -> pd.DataFrame:
-    df2 = df.copy()
+def normalizar_nombres(df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
+    df2 = df.copy() if copiar else df
     df2.columns = df2.columns.str.lower()
     return df2
 
@@ -189,33 +187,42 @@ def normalizar_nombres(df: pd.DataFrame) -> pd.DataFrame:
 # MAIN
 # ============================================================
 
-def main():
+def main(sin_copias: bool = False, fraccion=None):
+    # sin_copias: etapas en el lugar (sin df.copy()) + copy-on-write
+    copiar = not sin_copias
+    if sin_copias:
+        activar_copy_on_write()
+
     print("1) Cargando TXT…")
-    df = cargar_multiples_txt(INPUT_DIR)
+    df = cargar_multiples_txt(INPUT_DIR, fraccion)
+    if fraccion:
+        print(f"   (submuestra de hogares: {fraccion:g})")
     print(f"   Filas leídas: {len(df)}")
 
     print("2) Tipando columnas…")
-    df = tipar_columnas(df)
+    df = tipar_columnas(df, copiar=copiar)
 
     print("3) Filtrando universo…")
     df = filtrar_universo(df)
     print(f"   Filas tras filtros: {len(df)}")
 
     print("4) Sanidad básica…")
-    df = sanidad_basica(df)
+    df = sanidad_basica(df, copiar=copiar)
 
     print("5) Eliminando outliers de ingresos…")
-    df = eliminar_outliers_ingresos_por_anio(df, "P47T", q=0.995)
+    df = eliminar_outliers_ingresos_por_anio(df, "P47T", q=0.995, copiar=copiar)
 
     print("6) Resolviendo duplicados…")
-    df = resolver_duplicados(df)
+    df = resolver_duplicados(df, copiar=copiar)
 
     print("7) Normalizando nombres…")
-    df = normalizar_nombres(df)
+    df = normalizar_nombres(df, copiar=copiar)
 
     print("8) Guardando archivo final…")
-    df.to_csv(OUTPUT_PATH, index=False)
-    print(f"✅ Listo: {OUTPUT_PATH}")
+    destino = ruta_muestra(OUTPUT_PATH, fraccion)
+    df.to_csv(destino, index=False)
+    print(f"✅ Listo: {destino}")
 
 if __name__ == "__main__":
-    main()
+    import sys
+    main(sin_copias="--sin-copias" in sys.argv, fraccion=fraccion_desde_argv(sys.argv[1:]))
@@ -13,6 +13,10 @@
 import pandas as pd
 from pathlib import Path
 
+from clave_entera import diagnostico, resolver, puntaje_filas
+from lectura_zip import listar_fuentes, leer_fuentes, nombre_fuente
+from muestreo import fraccion_desde_argv, ruta_muestra
+
 # ---------------------- Configuración -----------------------
 INPUT_DIR  = Path("data")  # carpeta con los TXT de usu_individual
 OUTPUT_PATH = "personas_2016_2025_todos_trimestres_limpio.csv"
@@ -34,37 +38,58 @@ INT_COLS = ["ANO4","TRIMESTRE","AGLOMERADO","NRO_HOGAR","COMPONENTE","H15","CH06
 
 
 # ---------------------- Funciones base ----------------------
-def cargar_multiples_txt(input_dir: Path) -> pd.DataFrame:
+def _leer_personas(fh):
+    """Un TXT de personas (sep=';') con las columnas esperadas; None si no las tiene."""
+    df = pd.read_csv(fh, sep=";", dtype=str, usecols=lambda c: c in COLS_KEEP)
+    cols = [c for c in COLS_KEEP if c in df.columns]
+    if not cols:
+        return None
+    df = df[cols].copy()
+    if "CODUSU" in df.columns:
+        df["CODUSU"] = df["CODUSU"].astype(str).str.strip()
+    return df
+
+
+def cargar_multiples_txt(input_dir: Path, fraccion=None) -> pd.DataFrame:
     """
-    Lee todos los TXT en INPUT_DIR (sep=';'), conserva columnas esperadas
-    y concatena en un único DataFrame. Ignora archivos sin columnas clave.
+    Lee todos los TXT en INPUT_DIR (sep=';') y los usu_individual dentro
+    de los ZIP de INDEC (en paralelo), conserva columnas esperadas y
+    concatena en un único DataFrame. Ignora archivos sin columnas clave.
     """
     frames = []
-    files = sorted(input_dir.glob("*.txt"))
-    if not files:
-        raise FileNotFoundError(f"No se encontraron TXT en {input_dir.resolve()}")
-    for f in files:
-        try:
-            df = pd.read_csv(f, sep=";", dtype=str)
-            cols = [c for c in COLS_KEEP if c in df.columns]
-            if not cols:
-                continue
-            df = df[cols].copy()
-            if "CODUSU" in df.columns:
-                df["CODUSU"] = df["CODUSU"].astype(str).str.strip()
-            df["__archivo_origen"] = f.name  # tracking opcional
-            frames.append(df)
-            print(f"   + leído: {f.name} | filas: {len(df)}")
-        except Exception as e:
-            print(f"   ! error leyendo {f.name}: {e}")
+    fuentes = listar_fuentes(input_dir)
+    if not fuentes:
+        raise FileNotFoundError(f"No se encontraron TXT ni ZIP en {input_dir.resolve()}")
+    for fuente, df in leer_fuentes(fuentes, _leer_personas, fraccion=fraccion):
+        nombre = nombre_fuente(fuente)
+        if isinstance(df, Exception):
+            print(f"   ! error leyendo {nombre}: {df}")
+            continue
+        if df is None:
+            continue
+        df["__archivo_origen"] = nombre  # tracking opcional
+        frames.append(df)
+        print(f"   + leído: {nombre} | filas: {len(df)}")
     if not frames:
         raise ValueError("No se pudo leer ningún archivo con las columnas esperadas.")
     return pd.concat(frames, ignore_index=True)
 
 
-def tipar_columnas(df: pd.DataFrame) -> pd.DataFrame:
+def activar_copy_on_write():
+    """
+    Modo sin copias: pandas 2.x necesita activar copy-on-write a mano
+    (en pandas >= 3 ya viene siempre activo).
+    """
+    try:
+        pd.set_option("mode.copy_on_write", True)
+    except (KeyError, ValueError, pd.errors.OptionError):
+        pass
+
+
+def tipar_columnas(df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
     """Convierte a numérico lo necesario; PONDERA/horas/ingreso como float."""
-    df = df.copy()
+    if copiar:
+        df = df.copy()
     for c in INT_COLS:
         if c in df.columns:
             df[c] = pd.to_numeric(df[c], errors="coerce").astype("Int64")
@@ -76,57 +101,59 @@ def tipar_columnas(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def filtrar_universo(df: pd.DataFrame) -> pd.DataFrame:
-    """
-    - Años 2016–2025
-    - Todos los trimestres (NO filtramos TRIMESTRE)
-    - Aglomerados 7 y 9
-    - Entrevista individual realizada (H15 == 1)
-    - Edad >= 18 (sin tope superior)
-    - Solo ESTADO 1 y 2 (ocupados y desocupados)
-    """
-    df = df.copy()
+def mascara_universo(df: pd.DataFrame) -> pd.Series:
+    """Todas las reglas de filtrar_universo combinadas en una sola máscara."""
+    mask = pd.Series(True, index=df.index)
 
     # años del TP
     if "ANO4" in df.columns:
-        df = df[df["ANO4"].between(2016, 2025)]
+        mask &= df["ANO4"].between(2016, 2025)
 
     # aglomerados del TP
     if "AGLOMERADO" in df.columns:
-        df = df[df["AGLOMERADO"].isin([7, 9])]
+        mask &= df["AGLOMERADO"].isin([7, 9])
 
     # entrevista individual realizada
     if "H15" in df.columns:
-        df = df[df["H15"] == 1]
+        mask &= df["H15"] == 1
 
-    # limpieza básica de edad antes de corte
+    # edad: evitamos edades imposibles (<0 o >110), pero sin tope analítico (no cortamos en 64/65)
     if "CH06" in df.columns:
-        # seguimos evitando edades imposibles, pero sin tope analítico (no cortamos en 64/65)
-        df.loc[(df["CH06"] < 0) | (df["CH06"] > 110), "CH06"] = pd.NA
-        df = df[df["CH06"].notna()]
-        df = df[df["CH06"] >= 18]
+        mask &= df["CH06"].between(0, 110) & (df["CH06"] >= 18)
 
-    # ESTADO: sólo ocupados y desocupados (sacamos inactivos y Ns/Nr)
+    # ESTADO: sólo ocupados y desocupados (inactivos y Ns/Nr 9/99/999 quedan afuera)
     if "ESTADO" in df.columns:
-        # primero tratamos no respuesta
-        df.loc[df["ESTADO"].isin([9, 99, 999]), "ESTADO"] = pd.NA
-        df = df[df["ESTADO"].isin([1, 2])]
+        mask &= df["ESTADO"].isin([1, 2])
 
-    return df
+    return mask.fillna(False).astype(bool)
+
+
+def filtrar_universo(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    - Años 2016–2025
+    - Todos los trimestres (NO filtramos TRIMESTRE)
+    - Aglomerados 7 y 9
+    - Entrevista individual realizada (H15 == 1)
+    - Edad >= 18 (sin tope superior)
+    - Solo ESTADO 1 y 2 (ocupados y desocupados)
+    La máscara se arma completa y se aplica una sola vez (una sola copia).
+    """
+    return df[mascara_universo(df)]
 
 
-def sanidad_basica(df: pd.DataFrame) -> pd.DataFrame:
+def sanidad_basica(df: pd.DataFrame, max_horas: float = 168, copiar: bool = True) -> pd.DataFrame:
     """
     Sanidad mínima:
-      - Horas en rango razonable [0,168]
+      - Horas en rango razonable [0,max_horas] (168 = horas de una semana)
       - Ns/Nr en algunas variables → NaN
     """
-    df = df.copy()
+    if copiar:
+        df = df.copy()
 
     # Horas semanales razonables
     for c in ["PP3E_TOT","PP3F_TOT"]:
         if c in df.columns:
-            df.loc[(df[c] < 0) | (df[c] > 168), c] = pd.NA
+            df.loc[(df[c] < 0) | (df[c] > max_horas), c] = pd.NA
 
     # Ns/Nr en CAT_OCUP (por si se usa después)
     if "CAT_OCUP" in df.columns:
@@ -137,25 +164,7 @@ def sanidad_basica(df: pd.DataFrame) -> pd.DataFrame:
 
 def diagnostico_duplicados(df: pd.DataFrame) -> dict:
     """Resumen de duplicados por CLAVE (totales, exactos, conflictivos)."""
-    mask_clave = df.duplicated(subset=CLAVE, keep=False)
-    mask_exact = df.duplicated(keep=False)
-    dups_total = int(mask_clave.sum())
-    exactos = int((mask_clave & mask_exact).sum())
-    conflictivos = int(dups_total - exactos)
-    grupos_conf = (
-        df.loc[mask_clave, CLAVE]
-          .value_counts()
-          .reset_index(name="n")
-          .query("n > 1")
-          .shape[0]
-    )
-    return {
-        "filas": len(df),
-        "dups_total_filas": dups_total,
-        "dups_exactos_filas": exactos,
-        "dups_conflictivos_filas": conflictivos,
-        "grupos_clave_con_multiples_filas": int(grupos_conf),
-    }
+    return diagnostico(df, CLAVE)
 
 
 def elegir_mejor(gr: pd.DataFrame) -> pd.DataFrame:
@@ -166,49 +175,49 @@ def elegir_mejor(gr: pd.DataFrame) -> pd.DataFrame:
       3) PONDERA no nulo
       4) Si empata, primera aparición
     """
-    gr = gr.copy()
-    vars_info = [c for c in ["ESTADO","CAT_OCUP","CH04","CH06","PP3E_TOT","PP3F_TOT","P47T","PONDERA","H15"] if c in gr.columns]
-    s1 = (gr["H15"] == 1).astype(int) if "H15" in gr.columns else 0
-    s2 = gr[vars_info].notna().sum(axis=1) if vars_info else 0
-    s3 = gr["PONDERA"].notna().astype(int) if "PONDERA" in gr.columns else 0
-    score = s1*1000 + s2*10 + s3
+    score = pd.Series(puntaje_filas(gr), index=gr.index)
     return gr.loc[[score.idxmax()]]
 
 
-def resolver_duplicados(df: pd.DataFrame) -> pd.DataFrame:
-    """Compacta exactos y resuelve conflictivos aplicando elegir_mejor()."""
-    df = df.copy()
-    if not df.duplicated(subset=CLAVE).any():
-        return df.reset_index(drop=True)
-    return (
-        df.groupby(CLAVE, group_keys=False)
-          .apply(lambda g: g if len(g)==1 else elegir_mejor(g))
-          .reset_index(drop=True)
-    )
+def resolver_duplicados(df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
+    """
+    Compacta exactos y resuelve conflictivos con el criterio de elegir_mejor(),
+    pero vectorizado: CLAVE como int64 y un solo ordenamiento (clave, -puntaje, posición).
+    """
+    if copiar:
+        df = df.copy()
+    return resolver(df, CLAVE)
 
 
-def normalizar_nombres(df: pd.DataFrame) -> pd.DataFrame:
+def normalizar_nombres(df: pd.DataFrame, copiar: bool = True) -> pd.DataFrame:
     """Convierte nombres de columnas a minúsculas al final del pipeline."""
-    df2 = df.copy()
+    df2 = df.copy() if copiar else df
     df2.columns = df2.columns.str.lower()
     return df2
 
 
 # ---------------------- Proceso principal -------------------
-def main():
+def main(sin_copias: bool = False, fraccion=None):
+    # sin_copias: las etapas trabajan en el lugar (sin df.copy()) y con copy-on-write
+    copiar = not sin_copias
+    if sin_copias:
+        activar_copy_on_write()
+
     print("1) Cargando múltiples archivos TXT…")
-    df = cargar_multiples_txt(INPUT_DIR)
+    df = cargar_multiples_txt(INPUT_DIR, fraccion)
+    if fraccion:
+        print(f"   (submuestra de hogares: {fraccion:g})")
     print(f"   TOTAL filas leídas: {len(df)}")
 
     print("2) Tipando columnas…")
-    df = tipar_columnas(df)
+    df = tipar_columnas(df, copiar=copiar)
 
     print("3) Filtro universo (2016–2025, todos los trimestres, 18+, ESTADO 1/2)…")
     df = filtrar_universo(df)
     print(f"   Filas tras filtro: {len(df)}")
 
     print("4) Sanidad básica (horas, Ns/Nr)…")
-    df = sanidad_basica(df)
+    df = sanidad_basica(df, copiar=copiar)
 
     print("5) Diagnóstico duplicados (ANTES)…")
     diag_b = diagnostico_duplicados(df)
@@ -216,7 +225,7 @@ def main():
         print(f"   {k}: {v}")
 
     print("6) Resolviendo duplicados…")
-    df = resolver_duplicados(df)
+    df = resolver_duplicados(df, copiar=copiar)
 
     print("7) Diagnóstico duplicados (DESPUÉS)…")
     diag_a = diagnostico_duplicados(df)
@@ -224,12 +233,14 @@ def main():
         print(f"   {k}: {v}")
 
     print("8) Normalizando nombres de columnas…")
-    df = normalizar_nombres(df)
+    df = normalizar_nombres(df, copiar=copiar)
 
     print("9) Guardando CSV final…")
-    Path(OUTPUT_PATH).parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(OUTPUT_PATH, index=False)
-    print(f"✅ Listo: {OUTPUT_PATH}")
+    destino = ruta_muestra(OUTPUT_PATH, fraccion)
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(destino, index=False)
+    print(f"✅ Listo: {destino}")
 
 if __name__ == "__main__":
-    main()
+    import sys
+    main(sin_copias="--sin-copias" in sys.argv, fraccion=fraccion_desde_argv(sys.argv[1:]))
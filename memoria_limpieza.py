@@ -0,0 +1,63 @@
+# ============================================================
+# CHEQUEO DEL MODO SIN COPIAS (limpieza_tp --sin-copias)
+# Corre las etapas de limpieza_tp dos veces sobre los mismos TXT:
+#   - modo normal (cada etapa hace df.copy())
+#   - modo sin copias (en el lugar + copy-on-write)
+# Verifica que la salida sea idéntica y mide con tracemalloc el
+# pico de memoria de cada etapa en los dos modos.
+# ============================================================
+
+import tracemalloc
+
+import pandas as pd
+
+from limpieza_tp import (
+    INPUT_DIR, cargar_multiples_txt, tipar_columnas, filtrar_universo,
+    sanidad_basica, resolver_duplicados, normalizar_nombres, activar_copy_on_write,
+)
+
+
+ETAPAS = ["tipar", "universo", "sanidad", "duplicados", "nombres"]
+
+
+def correr_etapas(df: pd.DataFrame, copiar: bool):
+    """Corre las etapas midiendo el pico de memoria (MB) de cada una."""
+    pasos = {
+        "tipar": lambda d: tipar_columnas(d, copiar=copiar),
+        "universo": filtrar_universo,
+        "sanidad": lambda d: sanidad_basica(d, copiar=copiar),
+        "duplicados": lambda d: resolver_duplicados(d, copiar=copiar),
+        "nombres": lambda d: normalizar_nombres(d, copiar=copiar),
+    }
+    picos = {}
+    for etapa in ETAPAS:
+        tracemalloc.start()
+        df = pasos[etapa](df)
+        picos[etapa] = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+        tracemalloc.stop()
+    return df, picos
+
+
+def main():
+    print("1) Cargando TXT…")
+    crudo = cargar_multiples_txt(INPUT_DIR)
+    print(f"   Filas leídas: {len(crudo)}")
+
+    print("2) Modo normal…")
+    normal, picos_normal = correr_etapas(crudo.copy(), copiar=True)
+
+    print("3) Modo sin copias…")
+    activar_copy_on_write()
+    sin_copias, picos_sin = correr_etapas(crudo.copy(), copiar=False)
+
+    pd.testing.assert_frame_equal(normal, sin_copias)
+    print("   ✅ Salidas idénticas")
+
+    print("4) Pico de memoria por etapa (MB, tracemalloc):")
+    print(f"   {'etapa':<12}{'normal':>10}{'sin copias':>12}")
+    for etapa in ETAPAS:
+        print(f"   {etapa:<12}{picos_normal[etapa]:>10.1f}{picos_sin[etapa]:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
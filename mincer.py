@@ -0,0 +1,167 @@
+# ============================================================
+# ECUACIONES DE MINCER POR GRUPO + DESCOMPOSICIÓN OAXACA–BLINDER
+# log(P21_real_2025) = b0 + b1·años_educación + b2·edad + b3·edad²
+#                      + b4·formal            (ponderado por PONDERA)
+# para cada período × aglomerado (× sexo) a la vez: en lugar de un
+# ajuste por grupo, se acumulan las ecuaciones normales X'WX y X'Wy
+# de todos los grupos con bincount (una pasada por par de variables)
+# y se resuelven juntas con un solve en lote (pinv si son singulares).
+# Con los coeficientes y las medias por grupo sale la descomposición
+# Oaxaca–Blinder de las brechas Posadas–Comodoro y varones–mujeres.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+INPUT_PATH = Path("processed") / "eph_train_ingreso_real.csv"
+OUT_DIR = Path("processed")
+
+OBJETIVO = "P21_real_2025"
+PESO = "PONDERA"
+VARIABLES = ["years_education", "CH06", "age2", "formal"]
+
+GRUPOS = ["ANO4", "TRIMESTRE", "AGLOMERADO"]
+
+# Brechas que se descomponen: (columna, grupo A, grupo B); referencia = B
+CIUDADES = ("AGLOMERADO", 7, 9)      # Posadas − Comodoro/Rada Tilly
+GENERO = ("CH04", 1, 2)              # varones − mujeres
+
+
+# ---------------------- Datos ------------------------------
+def preparar_mincer(df: pd.DataFrame, variables=VARIABLES) -> pd.DataFrame:
+    """Filas con ingreso y peso positivos y variables completas; agrega log_ingreso."""
+    cols = [OBJETIVO, PESO, *variables]
+    d = df.dropna(subset=cols)
+    d = d[(d[OBJETIVO] > 0) & (d[PESO] > 0)].copy()
+    d["log_ingreso"] = np.log(d[OBJETIVO].to_numpy(float))
+    return d
+
+
+# ---------------------- Ajuste en lote ---------------------
+def ecuaciones_normales(g: np.ndarray, X: np.ndarray, y: np.ndarray, w: np.ndarray, n_grupos: int):
+    """
+    X'WX (G×k×k), X'Wy (G×k) e y'Wy (G) de todos los
+    grupos: un bincount por par de columnas de X (la matriz es simétrica).
+    """
+    k = X.shape[1]
+    XtWX = np.empty((n_grupos, k, k))
+    for i in range(k):
+        wx = w * X[:, i]
+        for j in range(i, k):
+            XtWX[:, i, j] = XtWX[:, j, i] = np.bincount(g, weights=wx * X[:, j], minlength=n_grupos)
+    XtWy = np.stack([np.bincount(g, weights=w * X[:, i] * y, minlength=n_grupos) for i in range(k)], axis=1)
+    yWy = np.bincount(g, weights=w * y * y, minlength=n_grupos)
+    return XtWX, XtWy, yWy
+
+
+def resolver_lote(A: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Resuelve A·beta = b para todos los grupos; pinv en los que son singulares."""
+    beta = np.full(b.shape, np.nan)
+    if not len(A):
+        return beta
+    ok = np.linalg.matrix_rank(A) == A.shape[1]
+    if ok.any():
+        beta[ok] = np.linalg.solve(A[ok], b[ok][..., None])[..., 0]
+    if (~ok).any():
+        beta[~ok] = (np.linalg.pinv(A[~ok]) @ b[~ok][..., None])[..., 0]
+    return beta
+
+
+def ajustar_por_grupo(df: pd.DataFrame, grupos=GRUPOS, variables=VARIABLES) -> pd.DataFrame:
+    """
+    Una fila por grupo con: n, pondera, r2, singular, b_const, b_<var>
+    y las medias ponderadas media_<var> / media_log_ingreso.
+    """
+    d = preparar_mincer(df, variables)
+    g = d.groupby(grupos, sort=True).ngroup().to_numpy()
+    claves = d[grupos].drop_duplicates().sort_values(grupos).reset_index(drop=True)
+    G = len(claves)
+
+    X = np.column_stack([np.ones(len(d)), d[variables].to_numpy(float)])
+    y = d["log_ingreso"].to_numpy()
+    w = d[PESO].to_numpy(float)
+
+    XtWX, XtWy, yWy = ecuaciones_normales(g, X, y, w, G)
+    beta = resolver_lote(XtWX, XtWy)
+
+    W = XtWX[:, 0, 0]              # suma de pesos (columna de unos)
+    medias = XtWX[:, 0, :] / W[:, None]
+    y_media = XtWy[:, 0] / W
+
+    # R² ponderado con las mismas sumas: SSE = y'Wy − 2β'X'Wy + β'X'WXβ
+    sse = yWy - 2 * np.einsum("gk,gk->g", beta, XtWy) + np.einsum("gk,gkl,gl->g", beta, XtWX, beta)
+    sst = yWy - W * y_media ** 2
+
+    out = claves.copy()
+    out["n"] = np.bincount(g, minlength=G)
+    out["pondera"] = W
+    out["r2"] = np.where(sst > 0, 1 - sse / np.where(sst > 0, sst, 1), np.nan)
+    out["singular"] = np.linalg.matrix_rank(XtWX) < X.shape[1]
+    nombres = ["const", *variables]
+    for i, v in enumerate(nombres):
+        out[f"b_{v}"] = beta[:, i]
+    for i, v in enumerate(variables, start=1):
+        out[f"media_{v}"] = medias[:, i]
+    out["media_log_ingreso"] = y_media
+    return out
+
+
+# ---------------------- Oaxaca–Blinder ---------------------
+def oaxaca_blinder(coef: pd.DataFrame, columna: str, a, b, variables=VARIABLES) -> pd.DataFrame:
+    """
+    Brecha ȳ_A − ȳ_B (log ingreso) para cada combinación del resto de las
+    claves de coef, con coeficientes de B como referencia:
+      explicada    = (X̄_A − X̄_B)'β_B        (por variable: explicada_<var>)
+      no_explicada = X̄_A'(β_A − β_B)
+    """
+    claves = [c for c in coef.columns[:coef.columns.get_loc("n")] if c != columna]
+    A = coef[coef[columna] == a].drop(columns=columna)
+    B = coef[coef[columna] == b].drop(columns=columna)
+    m = A.merge(B, on=claves, suffixes=("_a", "_b"))
+
+    nombres = ["const", *variables]
+    beta_a = m[[f"b_{v}_a" for v in nombres]].to_numpy()
+    beta_b = m[[f"b_{v}_b" for v in nombres]].to_numpy()
+    xa = np.column_stack([np.ones(len(m)), m[[f"media_{v}_a" for v in variables]].to_numpy()])
+    xb = np.column_stack([np.ones(len(m)), m[[f"media_{v}_b" for v in variables]].to_numpy()])
+
+    detalle = (xa - xb) * beta_b
+    out = m[claves].copy()
+    out["brecha"] = m["media_log_ingreso_a"] - m["media_log_ingreso_b"]
+    out["explicada"] = detalle.sum(axis=1)
+    out["no_explicada"] = (xa * (beta_a - beta_b)).sum(axis=1)
+    for i, v in enumerate(variables, start=1):
+        out[f"explicada_{v}"] = detalle[:, i]
+    out["pct_explicada"] = 100 * out["explicada"] / out["brecha"].where(out["brecha"] != 0)
+    return out
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    print("1) Cargando base de entrenamiento…")
+    df = pd.read_csv(INPUT_PATH)
+
+    print("2) Mincer por período × aglomerado y período × aglomerado × sexo…")
+    coef = ajustar_por_grupo(df, GRUPOS)
+    coef_sexo = ajustar_por_grupo(df, GRUPOS + ["CH04"])
+    print(f"   {len(coef)} + {len(coef_sexo)} regresiones "
+          f"({int(coef['singular'].sum() + coef_sexo['singular'].sum())} singulares → pinv)")
+
+    print("3) Oaxaca–Blinder…")
+    ciudades = oaxaca_blinder(coef, *CIUDADES)
+    genero = oaxaca_blinder(coef_sexo, *GENERO)
+
+    OUT_DIR.mkdir(exist_ok=True)
+    coef.to_csv(OUT_DIR / "mincer_coeficientes.csv", index=False)
+    coef_sexo.to_csv(OUT_DIR / "mincer_coeficientes_sexo.csv", index=False)
+    ciudades.to_csv(OUT_DIR / "oaxaca_posadas_comodoro.csv", index=False)
+    genero.to_csv(OUT_DIR / "oaxaca_genero.csv", index=False)
+    print(f"✅ Listo: {OUT_DIR}/mincer_*.csv y oaxaca_*.csv")
+
+    print(ciudades[["ANO4", "TRIMESTRE", "brecha", "explicada", "no_explicada"]].round(3).tail(8).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
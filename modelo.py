@@ -1,24 +1,32 @@
-import pandas as pd
 import numpy as np
 from pathlib import Path
 
-from sklearn.model_selection import train_test_split
-from sklearn.tree import DecisionTreeRegressor, plot_tree
-from sklearn.compose import ColumnTransformer
-from sklearn.preprocessing import OneHotEncoder
-from sklearn.pipeline import Pipeline
-from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
-import matplotlib.pyplot as plt
+# sklearn y matplotlib se importan dentro de las funciones que entrenan /
+# grafican: importar este módulo (o sólo predecir) no los carga
+
+from muestreo import leer_csv_muestra, fraccion_desde_argv, ruta_muestra
+from imputador_jerarquico import TABLAS_PATH, cargar_tablas, imputar as imputar_medianas
+from registro_modelos import obtener_o_entrenar
+from reglas_arbol import nombres_legibles, reglas_hojas, exportar_reglas
 
 
 # ==========================
 # CARGAR DATOS LIMPIOS
 # ==========================
 
-def load_clean_data():
+def _leer_limpio(path, fraccion=None):
+    # con --sample se usa el CSV que dejó limpiezaModelo --sample; si no está,
+    # se filtran los hogares de la submuestra del CSV completo antes de parsear
+    propio = ruta_muestra(path, fraccion)
+    if fraccion and propio.exists():
+        return leer_csv_muestra(propio)
+    return leer_csv_muestra(path, fraccion)
+
+
+def load_clean_data(fraccion=None):
     base = Path("processed")
-    df_train = pd.read_csv(base / "eph_train_ingreso_real.csv")
-    df_missing = pd.read_csv(base / "eph_missing_ingreso_real.csv")
+    df_train = _leer_limpio(base / "eph_train_ingreso_real.csv", fraccion)
+    df_missing = _leer_limpio(base / "eph_missing_ingreso_real.csv", fraccion)
     return df_train, df_missing
 
 
@@ -26,27 +34,28 @@ def load_clean_data():
 # ARMAR FEATURES (RENOMBRANDO COLUMNAS)
 # ==========================
 
+# MAPEO COMPLETO
+RENAME_MAP = {
+    "CH06": "edad",
+    "age2": "edad_cuadrado",
+    "years_education": "anios_educacion",
+    "formal": "formalidad",
+    "PP3E_TOT": "horas_trabajadas",
+    "CH04": "sexo",
+    "NIVEL_ED": "nivel_educativo",
+    "PP04D_COD": "rama_actividad",
+    "CAT_OCUP": "categoria_ocupacional",
+    "PP04G_COD": "tamano_establecimiento",
+    "CH07": "estado_civil"
+}
+
+
 def build_feature_sets(df_train):
 
     target = "P21_real_2025"
 
-    # MAPEO COMPLETO
-    rename_map = {
-        "CH06": "edad",
-        "age2": "edad_cuadrado",
-        "years_education": "anios_educacion",
-        "formal": "formalidad",
-        "PP3E_TOT": "horas_trabajadas",
-        "CH04": "sexo",
-        "NIVEL_ED": "nivel_educativo",
-        "PP04D_COD": "rama_actividad",
-        "CAT_OCUP": "categoria_ocupacional",
-        "PP04G_COD": "tamano_establecimiento",
-        "CH07": "estado_civil"
-    }
-
     # RENOMBRAR SOLO LAS QUE EXISTEN
-    cols_presentes = {k: v for k, v in rename_map.items() if k in df_train.columns}
+    cols_presentes = {k: v for k, v in RENAME_MAP.items() if k in df_train.columns}
     df_train = df_train.rename(columns=cols_presentes)
 
     # ARMAMOS FEATURE_COLS SOLO CON LAS COLUMNAS QUE EXISTEN
@@ -79,25 +88,115 @@ def build_feature_sets(df_train):
     return X, y, numeric, categorical, feature_cols
 
 
+def load_imputer_tables(df_train, df_missing, fraccion=None):
+    """
+    Tablas de medianas que guardó limpiezaModelo para estos mismos datos
+    (processed/imputador_medianas.json, con sufijo si es --sample). Si no
+    están, o son de otra corrida (no coinciden la fracción o las filas),
+    devuelve None y se avisa.
+    """
+    path = ruta_muestra(TABLAS_PATH, fraccion)
+    if not path.exists():
+        print(f"[AVISO] No está {path}: los faltantes al predecir van a 0.")
+        return None
+
+    tablas = cargar_tablas(path)
+    esperado = {"fraccion": fraccion, "train": len(df_train), "missing": len(df_missing)}
+    if tablas.get("origen") != esperado:
+        print(f"[AVISO] {path} no corresponde a los datos cargados "
+              f"({tablas.get('origen')} vs {esperado}): correr limpiezaModelo de nuevo.")
+        return None
+    return tablas
+
+
+def prepare_missing_features(df_missing, feature_cols, tablas=None):
+    """
+    Mismas columnas (renombradas) que el train para las filas a imputar.
+    Las numéricas faltantes se completan con las medianas jerárquicas de
+    tablas (ver load_imputer_tables); lo que quede (categóricas, o si no
+    hay tablas) va a 0 como antes.
+    """
+
+    if tablas is not None:
+        df_missing = imputar_medianas(df_missing, tablas)
+        if {"CH06", "age2"} <= set(df_missing.columns):
+            df_missing["age2"] = df_missing["CH06"] ** 2
+
+    rename_present = {k: v for k, v in RENAME_MAP.items() if k in df_missing.columns}
+    df_missing_ren = df_missing.rename(columns=rename_present)
+
+    return df_missing_ren[feature_cols].copy().fillna(0)
+
+
 # ==========================
 # PIPELINE
 # ==========================
 
-def build_pipeline(numeric, categorical):
-
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", "passthrough", numeric),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical)
-        ],
-        remainder="drop"
-    )
-
-    model = DecisionTreeRegressor(
-        max_depth=6,
-        min_samples_leaf=60,
-        random_state=42
-    )
+MODEL_TYPES = ["tree", "boosting", "linear"]
+
+
+def build_pipeline(numeric, categorical, model_type="tree"):
+    """
+    tree     : árbol de decisión (modelo del TP, one-hot)
+    boosting : HistGradientBoosting con categóricas nativas (binning por
+               histogramas, usa todos los núcleos)
+    linear   : Ridge con one-hot, como línea de base
+    """
+    from sklearn.compose import ColumnTransformer
+    from sklearn.ensemble import HistGradientBoostingRegressor
+    from sklearn.linear_model import Ridge
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
+    from sklearn.tree import DecisionTreeRegressor
+
+    if model_type == "boosting":
+        # categóricas como enteros; con más de 250 niveles, los menos
+        # frecuentes se juntan en una categoría "infrecuente"; sólo los
+        # niveles que no se vieron al entrenar quedan como faltantes
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ("num", "passthrough", numeric),
+                ("cat", OrdinalEncoder(
+                    handle_unknown="use_encoded_value", unknown_value=np.nan,
+                    encoded_missing_value=np.nan, max_categories=250
+                ), categorical)
+            ],
+            remainder="drop"
+        )
+        model = HistGradientBoostingRegressor(
+            max_iter=300,
+            learning_rate=0.1,
+            min_samples_leaf=60,
+            categorical_features=[False] * len(numeric) + [True] * len(categorical),
+            random_state=42
+        )
+
+    elif model_type == "linear":
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ("num", StandardScaler(), numeric),
+                ("cat", OneHotEncoder(handle_unknown="ignore"), categorical)
+            ],
+            remainder="drop"
+        )
+        model = Ridge(alpha=1.0)
+
+    elif model_type == "tree":
+        preprocessor = ColumnTransformer(
+            transformers=[
+                ("num", "passthrough", numeric),
+                ("cat", OneHotEncoder(handle_unknown="ignore"), categorical)
+            ],
+            remainder="drop"
+        )
+        model = DecisionTreeRegressor(
+            max_depth=6,
+            min_samples_leaf=60,
+            random_state=42
+        )
+
+    else:
+        raise ValueError(f"model_type desconocido: {model_type!r} (opciones: {MODEL_TYPES})")
 
     return Pipeline([
         ("prep", preprocessor),
@@ -109,7 +208,10 @@ def build_pipeline(numeric, categorical):
 # ENTRENAR + MÉTRICAS
 # ==========================
 
-def train_and_evaluate(X, y, model, name):
+def evaluate_model(X, y, model):
+    """Entrena con 80% y devuelve MAE / RMSE / R² sobre el 20% restante."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+    from sklearn.model_selection import train_test_split
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, random_state=42
@@ -118,10 +220,25 @@ def train_and_evaluate(X, y, model, name):
     model.fit(X_train, y_train)
     pred = model.predict(X_test)
 
+    return {
+        "mae": mean_absolute_error(y_test, pred),
+        "rmse": mean_squared_error(y_test, pred) ** 0.5,
+        "r2": r2_score(y_test, pred),
+    }
+
+
+def print_metrics(metrics, name):
+
     print(f"\n=== METRICAS {name.upper()} ===")
-    print(f"MAE  : {mean_absolute_error(y_test, pred):,.2f}")
-    print(f"RMSE : {mean_squared_error(y_test, pred)**0.5:,.2f}")
-    print(f"R²   : {r2_score(y_test, pred):.3f}")
+    print(f"MAE  : {metrics['mae']:,.2f}")
+    print(f"RMSE : {metrics['rmse']:,.2f}")
+    print(f"R²   : {metrics['r2']:.3f}")
+
+
+def train_and_evaluate(X, y, model, name):
+
+    metrics = evaluate_model(X, y, model)
+    print_metrics(metrics, name)
 
     return model
 
@@ -130,22 +247,20 @@ def train_and_evaluate(X, y, model, name):
 # ARBOL CON NOMBRES HUMANOS
 # ==========================
 
-def plot_tree_graph(model, features, name):
+def plot_tree_graph(model, features, name, fraccion=None):
+    import matplotlib.pyplot as plt
+    from sklearn.tree import plot_tree
 
     tree = model.named_steps["model"]
     prep = model.named_steps["prep"]
 
-    raw = prep.get_feature_names_out(features)
-
-    pretty = []
-    for n in raw:
-        n = n.replace("num__", "").replace("cat__", "")
-        pretty.append(n.split("_")[0])  # elimina sufijos de categorías
+    # nombres con la categoría (ej. "sexo=2") para que no sean ambiguos
+    pretty = nombres_legibles(prep)
 
     plt.figure(figsize=(22, 10))
     plot_tree(tree, feature_names=pretty, filled=False, max_depth=3, fontsize=6)
 
-    out = Path("processed") / f"arbol_{name}.png"
+    out = ruta_muestra(Path("processed") / f"arbol_{name}.png", fraccion)
     plt.savefig(out, dpi=200)
     plt.close()
 
@@ -156,7 +271,24 @@ def plot_tree_graph(model, features, name):
 # MODELO POR AGLOMERADO
 # ==========================
 
-def model_for_city(df_train, df_missing, city_name):
+def fit_city_model(X, y, pipe, city_name, feature_cols, plot=True, fraccion=None):
+    """Métricas 80/20 (+ gráfico del árbol) y después fit con todo para imputar."""
+
+    metrics = evaluate_model(X, y, pipe)
+
+    if plot:
+        plot_tree_graph(pipe, feature_cols, city_name, fraccion)
+
+    # ENTRENAR CON TODO PARA IMPUTAR
+    pipe.fit(X, y)
+
+    return pipe, metrics
+
+
+def model_for_city(df_train, df_missing, city_name, model_type="tree", use_registry=True, plot_png=True,
+                   fraccion=None, tablas=None):
+    # fraccion (--sample): todas las salidas llevan sufijo de muestra y el modelo
+    # se registra con otro nombre, así no reemplaza al de la base completa
 
     print(f"\n=== MODELO {city_name.upper()} ===")
 
@@ -169,38 +301,31 @@ def model_for_city(df_train, df_missing, city_name):
     print(f"Columnas usadas ({city_name}): {feature_cols}")
     print(f"Filas para entrenar: {len(X)}")
 
-    pipe = build_pipeline(numeric, categorical)
+    pipe = build_pipeline(numeric, categorical, model_type)
 
-    pipe = train_and_evaluate(X, y, pipe, city_name)
+    def train(p):
+        return fit_city_model(X, y, p, city_name, feature_cols,
+                              plot=(model_type == "tree" and plot_png), fraccion=fraccion)
 
-    plot_tree_graph(pipe, feature_cols, city_name)
+    # REUSAR EL MODELO GUARDADO SI NO CAMBIARON DATOS NI PARÁMETROS
+    if use_registry:
+        nombre = f"{city_name}_{model_type}" + (f"_muestra{fraccion:g}" if fraccion else "")
+        pipe, metrics, _ = obtener_o_entrenar(nombre, X, y, pipe, train)
+    else:
+        pipe, metrics = train(pipe)
 
-    # ENTRENAR CON TODO PARA IMPUTAR
-    pipe.fit(X, y)
+    print_metrics(metrics, city_name)
+
+    # REGLAS + ESTADÍSTICAS DE CADA HOJA (JSON / CSV)
+    if model_type == "tree":
+        weights = df_train.loc[X.index, "PONDERA"] if "PONDERA" in df_train.columns else None
+        exportar_reglas(reglas_hojas(pipe, X, y, weights), city_name, fraccion=fraccion)
 
     # IMPUTAR FALTANTES
     df_missing_imp = df_missing.copy()
     if not df_missing.empty:
 
-        # RENOMBRAR COLUMNAS EN df_missing
-        rename_map = {
-            "CH06": "edad",
-            "age2": "edad_cuadrado",
-            "years_education": "anios_educacion",
-            "formal": "formalidad",
-            "PP3E_TOT": "horas_trabajadas",
-            "CH04": "sexo",
-            "NIVEL_ED": "nivel_educativo",
-            "PP04D_COD": "rama_actividad",
-            "CAT_OCUP": "categoria_ocupacional",
-            "PP04G_COD": "tamano_establecimiento",
-            "CH07": "estado_civil"
-        }
-
-        rename_present = {k: v for k, v in rename_map.items() if k in df_missing.columns}
-        df_missing_ren = df_missing.rename(columns=rename_present)
-
-        X_miss = df_missing_ren[feature_cols].copy().fillna(0)
+        X_miss = prepare_missing_features(df_missing, feature_cols, tablas)
         df_missing_imp["P21_real_2025_imputado"] = pipe.predict(X_miss)
 
     # GUARDAR TRAIN PRED
@@ -211,12 +336,14 @@ def model_for_city(df_train, df_missing, city_name):
     out = Path("processed")
     out.mkdir(exist_ok=True)
 
-    df_train_pred.to_csv(out / f"train_pred_{city_name}.csv", index=False)
-    df_missing_imp.to_csv(out / f"missing_imputado_{city_name}.csv", index=False)
+    train_path = ruta_muestra(out / f"train_pred_{city_name}.csv", fraccion)
+    missing_path = ruta_muestra(out / f"missing_imputado_{city_name}.csv", fraccion)
+    df_train_pred.to_csv(train_path, index=False)
+    df_missing_imp.to_csv(missing_path, index=False)
 
     print(f"\nGenerados para {city_name}:")
-    print(f"→ train_pred_{city_name}.csv")
-    print(f"→ missing_imputado_{city_name}.csv")
+    print(f"→ {train_path.name}")
+    print(f"→ {missing_path.name}")
 
     return pipe, df_train_pred, df_missing_imp
 
@@ -225,9 +352,10 @@ def model_for_city(df_train, df_missing, city_name):
 # MAIN
 # ==========================
 
-if __name__ == "__main__":
+def main(fraccion=None):
 
-    df_train, df_missing = load_clean_data()
+    df_train, df_missing = load_clean_data(fraccion)
+    tablas = load_imputer_tables(df_train, df_missing, fraccion)
 
     df_train_pos = df_train[df_train["AGLOMERADO"] == 7]
     df_missing_pos = df_missing[df_missing["AGLOMERADO"] == 7]
@@ -235,5 +363,11 @@ if __name__ == "__main__":
     df_train_rt = df_train[df_train["AGLOMERADO"] == 9]
     df_missing_rt = df_missing[df_missing["AGLOMERADO"] == 9]
 
-    model_pos, pred_pos, missing_pos = model_for_city(df_train_pos, df_missing_pos, "posadas")
-    model_rt, pred_rt, missing_rt = model_for_city(df_train_rt, df_missing_rt, "rada_tilly")
+    model_pos, pred_pos, missing_pos = model_for_city(df_train_pos, df_missing_pos, "posadas", fraccion=fraccion, tablas=tablas)
+    model_rt, pred_rt, missing_rt = model_for_city(df_train_rt, df_missing_rt, "rada_tilly", fraccion=fraccion, tablas=tablas)
+
+
+if __name__ == "__main__":
+    import sys
+
+    main(fraccion_desde_argv(sys.argv[1:]))
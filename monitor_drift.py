@@ -0,0 +1,258 @@
+# ============================================================
+# MONITOR DE DERIVA (DRIFT) ENTRE OLAS DE LA EPH
+# Antes de limpiar / modelar una ola nueva se compara contra un
+# perfil de referencia guardado en JSON:
+#   - numéricas   : histograma sobre cortes por cuantiles de la
+#                   referencia → PSI y KS (sobre la CDF en los cortes)
+#                   + cociente de medianas (cambios de escala, ej. PONDERA)
+#   - categóricas : frecuencias de cada código → PSI + códigos nuevos
+#                   (ej. un Ns/Nr nuevo o un PP04D_COD fuera de rango)
+#   - todas       : tasa de faltantes
+# Los conteos de todas las columnas numéricas salen de un solo
+# bincount (columna × bin) y los PSI/KS se calculan como matrices.
+# ============================================================
+
+import json
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from lectura_zip import listar_fuentes, leer_fuentes, nombre_fuente
+
+# ---------------------- Configuración -----------------------
+INPUT_DIR = Path("data")
+BASELINE_PATH = Path("processed") / "drift_referencia.json"
+OUT_DIR = Path("processed")
+
+NUMERICAS = ["CH06", "PP3E_TOT", "P21", "P47T", "PONDERA"]
+CATEGORICAS = ["ESTADO", "CAT_OCUP", "CH04", "NIVEL_ED", "PP04D_COD", "PP07H", "H15"]
+PERIODO = ["ANO4", "TRIMESTRE"]
+
+N_BINS = 10
+MAX_CATEGORIAS = 200     # las más frecuentes; el resto va a "__otras__"
+EPS = 1e-4               # piso de proporción para el PSI
+
+UMBRALES = {
+    "psi": 0.25,              # > 0.25: cambio importante
+    "ks": 0.10,
+    "faltantes": 0.05,        # diferencia absoluta en tasa de faltantes
+    "escala": (0.5, 2.0),     # cociente de medianas fuera de este rango
+    "nuevas": 0.01,           # proporción de códigos no vistos en la referencia
+}
+
+
+# ---------------------- Lectura ----------------------------
+def cargar_olas(input_dir: Path = INPUT_DIR) -> pd.DataFrame:
+    """Columnas monitoreadas de todos los TXT/ZIP de personas (como texto)."""
+    pedidas = set(NUMERICAS) | set(CATEGORICAS) | set(PERIODO)
+    leer = lambda fh: pd.read_csv(fh, sep=";", dtype=str, encoding="latin-1",
+                                  usecols=lambda c: c in pedidas)
+    frames = []
+    for fuente, df in leer_fuentes(listar_fuentes(input_dir), leer):
+        if isinstance(df, Exception):
+            print(f"   ! error leyendo {nombre_fuente(fuente)}: {df}")
+            continue
+        frames.append(df)
+    if not frames:
+        raise FileNotFoundError(f"No se encontraron TXT ni ZIP en {Path(input_dir).resolve()}")
+
+    df = pd.concat(frames, ignore_index=True)
+    for c in df.columns:
+        df[c] = df[c].str.strip()
+    for c in PERIODO:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    return df
+
+
+def _numericas(df: pd.DataFrame, cols) -> np.ndarray:
+    return np.column_stack([pd.to_numeric(df[c], errors="coerce").to_numpy(float) for c in cols]) \
+        if cols else np.empty((len(df), 0))
+
+
+# ---------------------- Perfil de referencia ---------------
+def perfilar(df: pd.DataFrame, numericas=NUMERICAS, categoricas=CATEGORICAS, n_bins=N_BINS) -> dict:
+    """Perfil de referencia: cortes y proporciones por columna + faltantes."""
+    numericas = [c for c in numericas if c in df.columns]
+    categoricas = [c for c in categoricas if c in df.columns]
+    V = _numericas(df, numericas)
+
+    perfil = {"filas": int(len(df)), "numericas": {}, "categoricas": {}}
+    qs = np.linspace(0, 1, n_bins + 1)[1:-1]
+    for j, c in enumerate(numericas):
+        x = V[:, j][~np.isnan(V[:, j])]
+        cortes = np.unique(np.quantile(x, qs)) if len(x) else np.array([])
+        perfil["numericas"][c] = {
+            "cortes": cortes.tolist(),
+            "faltantes": float(np.isnan(V[:, j]).mean()) if len(V) else 0.0,
+            "mediana": float(np.median(x)) if len(x) else None,
+        }
+    _proporciones_numericas(V, perfil, numericas, guardar=True)
+
+    for c in categoricas:
+        s = df[c]
+        frec = s.dropna().value_counts(normalize=True)
+        top = frec.iloc[:MAX_CATEGORIAS]
+        perfil["categoricas"][c] = {
+            "categorias": [str(k) for k in top.index],
+            "proporciones": top.tolist() + [float(1 - top.sum())],  # última = __otras__
+            "truncada": len(frec) > MAX_CATEGORIAS,
+            "faltantes": float(s.isna().mean()),
+        }
+    return perfil
+
+
+def _proporciones_numericas(V: np.ndarray, perfil: dict, numericas: list, guardar=False):
+    """
+    Proporción por bin de todas las columnas numéricas con un solo bincount
+    sobre (columna, bin). Devuelve una matriz columnas × max_bins (NaN de relleno).
+    """
+    anchos = [len(perfil["numericas"][c]["cortes"]) + 1 for c in numericas]
+    max_b = max(anchos, default=1)
+    ids = []
+    for j, c in enumerate(numericas):
+        x = V[:, j]
+        x = x[~np.isnan(x)]
+        ids.append(j * max_b + np.searchsorted(perfil["numericas"][c]["cortes"], x, side="right"))
+    ids = np.concatenate(ids) if ids else np.array([], dtype=np.int64)
+
+    conteos = np.bincount(ids, minlength=len(numericas) * max_b).reshape(len(numericas), max_b).astype(float)
+    totales = conteos.sum(axis=1, keepdims=True)
+    P = np.divide(conteos, totales, out=np.zeros_like(conteos), where=totales > 0)
+    for j, b in enumerate(anchos):
+        P[j, b:] = np.nan
+    if guardar:
+        for j, c in enumerate(numericas):
+            perfil["numericas"][c]["proporciones"] = P[j, :anchos[j]].tolist()
+    return P
+
+
+# ---------------------- Métricas ---------------------------
+def psi(base: np.ndarray, nueva: np.ndarray) -> np.ndarray:
+    """PSI por fila: Σ (q − p)·ln(q / p), con piso EPS; ignora NaN de relleno."""
+    p = np.clip(base, EPS, None)
+    q = np.clip(nueva, EPS, None)
+    return np.nansum((q - p) * np.log(q / p), axis=1)
+
+
+def ks_binned(base: np.ndarray, nueva: np.ndarray) -> np.ndarray:
+    """KS por fila: máxima distancia entre CDF acumuladas en los cortes."""
+    return np.nanmax(np.abs(np.nancumsum(nueva, axis=1) - np.nancumsum(base, axis=1)), axis=1)
+
+
+def comparar(perfil: dict, df: pd.DataFrame, umbrales: dict = UMBRALES) -> pd.DataFrame:
+    """Una fila por columna monitoreada con métricas de deriva y alerta."""
+    filas = []
+
+    numericas = [c for c in perfil["numericas"] if c in df.columns]
+    if numericas:
+        V = _numericas(df, numericas)
+        N = _proporciones_numericas(V, perfil, numericas)
+        B = np.full(N.shape, np.nan)
+        for j, c in enumerate(numericas):
+            b = perfil["numericas"][c]["proporciones"]
+            B[j, :len(b)] = b
+
+        psis, kss = psi(B, N), ks_binned(B, N)
+        falt = np.isnan(V).mean(axis=0) if len(V) else np.zeros(len(numericas))
+        med = np.array([np.nanmedian(V[:, j]) if (~np.isnan(V[:, j])).any() else np.nan
+                        for j in range(len(numericas))])
+        for j, c in enumerate(numericas):
+            ref = perfil["numericas"][c]
+            escala = med[j] / ref["mediana"] if ref["mediana"] else np.nan
+            filas.append({
+                "columna": c, "tipo": "numerica",
+                "psi": psis[j], "ks": kss[j],
+                "faltantes_ref": ref["faltantes"], "faltantes": falt[j],
+                "escala_mediana": escala, "nuevas": 0.0, "codigos_nuevos": "",
+            })
+
+    for c, ref in perfil["categoricas"].items():
+        if c not in df.columns:
+            continue
+        s = df[c]
+        frec = s.dropna().value_counts(normalize=True)
+        conocidas = frec.reindex(ref["categorias"], fill_value=0.0).to_numpy()
+        q = np.append(conocidas, 1 - conocidas.sum())
+        p = np.array(ref["proporciones"])
+        # códigos nuevos: sólo si la referencia tenía todas las categorías
+        nuevas = frec.drop(index=ref["categorias"], errors="ignore") if not ref["truncada"] else frec.iloc[:0]
+        filas.append({
+            "columna": c, "tipo": "categorica",
+            "psi": float(psi(p[None], q[None])[0]), "ks": np.nan,
+            "faltantes_ref": ref["faltantes"], "faltantes": float(s.isna().mean()),
+            "escala_mediana": np.nan, "nuevas": float(nuevas.sum()),
+            "codigos_nuevos": ",".join(map(str, nuevas.index[:10])),
+        })
+
+    out = pd.DataFrame(filas)
+    if out.empty:
+        return out
+
+    lo, hi = umbrales["escala"]
+    motivos = pd.DataFrame({
+        "psi": out["psi"] > umbrales["psi"],
+        "ks": out["ks"] > umbrales["ks"],
+        "faltantes": (out["faltantes"] - out["faltantes_ref"]).abs() > umbrales["faltantes"],
+        "escala": (out["escala_mediana"] < lo) | (out["escala_mediana"] > hi),
+        "codigos_nuevos": out["nuevas"] > umbrales["nuevas"],
+    })
+    out["alerta"] = motivos.any(axis=1)
+    out["motivo"] = motivos.apply(lambda r: ",".join(r.index[r.to_numpy()]), axis=1)
+    return out
+
+
+# ---------------------- Persistencia -----------------------
+def guardar_perfil(perfil: dict, path: Path = BASELINE_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(perfil, fh, indent=2, ensure_ascii=False)
+
+
+def cargar_perfil(path: Path = BASELINE_PATH) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+# ---------------------- Proceso principal -------------------
+def main(estricto: bool = False) -> int:
+    print("1) Leyendo columnas monitoreadas de las olas…")
+    df = cargar_olas(INPUT_DIR)
+    periodo = df["ANO4"] * 4 + df["TRIMESTRE"] - 1
+    ultimo = int(periodo.max())
+
+    if BASELINE_PATH.exists():
+        perfil = cargar_perfil(BASELINE_PATH)
+        print(f"2) Referencia: {BASELINE_PATH} (hasta {perfil['hasta']})")
+    else:
+        ref = df[periodo < ultimo]
+        perfil = perfilar(ref)
+        perfil["hasta"] = f"{(ultimo - 1) // 4}-T{(ultimo - 1) % 4 + 1}"
+        guardar_perfil(perfil, BASELINE_PATH)
+        print(f"2) Referencia nueva con {len(ref)} filas → {BASELINE_PATH}")
+
+    ano, tri = map(int, perfil["hasta"].split("-T"))
+    desde = ano * 4 + tri       # olas posteriores a la referencia
+    olas = sorted(p for p in periodo.dropna().unique() if p >= desde)
+
+    print(f"3) Comparando {len(olas)} ola(s) nueva(s)…")
+    hay_alertas = False
+    OUT_DIR.mkdir(exist_ok=True)
+    for p in olas:
+        p = int(p)
+        etiqueta = f"{p // 4}-T{p % 4 + 1}"
+        res = comparar(perfil, df[periodo == p])
+        res.insert(0, "PERIODO", etiqueta)
+        res.to_csv(OUT_DIR / f"drift_{etiqueta}.csv", index=False)
+
+        alertas = res[res["alerta"]]
+        hay_alertas |= not alertas.empty
+        estado = "⚠️ " + ", ".join(f"{c} ({m})" for c, m in zip(alertas["columna"], alertas["motivo"])) \
+            if not alertas.empty else "✅ sin deriva"
+        print(f"   {etiqueta}: {estado}")
+
+    return 1 if (estricto and hay_alertas) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(estricto="--estricto" in sys.argv))
@@ -0,0 +1,99 @@
+# ============================================================
+# SUBMUESTRA DETERMINÍSTICA DE HOGARES (--sample FRACCION)
+# Para probar cambios sin correr sobre toda la base: se conservan
+# hogares completos, elegidos por un hash estable (crc32) de
+# CODUSU|NRO_HOGAR. El mismo hogar cae siempre del mismo lado en
+# todos los trimestres, corridas y máquinas, así que se mantienen
+# el panel y la estructura del hogar (personas + usu_hogar).
+# El filtro se aplica a las líneas del archivo ANTES del parser
+# de pandas: con --sample 0.01 se parsea ~1% de las filas.
+# ============================================================
+
+import io
+import zlib
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+CLAVE_MUESTRA = ("CODUSU", "NRO_HOGAR")
+ESCALA = 2 ** 32  # rango de crc32
+
+
+# ---------------------- Hash del hogar ---------------------
+def _limpiar(valor: bytes) -> bytes:
+    return valor.strip().strip(b'"').strip()
+
+
+def hash_hogar(codusu, nro_hogar) -> int:
+    """crc32 de 'CODUSU|NRO_HOGAR' (acepta str o bytes)."""
+    if isinstance(codusu, str):
+        codusu = codusu.encode("latin-1")
+    if not isinstance(nro_hogar, bytes):
+        nro_hogar = str(nro_hogar).encode("latin-1")
+    return zlib.crc32(_limpiar(codusu) + b"|" + _limpiar(nro_hogar))
+
+
+# ---------------------- Filtro de líneas -------------------
+def filtrar_lineas(fh, fraccion: float, sep: str = ";") -> io.BytesIO:
+    """
+    Devuelve un archivo en memoria con el encabezado y sólo las líneas
+    de los hogares en la muestra. fh es un archivo binario (TXT, miembro
+    de ZIP o CSV limpio: las columnas se buscan sin importar mayúsculas).
+    """
+    sep_b = sep.encode()
+    encabezado = fh.readline()
+    nombres = [_limpiar(c).upper() for c in encabezado.rstrip(b"\r\n").split(sep_b)]
+    try:
+        i_cod, i_hog = (nombres.index(c.encode()) for c in CLAVE_MUESTRA)
+    except ValueError:
+        raise ValueError(f"El archivo no tiene las columnas {CLAVE_MUESTRA} para muestrear") from None
+
+    umbral = fraccion * ESCALA
+    ultimo = max(i_cod, i_hog) + 1
+    crc32 = zlib.crc32
+
+    salida = io.BytesIO()
+    salida.write(encabezado)
+    escribir = salida.write
+    for linea in fh:
+        campos = linea.split(sep_b, ultimo)
+        if len(campos) < ultimo:  # línea vacía o cortada
+            continue
+        if crc32(_limpiar(campos[i_cod]) + b"|" + _limpiar(campos[i_hog])) < umbral:
+            escribir(linea)
+    salida.seek(0)
+    return salida
+
+
+def leer_csv_muestra(path, fraccion=None, sep: str = ",", **kwargs):
+    """pd.read_csv del archivo; con fraccion, sólo los hogares de la muestra."""
+    import pandas as pd
+
+    if not fraccion:
+        return pd.read_csv(path, sep=sep, **kwargs)
+    with open(path, "rb") as fh:
+        return pd.read_csv(filtrar_lineas(fh, fraccion, sep), sep=sep, **kwargs)
+
+
+# ---------------------- Línea de comandos ------------------
+def fraccion_desde_argv(argv):
+    """Lee '--sample 0.01' (o '--sample=0.01') de los argumentos; None si no está."""
+    argv = list(argv)
+    for i, arg in enumerate(argv):
+        if arg.startswith("--sample"):
+            valor = arg.split("=", 1)[1] if "=" in arg else (argv[i + 1] if i + 1 < len(argv) else "")
+            try:
+                fraccion = float(valor)
+            except ValueError:
+                raise SystemExit(f"--sample necesita una fracción entre 0 y 1 (recibido: {valor!r})")
+            if not 0 < fraccion <= 1:
+                raise SystemExit(f"--sample debe estar en (0, 1] (recibido: {fraccion})")
+            return fraccion
+    return None
+
+
+def ruta_muestra(path, fraccion) -> Path:
+    """Con muestra, la salida lleva sufijo (no pisa el CSV de la base completa)."""
+    path = Path(path)
+    if not fraccion:
+        return path
+    return path.with_name(f"{path.stem}_muestra{fraccion:g}{path.suffix}")
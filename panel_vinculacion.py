@@ -0,0 +1,192 @@
+# ============================================================
+# VINCULACIÓN DEL PANEL ROTATIVO EPH
+# La EPH es un panel rotativo: la misma persona (CODUSU, NRO_HOGAR,
+# COMPONENTE) aparece hasta en cuatro trimestres. Acá armamos un
+# índice de personas para TODOS los trimestres leídos, en una sola
+# pasada de ordenamiento, y lo usamos para unir dos períodos cualquiera.
+#
+# Controles de consistencia (para descartar falsos matches):
+#   - Sexo (CH04) igual entre apariciones
+#   - Edad (CH06) compatible con el tiempo transcurrido
+# ============================================================
+
+import numpy as np
+import pandas as pd
+
+# ---------------------- Configuración -----------------------
+CLAVE_PERSONA = ["CODUSU", "NRO_HOGAR", "COMPONENTE"]
+
+# Margen (en años) que aceptamos en la edad declarada entre trimestres
+TOLERANCIA_EDAD = 1
+
+
+# ---------------------- Helpers ----------------------------
+def _columna(df: pd.DataFrame, nombre: str) -> pd.Series:
+    """Devuelve la columna aceptando nombres en mayúscula o minúscula."""
+    if nombre in df.columns:
+        return df[nombre]
+    return df[nombre.lower()]
+
+
+def _a_entero(s: pd.Series, faltante: int = -1) -> np.ndarray:
+    return pd.to_numeric(s, errors="coerce").fillna(faltante).to_numpy(dtype=np.int64)
+
+
+def indice_periodo(ano4, trimestre):
+    """Período como entero correlativo (ANO4*4 + TRIMESTRE-1)."""
+    return ano4 * 4 + (trimestre - 1)
+
+
+def parsear_periodo(periodo) -> int:
+    """
+    Acepta '2019-T1', '2019T1', (2019, 1) o el entero de indice_periodo().
+    """
+    if isinstance(periodo, (int, np.integer)):
+        return int(periodo)
+    if isinstance(periodo, tuple):
+        return indice_periodo(int(periodo[0]), int(periodo[1]))
+    txt = str(periodo).upper().replace("-", "")
+    ano, tri = txt.split("T")
+    return indice_periodo(int(ano), int(tri))
+
+
+def etiqueta_periodo(idx: int) -> str:
+    """Inversa de indice_periodo() con el formato de los gráficos ('2019-T1')."""
+    return f"{idx // 4}-T{idx % 4 + 1}"
+
+
+# ---------------------- Índice del panel -------------------
+def construir_indice_panel(df: pd.DataFrame, tolerancia_edad: int = TOLERANCIA_EDAD) -> pd.DataFrame:
+    """
+    Arma el índice de personas del panel con un único ordenamiento.
+
+    Devuelve un DataFrame ordenado por (ID_PANEL, PERIODO_IDX) con:
+      - ID_PANEL    : identificador entero de la persona vinculada
+      - PERIODO_IDX : período (ver indice_periodo)
+      - FILA        : posición (iloc) de la fila en df
+
+    Filas con clave incompleta quedan fuera. Si una persona aparece dos
+    veces en el mismo trimestre se conserva la primera aparición. Cuando
+    sexo o edad no cierran con la aparición anterior se corta la cadena
+    y se abre un ID_PANEL nuevo.
+    """
+    codusu = _columna(df, "CODUSU").astype("string").str.strip()
+    cod, _ = pd.factorize(codusu, use_na_sentinel=True)
+    hogar = _a_entero(_columna(df, "NRO_HOGAR"))
+    comp = _a_entero(_columna(df, "COMPONENTE"))
+    ano = _a_entero(_columna(df, "ANO4"))
+    tri = _a_entero(_columna(df, "TRIMESTRE"))
+    sexo = _a_entero(_columna(df, "CH04"))
+    edad = _a_entero(_columna(df, "CH06"))
+
+    validas = (cod >= 0) & (hogar >= 0) & (comp >= 0) & (ano >= 0) & (tri >= 1)
+    filas = np.flatnonzero(validas)
+
+    # clave de persona en un único int64 (NRO_HOGAR y COMPONENTE < 100)
+    clave = (cod[filas].astype(np.int64) * 100 + hogar[filas]) * 100 + comp[filas]
+    per = indice_periodo(ano[filas], tri[filas])
+
+    # una sola pasada de ordenamiento: persona y luego período
+    orden = np.lexsort((filas, per, clave))
+    filas, clave, per = filas[orden], clave[orden], per[orden]
+
+    # duplicados dentro del mismo trimestre: nos quedamos con el primero
+    repetida = np.zeros(len(filas), dtype=bool)
+    repetida[1:] = (clave[1:] == clave[:-1]) & (per[1:] == per[:-1])
+    filas, clave, per = filas[~repetida], clave[~repetida], per[~repetida]
+    sexo, edad = sexo[filas], edad[filas]
+
+    misma = np.zeros(len(filas), dtype=bool)
+    misma[1:] = clave[1:] == clave[:-1]
+
+    # consistencia con la aparición anterior de la misma clave
+    consistente = np.ones(len(filas), dtype=bool)
+    if len(filas) > 1:
+        s0, s1 = sexo[:-1], sexo[1:]
+        sexo_ok = (s0 < 0) | (s1 < 0) | (s0 == s1)
+
+        anios = (per[1:] - per[:-1]) / 4
+        dif = edad[1:] - edad[:-1]
+        edad_ok = (
+            (edad[:-1] < 0) | (edad[1:] < 0) |
+            ((dif >= np.floor(anios) - tolerancia_edad) & (dif <= np.ceil(anios) + tolerancia_edad))
+        )
+        consistente[1:] = sexo_ok & edad_ok
+
+    corte = ~misma | ~consistente
+    id_panel = np.cumsum(corte) - 1
+
+    return pd.DataFrame({
+        "ID_PANEL": id_panel.astype(np.int64),
+        "PERIODO_IDX": per.astype(np.int32),
+        "FILA": filas.astype(np.int64),
+    })
+
+
+def resumen_indice(indice: pd.DataFrame) -> dict:
+    """Cantidad de personas, apariciones y personas vistas en más de un trimestre."""
+    apariciones = np.bincount(indice["ID_PANEL"].to_numpy())
+    return {
+        "filas_indexadas": len(indice),
+        "personas": int(len(apariciones)),
+        "personas_en_2_o_mas_trimestres": int((apariciones >= 2).sum()),
+        "max_apariciones": int(apariciones.max()) if len(apariciones) else 0,
+    }
+
+
+# ---------------------- Uniones entre períodos -------------
+def filas_emparejadas(indice: pd.DataFrame, periodo_a, periodo_b):
+    """
+    Posiciones (iloc) de las personas presentes en ambos períodos.
+    Devuelve (ids, filas_a, filas_b), alineados entre sí.
+    """
+    pa, pb = parsear_periodo(periodo_a), parsear_periodo(periodo_b)
+    per = indice["PERIODO_IDX"].to_numpy()
+    ids = indice["ID_PANEL"].to_numpy()
+    filas = indice["FILA"].to_numpy()
+
+    en_a = per == pa
+    en_b = per == pb
+    comunes, ia, ib = np.intersect1d(ids[en_a], ids[en_b], assume_unique=True, return_indices=True)
+    return comunes, filas[en_a][ia], filas[en_b][ib]
+
+
+def unir_periodos(df: pd.DataFrame, indice: pd.DataFrame, periodo_a, periodo_b, columnas=None) -> pd.DataFrame:
+    """
+    Une las personas presentes en periodo_a y periodo_b.
+    Las columnas pedidas vuelven con sufijo _a / _b.
+    """
+    ids, filas_a, filas_b = filas_emparejadas(indice, periodo_a, periodo_b)
+    columnas = list(df.columns) if columnas is None else list(columnas)
+
+    lado_a = df.iloc[filas_a][columnas].add_suffix("_a").reset_index(drop=True)
+    lado_b = df.iloc[filas_b][columnas].add_suffix("_b").reset_index(drop=True)
+    out = pd.concat([lado_a, lado_b], axis=1)
+    out.insert(0, "ID_PANEL", ids)
+    return out
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    from limpieza_tp import INPUT_DIR, cargar_multiples_txt, tipar_columnas
+
+    print("1) Cargando TXT…")
+    df = tipar_columnas(cargar_multiples_txt(INPUT_DIR))
+    print(f"   Filas leídas: {len(df)}")
+
+    print("2) Construyendo índice del panel…")
+    indice = construir_indice_panel(df)
+    for k, v in resumen_indice(indice).items():
+        print(f"   {k}: {v}")
+
+    print("3) Personas vinculadas entre trimestres consecutivos…")
+    periodos = np.unique(indice["PERIODO_IDX"].to_numpy())
+    for pa, pb in zip(periodos[:-1], periodos[1:]):
+        if pb - pa != 1:
+            continue
+        ids, _, _ = filas_emparejadas(indice, int(pa), int(pb))
+        print(f"   {etiqueta_periodo(pa)} → {etiqueta_periodo(pb)}: {len(ids)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+# ============================================================
+# REGISTRO DE MODELOS ENTRENADOS (reentrenamiento incremental)
+# Cada pipeline se guarda con una clave:
+#     nombre (aglomerado) + hash de las filas de train + hash de
+#     los hiperparámetros (+ versión de sklearn)
+# Si al volver a correr modelo.py la clave no cambió, se reusa el
+# artefacto guardado; sólo se reentrenan los aglomerados cuyos datos
+# o parámetros cambiaron.
+# ============================================================
+
+import hashlib
+import json
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+# ---------------------- Configuración -----------------------
+REGISTRY_DIR = Path("processed") / "modelos"
+INDICE = "registro.json"
+
+
+# ---------------------- Claves ------------------------------
+def hash_datos(X: pd.DataFrame, y: pd.Series) -> str:
+    """Hash de las filas de entrenamiento (valores, columnas y orden)."""
+    h = hashlib.sha256()
+    h.update(json.dumps([str(c) for c in X.columns]).encode())
+    h.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    h.update(pd.util.hash_pandas_object(y, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def hash_params(pipe) -> str:
+    """Hash de los hiperparámetros simples del pipeline + versión de sklearn."""
+    import sklearn
+
+    simples = (bool, int, float, str, type(None))
+    params = {}
+    for k, v in pipe.get_params(deep=True).items():
+        if isinstance(v, simples):
+            params[k] = v
+        elif isinstance(v, (list, tuple)) and all(isinstance(x, simples) for x in v):
+            params[k] = list(v)
+        elif not hasattr(v, "get_params") and k not in ("steps", "transformers"):
+            params[k] = repr(v)
+    params["__modelo__"] = type(pipe.named_steps["model"]).__name__
+    params["__sklearn__"] = sklearn.__version__
+    return hashlib.sha256(json.dumps(params, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ---------------------- Índice -----------------------------
+def _leer_indice(registry_dir: Path) -> dict:
+    path = registry_dir / INDICE
+    if not path.exists():
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _escribir_indice(registry_dir: Path, indice: dict):
+    registry_dir.mkdir(parents=True, exist_ok=True)
+    with open(registry_dir / INDICE, "w", encoding="utf-8") as fh:
+        json.dump(indice, fh, indent=2, ensure_ascii=False)
+
+
+# ---------------------- API ---------------------------------
+def obtener_o_entrenar(nombre, X, y, pipe, entrenar, registry_dir: Path = REGISTRY_DIR):
+    """
+    Devuelve (pipe, metricas, reusado).
+
+    `entrenar(pipe)` se llama sólo si no hay artefacto con la misma clave
+    y debe devolver (pipe_entrenado, metricas).
+    """
+    import joblib
+
+    registry_dir = Path(registry_dir)
+    h_datos, h_params = hash_datos(X, y), hash_params(pipe)
+    clave = hashlib.sha256(f"{nombre}|{h_datos}|{h_params}".encode()).hexdigest()[:16]
+
+    indice = _leer_indice(registry_dir)
+    previo = indice.get(nombre)
+    if previo and previo["clave"] == clave and (registry_dir / previo["archivo"]).exists():
+        print(f"[REGISTRO] {nombre}: sin cambios, se reusa {previo['archivo']}")
+        return joblib.load(registry_dir / previo["archivo"]), previo.get("metricas", {}), True
+
+    motivo = "nuevo" if not previo else (
+        "datos cambiaron" if previo.get("hash_datos") != h_datos else "parámetros cambiaron"
+    )
+    print(f"[REGISTRO] {nombre}: entrenando ({motivo})")
+    pipe, metricas = entrenar(pipe)
+
+    archivo = f"{nombre}_{clave}.joblib"
+    registry_dir.mkdir(parents=True, exist_ok=True)
+    joblib.dump(pipe, registry_dir / archivo)
+    if previo and previo["archivo"] != archivo:
+        (registry_dir / previo["archivo"]).unlink(missing_ok=True)
+
+    indice[nombre] = {
+        "clave": clave,
+        "hash_datos": h_datos,
+        "hash_params": h_params,
+        "archivo": archivo,
+        "filas": int(len(X)),
+        "metricas": {k: float(v) for k, v in metricas.items()},
+        "entrenado": datetime.now().isoformat(timespec="seconds"),
+    }
+    _escribir_indice(registry_dir, indice)
+    return pipe, metricas, False
@@ -0,0 +1,151 @@
+# ============================================================
+# EXPORTACIÓN DE REGLAS Y ESTADÍSTICAS POR HOJA DEL ÁRBOL
+# En lugar de (o además de) el PNG de plot_tree_graph, que sólo
+# muestra 3 niveles y corta los nombres de las categorías, se
+# exporta cada hoja con:
+#   - el camino completo de decisión con nombres legibles
+#     (ej. "formalidad > 0.5", "sexo = 2", "rama_actividad ∉ {…}")
+#   - cantidad de casos, ingreso medio ponderado y cuantiles
+# Sale de un solo apply() sobre el train (estadísticas) y un
+# decision_path() sobre un caso representativo por hoja (caminos).
+# Se guarda en JSON y CSV.
+# ============================================================
+
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from desigualdad import distribucion_ingresos
+from muestreo import ruta_muestra
+
+# ---------------------- Configuración -----------------------
+CUANTILES_HOJA = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+# ---------------------- Nombres -----------------------------
+def variables_transformadas(prep) -> list:
+    """
+    Para cada columna que sale del ColumnTransformer: (variable, categoría).
+    Las numéricas tienen categoría None; las one-hot, la categoría que marcan.
+    """
+    cols = {nombre: list(c) for nombre, _, c in prep.transformers_ if nombre in ("num", "cat")}
+    numeric, categorical = cols.get("num", []), cols.get("cat", [])
+
+    salida = [(c, None) for c in numeric]
+    if categorical:
+        enc = prep.named_transformers_["cat"]
+        for var, cats in zip(categorical, enc.categories_):
+            salida.extend((var, cat) for cat in cats)
+    return salida
+
+
+def nombres_legibles(prep) -> list:
+    """'edad', 'sexo=2', … (sin ambigüedad entre categorías)."""
+    return [v if cat is None else f"{v}={_fmt(cat)}" for v, cat in variables_transformadas(prep)]
+
+
+def _fmt(valor) -> str:
+    if isinstance(valor, (float, np.floating)) and float(valor).is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+# ---------------------- Caminos -----------------------------
+def _condiciones_a_texto(conds: list) -> list:
+    """
+    Junta las condiciones de una misma variable:
+      numéricas  → 'a < var <= b'
+      categorías → 'var = c' o 'var ∉ {c1, c2}'
+    """
+    por_var = {}
+    for var, cat, op, umbral in conds:
+        por_var.setdefault(var, []).append((cat, op, umbral))
+
+    textos = []
+    for var, lista in por_var.items():
+        if lista[0][0] is None:
+            lo = max((u for _, op, u in lista if op == ">"), default=None)
+            hi = min((u for _, op, u in lista if op == "<="), default=None)
+            if lo is not None and hi is not None:
+                textos.append(f"{lo:g} < {var} <= {hi:g}")
+            elif lo is not None:
+                textos.append(f"{var} > {lo:g}")
+            else:
+                textos.append(f"{var} <= {hi:g}")
+        else:
+            iguales = [c for c, op, _ in lista if op == "="]
+            if iguales:
+                textos.append(f"{var} = {_fmt(iguales[0])}")
+            else:
+                distintos = ", ".join(_fmt(c) for c, _, _ in lista)
+                textos.append(f"{var} ∉ {{{distintos}}}")
+    return textos
+
+
+def caminos_hojas(tree, Xt, hojas: np.ndarray, variables: list) -> dict:
+    """Hoja → lista de condiciones legibles (un decision_path por hoja)."""
+    ids, representante = np.unique(hojas, return_index=True)
+    dp = tree.decision_path(Xt[representante])
+
+    t = tree.tree_
+    caminos = {}
+    for i, hoja in enumerate(ids):
+        nodos = dp.indices[dp.indptr[i]:dp.indptr[i + 1]]
+        nodos = np.sort(nodos)  # en sklearn un nodo siempre tiene id menor que sus hijos
+        conds = []
+        for nodo, siguiente in zip(nodos[:-1], nodos[1:]):
+            var, cat = variables[t.feature[nodo]]
+            izquierda = siguiente == t.children_left[nodo]
+            if cat is None:
+                conds.append((var, None, "<=" if izquierda else ">", float(t.threshold[nodo])))
+            else:
+                # one-hot: izquierda (<= 0.5) = no es la categoría
+                conds.append((var, cat, "≠" if izquierda else "=", None))
+        caminos[int(hoja)] = _condiciones_a_texto(conds)
+    return caminos
+
+
+# ---------------------- Exportación ------------------------
+def reglas_hojas(pipe, X: pd.DataFrame, y: pd.Series, pesos=None) -> pd.DataFrame:
+    """
+    Una fila por hoja: regla completa, casos, ingreso medio ponderado,
+    cuantiles ponderados y predicción del árbol.
+    """
+    tree = pipe.named_steps["model"]
+    prep = pipe.named_steps["prep"]
+
+    Xt = prep.transform(X)
+    hojas = tree.apply(Xt)
+    variables = variables_transformadas(prep)
+    caminos = caminos_hojas(tree, Xt, hojas, variables)
+
+    w = np.ones(len(y)) if pesos is None else np.asarray(pesos, dtype=float)
+    base = pd.DataFrame({"hoja": hojas, "ingreso": np.asarray(y, dtype=float), "peso": w})
+    stats = distribucion_ingresos(base, grupos=["hoja"], variables=["ingreso"],
+                                  peso="peso", cuantiles=CUANTILES_HOJA)
+    stats = stats.drop(columns=["variable"] + [f"d{k}" for k in range(1, 10)] + ["gini", "palma"])
+    stats = stats.rename(columns={"media": "media_ponderada", "poblacion": "pondera"})
+
+    stats["prediccion"] = tree.tree_.value[stats["hoja"].to_numpy(), 0, 0]
+    stats["condiciones"] = stats["hoja"].map(caminos)
+    stats["regla"] = stats["condiciones"].map(lambda c: " Y ".join(c))
+    return stats.sort_values("prediccion").reset_index(drop=True)
+
+
+def exportar_reglas(tabla: pd.DataFrame, name: str, out_dir: Path = Path("processed"), fraccion=None) -> tuple:
+    """
+    Guarda reglas_<name>.json (con la lista de condiciones) y reglas_<name>.csv
+    (con fraccion, con el sufijo de muestra de ruta_muestra).
+    """
+    out_dir.mkdir(exist_ok=True)
+    json_path = ruta_muestra(out_dir / f"reglas_{name}.json", fraccion)
+    csv_path = ruta_muestra(out_dir / f"reglas_{name}.csv", fraccion)
+
+    registros = json.loads(tabla.to_json(orient="records", force_ascii=False))
+    with open(json_path, "w", encoding="utf-8") as fh:
+        json.dump(registros, fh, indent=2, ensure_ascii=False)
+    tabla.drop(columns=["condiciones"]).to_csv(csv_path, index=False)
+
+    print(f"Reglas del árbol → {json_path} / {csv_path}")
+    return json_path, csv_path
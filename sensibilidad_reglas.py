@@ -0,0 +1,175 @@
+# ============================================================
+# SENSIBILIDAD A LAS REGLAS DE LIMPIEZA
+# Las reglas están fijas en el código:
+#   - edad 18–85 y horas (0, 80] en remove_invalid_obs (clean_eph)
+#   - q=0.995 en eliminar_outliers_ingresos_por_anio (en el TP sobre
+#     P47T; acá, como es la base del modelo, sobre COL_OUTLIERS)
+#   - tope de 168 horas en sanidad_basica (limpieza_tp)
+# clean_eph no aplica ni el recorte de outliers ni sanidad_basica:
+# en la grilla son variantes (None = no se aplica) y el escenario
+# "base" (primer valor de cada eje) reproduce clean_eph + modelo.
+# Las tasas usan siempre el universo de los scripts de tasas
+# (18–110, ver tasas_streaming.REGLAS), así que no dependen de
+# ningún eje: se calculan una vez, aparte.
+# Este script carga y tipa los datos UNA vez y evalúa una grilla
+# de variantes en procesos paralelos. Los procesos se crean con
+# fork, así que comparten la base cargada (copy-on-write) sin
+# volver a leerla ni serializarla.
+#
+# Salida: una tabla con filas y MAE/R² por escenario, y las tasas
+# de referencia en otra.
+# ============================================================
+
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+from limpiezaModelo import (
+    load_all_eph, apply_ipc_deflation, map_education, create_variables,
+    filter_periods, select_occupied, remove_invalid_obs, handle_missing,
+    split_income_real,
+)
+from limpieza_tp import sanidad_basica
+from limpieza_sin_outliers import eliminar_outliers_ingresos_por_anio
+from modelo import build_feature_sets, build_pipeline, evaluate_model
+from tasas_streaming import REGLAS as REGLAS_TASAS, sumas_parciales, tasas_desde_parciales
+
+# ---------------------- Configuración -----------------------
+OUTPUT_PATH = Path("processed") / "sensibilidad_reglas.csv"
+TASAS_PATH = Path("processed") / "sensibilidad_tasas.csv"
+
+# Grilla de variantes: el primer valor de cada lista es lo que hace hoy
+# clean_eph (None = el paso no se aplica)
+GRILLA = {
+    "q_outliers": [None, 0.995, 0.99, 0.999],
+    "edad": [(18, 85), (18, 65), (25, 65)],
+    "horas": [(0, 80), (0, 60), (0, 100)],
+    "max_horas": [None, 168, 100],
+}
+
+# Columna sobre la que se recorta q_outliers: el ingreso real que predice el modelo
+COL_OUTLIERS = "P21_real_2025"
+
+# Universo de las tasas: el mismo de tasas_streaming / tasaEmpleo / … (no varía)
+EDAD_TASAS = (REGLAS_TASAS["edad_min"], REGLAS_TASAS["edad_max_valida"])
+
+CIUDADES = {"posadas": 7, "rada_tilly": 9}
+MIN_FILAS_MODELO = 50
+
+# Base compartida con los procesos hijos (se hereda con fork)
+_BASE = None
+
+
+# ---------------------- Base ------------------------------
+def preparar_base(folder="data") -> pd.DataFrame:
+    """Carga + IPC + variables derivadas: todo lo que no depende de las reglas."""
+    df = load_all_eph(folder)
+    for c in ["H15", "PONDERA", "P47T", "CH04"]:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = apply_ipc_deflation(df)
+    df = map_education(df)
+    df = create_variables(df)
+    return df
+
+
+def armar_escenarios(grilla: dict = GRILLA) -> list:
+    nombres = list(grilla)
+    return [dict(zip(nombres, valores)) for valores in itertools.product(*grilla.values())]
+
+
+def es_base(esc: dict, grilla: dict = GRILLA) -> bool:
+    """El escenario que reproduce el pipeline actual (primer valor de cada eje)."""
+    return all(esc[k] == v[0] for k, v in grilla.items())
+
+
+# ---------------------- Tasas ------------------------------
+def tasas_referencia(df: pd.DataFrame) -> pd.DataFrame:
+    """Tasas por aglomerado del TP con el universo fijo de los scripts de tasas (18–110)."""
+    u = df[
+        df["ANO4"].between(2016, 2025) & (df["H15"] == 1) &
+        df["CH06"].between(*EDAD_TASAS) & df["ESTADO"].isin([1, 2, 3]) &
+        df["PONDERA"].notna()
+    ]
+    sumas = sumas_parciales(u).groupby(level=["aglomerado", "estado"]).sum()
+    tasas = tasas_desde_parciales(sumas)
+    return tasas[tasas["aglomerado"].isin(CIUDADES.values())].reset_index(drop=True)
+
+
+# ---------------------- Un escenario -----------------------
+def evaluar_escenario(esc: dict) -> dict:
+    """Aplica las reglas del escenario sobre _BASE y mide filas y métricas del modelo."""
+    df = _BASE
+    fila = {"base": es_base(esc)}
+    fila.update({k: (str(v) if isinstance(v, tuple) else v) for k, v in esc.items()})
+    fila["col_outliers"] = COL_OUTLIERS
+
+    # --- modelo (mismo orden que clean_eph; sanidad y outliers sólo como variantes)
+    m = select_occupied(filter_periods(df))
+    if esc["max_horas"] is not None:
+        m = sanidad_basica(m, max_horas=esc["max_horas"])
+    m = remove_invalid_obs(m, age_range=esc["edad"], hours_range=esc["horas"])
+    if esc["q_outliers"] is not None:
+        m = eliminar_outliers_ingresos_por_anio(m, COL_OUTLIERS, q=esc["q_outliers"])
+    m = handle_missing(m)
+    train, missing = split_income_real(m)
+    fila["filas_train"] = len(train)
+    fila["filas_missing"] = len(missing)
+
+    for nombre, cod in CIUDADES.items():
+        tr = train[train["AGLOMERADO"] == cod]
+        X, y, numeric, categorical, _ = build_feature_sets(tr)
+        if len(X) < MIN_FILAS_MODELO:
+            fila[f"mae_{nombre}"] = fila[f"r2_{nombre}"] = float("nan")
+            continue
+        metrics = evaluate_model(X, y, build_pipeline(numeric, categorical))
+        fila[f"mae_{nombre}"] = metrics["mae"]
+        fila[f"r2_{nombre}"] = metrics["r2"]
+
+    return fila
+
+
+# ---------------------- Runner -----------------------------
+def correr_escenarios(base: pd.DataFrame, escenarios: list, procesos=None) -> pd.DataFrame:
+    """
+    Evalúa los escenarios en paralelo compartiendo `base` por fork.
+    Donde no hay fork (Windows) corre en serie.
+    """
+    global _BASE
+    _BASE = base
+
+    if procesos == 1 or "fork" not in mp.get_all_start_methods():
+        filas = [evaluar_escenario(e) for e in escenarios]
+    else:
+        with ProcessPoolExecutor(max_workers=procesos, mp_context=mp.get_context("fork")) as ex:
+            filas = list(ex.map(evaluar_escenario, escenarios))
+
+    return pd.DataFrame(filas)
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    print("1) Cargando y tipando la base (una sola vez)…")
+    base = preparar_base("data")
+    print(f"   Filas: {len(base)}")
+
+    print("2) Tasas de referencia (no dependen de la grilla)…")
+    tasas = tasas_referencia(base)
+
+    escenarios = armar_escenarios()
+    print(f"3) Evaluando {len(escenarios)} escenarios en paralelo…")
+    tabla = correr_escenarios(base, escenarios)
+
+    OUTPUT_PATH.parent.mkdir(exist_ok=True)
+    tabla.to_csv(OUTPUT_PATH, index=False)
+    tasas.to_csv(TASAS_PATH, index=False)
+    print(f"✅ Listo: {OUTPUT_PATH} y {TASAS_PATH}")
+    print(tasas.round(2).to_string(index=False))
+    print(tabla.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,248 @@
+# ============================================================
+# SERVICIO HTTP LOCAL DE TASAS LABORALES
+# En vez de editar y volver a correr comparacionTasas.py o
+# tasaEmpleo.py (que releen todo el CSV), este proceso carga una
+# sola vez las sumas de PONDERA por período × aglomerado ×
+# [apertura] × ESTADO de los TXT crudos (tasas_streaming.cargar_sumas:
+# con inactivos y todos los aglomerados; el CSV limpio sólo tiene
+# ESTADO 1/2 de 7 y 9) y responde consultas en JSON:
+#   GET /tasas?rate=desocupacion&aglomerado=9&period=2019T1..2025T2&by=sexo
+#   GET /estado   (fuente y celdas cargadas + estadísticas del cache)
+# Las respuestas quedan en un cache LRU acotado cuya clave es la
+# consulta normalizada (mismo pedido escrito distinto = misma clave).
+# Sólo biblioteca estándar (asyncio) + pandas.
+# ============================================================
+
+import asyncio
+import json
+import sys
+from functools import lru_cache
+from urllib.parse import parse_qs, urlsplit
+
+from panel_vinculacion import indice_periodo, parsear_periodo, etiqueta_periodo
+from tasas_streaming import INPUT_DIR, cargar_sumas, tasas_desde_parciales
+
+# ---------------------- Configuración -----------------------
+HOST = "127.0.0.1"
+PUERTO = 8765
+TAM_CACHE = 1024
+
+# rate= … → columna de tasas_desde_parciales
+TASAS = {
+    "actividad": "tasa_actividad",
+    "empleo": "tasa_empleo",
+    "desocupacion": "tasa_desocupacion",
+}
+
+# tasas que necesitan a los inactivos (ESTADO 3) en el denominador
+CON_INACTIVOS = {"actividad", "empleo"}
+
+# by= … → nivel de las sumas (nombres en minúscula de los TXT)
+APERTURAS = {
+    "sexo": "ch04",
+    "categoria": "cat_ocup",
+}
+
+# Sumas precalculadas (una por apertura, "" = sin apertura)
+_SUMAS = {}
+_INFO = {"fuente": None, "inactivos": False}
+
+
+# ---------------------- Preparación ------------------------
+def preparar_sumas(sumas, fuente: str = ""):
+    """
+    Parte las sumas de pondera por período × aglomerado × [aperturas] × estado
+    en una serie por apertura. Si no hay ESTADO 3, actividad y empleo se rechazan.
+    """
+    _SUMAS.clear()
+    for por, col in [("", None), *APERTURAS.items()]:
+        if col is not None and col not in sumas.index.names:
+            continue
+        claves = ["ano4", "trimestre", "aglomerado"] + ([col] if col else []) + ["estado"]
+        s = sumas.groupby(level=claves, observed=True).sum()
+        s.index = s.index.set_levels([lvl.astype("int64") for lvl in s.index.levels])
+        if col:
+            s.index = s.index.rename(por, level=col)
+        _SUMAS[por] = s
+    _INFO["fuente"] = fuente
+    _INFO["inactivos"] = bool((_SUMAS[""].index.get_level_values("estado") == 3).any())
+    consultar.cache_clear()
+
+
+def preparar(df, fuente: str = ""):
+    """Lo mismo desde un frame por persona (columnas en minúscula, con pondera)."""
+    cols = [c for c in APERTURAS.values() if c in df.columns]
+    claves = ["ano4", "trimestre", "aglomerado", *cols, "estado"]
+    preparar_sumas(df.groupby(claves, observed=True, dropna=False)["pondera"].sum(), fuente)
+
+
+def cargar(input_dir=INPUT_DIR):
+    """Sumas de los TXT crudos (cacheadas en processed/tasas_sumas.csv) listas para consultar."""
+    preparar_sumas(cargar_sumas(input_dir), fuente=str(input_dir))
+
+
+# ---------------------- Consultas --------------------------
+def _valores(params: dict, nombre: str) -> list:
+    """Valores de un parámetro (acepta repetidos y separados por coma)."""
+    salida = []
+    for v in params.get(nombre, []):
+        salida.extend(x.strip().lower() for x in v.split(",") if x.strip())
+    return salida
+
+
+def normalizar_consulta(params: dict) -> tuple:
+    """
+    De los parámetros de la URL a una clave canónica (hashable):
+      (tasas, aglomerados, periodo_desde, periodo_hasta, apertura)
+    Lanza ValueError si algún valor no es válido.
+    """
+    disponibles = [t for t in TASAS if _INFO["inactivos"] or t not in CON_INACTIVOS]
+    tasas = _valores(params, "rate") or disponibles
+    tasas = [t.removeprefix("tasa_") for t in tasas]
+    desconocidas = [t for t in tasas if t not in TASAS]
+    if desconocidas:
+        raise ValueError(f"rate desconocida: {desconocidas} (opciones: {list(TASAS)})")
+    sin_base = [t for t in tasas if t not in disponibles]
+    if sin_base:
+        raise ValueError(f"rate {sin_base} necesita inactivos (ESTADO 3) y los datos cargados "
+                         f"no los tienen (opciones: {disponibles})")
+
+    try:
+        aglos = tuple(sorted({int(a) for a in _valores(params, "aglomerado")}))
+    except ValueError:
+        raise ValueError("aglomerado debe ser un código entero (ej. 7 o 7,9)") from None
+
+    periodo = _valores(params, "period")
+    desde, hasta = 0, 10 ** 6  # sin límite
+    if periodo:
+        extremos = periodo[0].split("..")
+        try:
+            desde = parsear_periodo(extremos[0]) if extremos[0] else desde
+            hasta = parsear_periodo(extremos[-1]) if extremos[-1] else hasta
+        except ValueError:
+            raise ValueError("period debe ser '2019T1' o '2019T1..2025T2'") from None
+
+    por = (_valores(params, "by") or [""])[0]
+    if por and por not in _SUMAS:
+        raise ValueError(f"by desconocido: {por!r} (opciones: {[k for k in _SUMAS if k]})")
+
+    return tuple(sorted(set(tasas), key=list(TASAS).index)), aglos, desde, hasta, por
+
+
+@lru_cache(maxsize=TAM_CACHE)
+def consultar(clave: tuple) -> bytes:
+    """Respuesta JSON (ya serializada) para una consulta normalizada."""
+    tasas, aglos, desde, hasta, por = clave
+    s = _SUMAS[por]
+    idx = s.index
+
+    p = indice_periodo(idx.get_level_values("ano4"), idx.get_level_values("trimestre"))
+    mask = (p >= desde) & (p <= hasta)
+    if aglos:
+        mask &= idx.get_level_values("aglomerado").isin(aglos)
+
+    filas = []
+    if mask.any():
+        t = tasas_desde_parciales(s[mask])
+        cols = ["PERIODO", "aglomerado"] + ([por] if por else []) + ["poblacion"] + [TASAS[x] for x in tasas]
+        filas = json.loads(t[cols].to_json(orient="records", double_precision=4))
+
+    consulta = {
+        "rate": list(tasas),
+        "aglomerado": list(aglos),
+        "period": [etiqueta_periodo(desde) if desde > 0 else None,
+                   etiqueta_periodo(hasta) if hasta < 10 ** 6 else None],
+        "by": por or None,
+    }
+    return json.dumps({"consulta": consulta, "filas": filas}, ensure_ascii=False).encode("utf-8")
+
+
+def estado() -> bytes:
+    info = consultar.cache_info()
+    return json.dumps({
+        "fuente": _INFO["fuente"],
+        "celdas": int(len(_SUMAS.get("", ()))),
+        "con_inactivos": _INFO["inactivos"],
+        "aperturas": [k for k in _SUMAS if k],
+        "cache": {"hits": info.hits, "misses": info.misses, "tamano": info.currsize, "max": info.maxsize},
+    }).encode("utf-8")
+
+
+# ---------------------- HTTP -------------------------------
+MENSAJES = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+def _error(mensaje: str) -> bytes:
+    return json.dumps({"error": mensaje}, ensure_ascii=False).encode("utf-8")
+
+
+async def responder(destino: str) -> tuple:
+    """(código, cuerpo) para un GET a destino."""
+    url = urlsplit(destino)
+    if url.path == "/estado":
+        return 200, estado()
+    if url.path != "/tasas":
+        return 404, _error(f"ruta desconocida: {url.path} (usar /tasas o /estado)")
+
+    try:
+        clave = normalizar_consulta(parse_qs(url.query))
+    except ValueError as e:
+        return 400, _error(str(e))
+
+    # las consultas nuevas se calculan fuera del loop; las repetidas salen del cache
+    loop = asyncio.get_running_loop()
+    return 200, await loop.run_in_executor(None, consultar, clave)
+
+
+async def atender(reader, writer):
+    try:
+        linea = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # encabezados: no se usan
+
+        partes = linea.decode("latin-1").split()
+        if len(partes) < 2:
+            codigo, cuerpo = 400, _error("pedido HTTP inválido")
+        elif partes[0] != "GET":
+            codigo, cuerpo = 405, _error("sólo GET")
+        else:
+            try:
+                codigo, cuerpo = await responder(partes[1])
+            except Exception as e:
+                codigo, cuerpo = 500, _error(f"{type(e).__name__}: {e}")
+
+        encabezado = (
+            f"HTTP/1.1 {codigo} {MENSAJES[codigo]}\r\n"
+            "Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("latin-1")
+        writer.write(encabezado + cuerpo)
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def servir(host: str = HOST, puerto: int = PUERTO):
+    server = await asyncio.start_server(atender, host, puerto)
+    print(f"✅ Escuchando en http://{host}:{puerto}/tasas  (Ctrl+C para cortar)")
+    async with server:
+        await server.serve_forever()
+
+
+# ---------------------- Proceso principal -------------------
+def main(puerto: int = PUERTO):
+    print("1) Sumas por período × aglomerado × apertura desde los TXT…")
+    cargar(INPUT_DIR)
+    print(f"   Celdas: {len(_SUMAS['']):,} | aperturas: {[k for k in _SUMAS if k]}")
+
+    try:
+        asyncio.run(servir(HOST, puerto))
+    except KeyboardInterrupt:
+        print("Servicio detenido.")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else PUERTO)
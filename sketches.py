@@ -0,0 +1,339 @@
+# ============================================================
+# VISTA PREVIA CON SKETCHES (cuantiles y conteos aproximados)
+# Para chequeos rápidos —¿qué cortes de ingreso aplicaría
+# eliminar_outliers_ingresos_por_anio?, ¿cuántos hogares distintos
+# tiene cada trimestre?— sin correr la limpieza completa. Cada
+# fuente (TXT o miembro de ZIP) se recorre una vez, por bloques, y
+# se resume por período en dos sketches de tamaño fijo:
+#   - t-digest de P47T (universo de filtrar_universo) → cuantiles.
+#     Cada centroide guarda además su mínimo y máximo, lo que da
+#     cotas seguras para el valor de cualquier cuantil.
+#   - HyperLogLog de CODUSU|NRO_HOGAR → hogares distintos
+#     (error estándar 1.04/√m, con m = 2^PRECISION registros).
+# Los dos se combinan (t-digest: unir centroides y recomprimir;
+# HLL: máximo de registros), así que se arman por archivo —en
+# paralelo, ver lectura_zip.leer_fuentes— y después se juntan por
+# período o por año. Se pueden guardar en JSON y combinar entre
+# corridas / procesos.
+#   python sketches.py            # processed/preview_*.csv
+# ============================================================
+
+import base64
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from lectura_zip import listar_fuentes, leer_fuentes, nombre_fuente
+
+# ---------------------- Configuración -----------------------
+INPUT_DIR = Path("data")
+OUT_DIR = Path("processed")
+
+CHUNK_ROWS = 200_000
+COMPRESION = 1000       # δ del t-digest: ~δ/2 centroides (≈16 KB), más finos en las colas
+PRECISION = 14          # HLL: 2^14 registros de 1 byte (16 KB), error ≈ 0.8%
+
+COL_INGRESO = "P47T"
+Q_OUTLIERS = 0.995      # el q de eliminar_outliers_ingresos_por_anio en limpieza_sin_outliers
+CUANTILES = (0.5, 0.9, 0.99, Q_OUTLIERS)
+
+# Universo del corte de outliers (mismas reglas que filtrar_universo)
+UNIVERSO = {
+    "anios": (2016, 2025),
+    "aglomerados": (7, 9),
+    "edad": (18, 110),
+    "estados": (1, 2),
+}
+
+COLS = ["CODUSU", "NRO_HOGAR", "ANO4", "TRIMESTRE", "AGLOMERADO", "H15", "CH06", "ESTADO", COL_INGRESO]
+
+
+# ---------------------- t-digest ----------------------------
+def tdigest_nuevo() -> dict:
+    vacio = np.empty(0)
+    return {"medias": vacio, "pesos": vacio, "minimos": vacio, "maximos": vacio}
+
+
+def _escala_k(q: np.ndarray, delta: float) -> np.ndarray:
+    """Función de escala k1: centroides chicos cerca de q=0 y q=1."""
+    return delta / (2 * np.pi) * np.arcsin(2 * np.clip(q, 0, 1) - 1)
+
+
+def _comprimir(medias, pesos, minimos, maximos, delta: float = COMPRESION) -> dict:
+    """
+    Ordena los centroides y junta los vecinos que caen en la misma unidad
+    de la escala k (cada centroide abarca a lo sumo 1 unidad: la condición
+    del t-digest). Todo vectorizado: bincount para las medias ponderadas,
+    reduceat para mínimos y máximos (los grupos son contiguos).
+    """
+    if not len(medias):
+        return tdigest_nuevo()
+    orden = np.argsort(medias, kind="stable")
+    medias, pesos, minimos, maximos = medias[orden], pesos[orden], minimos[orden], maximos[orden]
+
+    acum = np.cumsum(pesos)
+    q_centro = (acum - pesos / 2) / acum[-1]
+    grupo = np.floor(_escala_k(q_centro, delta) + delta / 4).astype(np.int64)  # k1 va de -δ/4 a δ/4
+    inicios = np.flatnonzero(np.r_[True, grupo[1:] != grupo[:-1]])
+    _, ids = np.unique(grupo, return_inverse=True)
+
+    w = np.bincount(ids, weights=pesos)
+    return {
+        "medias": np.bincount(ids, weights=medias * pesos) / w,
+        "pesos": w,
+        "minimos": np.minimum.reduceat(minimos, inicios),
+        "maximos": np.maximum.reduceat(maximos, inicios),
+    }
+
+
+def tdigest_agregar(d: dict, valores, delta: float = COMPRESION) -> dict:
+    """Agrega un bloque de valores (NaN se ignoran) y recomprime."""
+    x = np.asarray(valores, dtype="float64")
+    x = x[~np.isnan(x)]
+    if not len(x):
+        return d
+    return _comprimir(
+        np.r_[d["medias"], x], np.r_[d["pesos"], np.ones(len(x))],
+        np.r_[d["minimos"], x], np.r_[d["maximos"], x], delta,
+    )
+
+
+def tdigest_combinar(a: dict, b: dict, delta: float = COMPRESION) -> dict:
+    return _comprimir(*(np.r_[a[k], b[k]] for k in ("medias", "pesos", "minimos", "maximos")), delta)
+
+
+def tdigest_total(d: dict) -> float:
+    return float(d["pesos"].sum())
+
+
+def _rango_seguro(orden_por: np.ndarray, pesos: np.ndarray, rango: float) -> float:
+    """Menor x tal que los centroides con orden_por ≤ x suman ≥ rango puntos."""
+    o = np.argsort(orden_por, kind="stable")
+    i = np.searchsorted(np.cumsum(pesos[o]), rango - 1e-9)
+    return float(orden_por[o][min(i, len(o) - 1)])
+
+
+def tdigest_cuantil(d: dict, q: float) -> tuple:
+    """
+    (estimado, cota_inferior, cota_superior) del cuantil q con la misma
+    interpolación lineal que Series.quantile. Las cotas son seguras: el
+    valor exacto está en [cota_inferior, cota_superior].
+    """
+    n = tdigest_total(d)
+    if n == 0:
+        return (np.nan, np.nan, np.nan)
+    m, w = d["medias"], d["pesos"]
+
+    # posición (0-based, como pandas) → coordenada sobre los centros de los centroides
+    pos = q * (n - 1)
+    centros = np.cumsum(w) - w / 2
+    extremos_x = np.r_[d["minimos"].min(), m, d["maximos"].max()]
+    extremos_c = np.r_[0.0, centros, n]
+    estimado = float(np.interp(pos + 0.5, extremos_c, extremos_x))
+
+    # cotas: el punto de rango r (1-based) está entre esas dos envolventes
+    bajo = _rango_seguro(d["minimos"], w, np.floor(pos) + 1)
+    alto = _rango_seguro(d["maximos"], w, np.ceil(pos) + 1)
+    return estimado, bajo, alto
+
+
+# ---------------------- HyperLogLog ------------------------
+def hll_nuevo(precision: int = PRECISION) -> np.ndarray:
+    return np.zeros(1 << precision, dtype=np.uint8)
+
+
+def _ceros_iniciales(x: np.ndarray) -> np.ndarray:
+    """Ceros a la izquierda de cada uint64 (64 si x == 0), por búsqueda binaria."""
+    x = x.copy()
+    n = np.zeros(len(x), dtype=np.uint8)
+    for s in (32, 16, 8, 4, 2, 1):
+        arriba_vacio = (x >> np.uint64(64 - s)) == 0
+        n[arriba_vacio] += s
+        x[arriba_vacio] <<= np.uint64(s)
+    n[x == 0] = 64
+    return n
+
+
+def hll_agregar(registros: np.ndarray, hashes: np.ndarray) -> np.ndarray:
+    """Agrega hashes uint64: los p bits altos eligen el registro, el resto da ρ."""
+    if not len(hashes):
+        return registros
+    p = int(np.log2(len(registros)))
+    h = np.asarray(hashes, dtype=np.uint64)
+    idx = (h >> np.uint64(64 - p)).astype(np.intp)
+    resto = h << np.uint64(p)
+    rho = np.minimum(_ceros_iniciales(resto), 64 - p) + 1
+    np.maximum.at(registros, idx, rho.astype(np.uint8))
+    return registros
+
+
+def hll_combinar(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return np.maximum(a, b)
+
+
+def hll_estimar(registros: np.ndarray) -> tuple:
+    """(estimado, error_relativo_2σ) con la corrección de rango chico (conteo lineal)."""
+    m = len(registros)
+    alfa = 0.7213 / (1 + 1.079 / m)
+    e = alfa * m * m / np.sum(np.ldexp(1.0, -registros.astype(np.int64)))
+    vacios = int((registros == 0).sum())
+    if e <= 2.5 * m and vacios:
+        e = m * np.log(m / vacios)
+    return float(e), 2 * 1.04 / np.sqrt(m)
+
+
+def hash_hogares(codusu: pd.Series, nro_hogar: pd.Series) -> np.ndarray:
+    """Hash estable (mismo valor en todas las corridas y máquinas) de CODUSU|NRO_HOGAR."""
+    claves = codusu.str.strip().str.strip('"') + "|" + nro_hogar.str.strip().str.strip('"')
+    return pd.util.hash_array(claves.to_numpy(dtype=object))
+
+
+# ---------------------- Sketches por fuente ----------------
+def _mascara_universo(d: pd.DataFrame, u: dict = UNIVERSO) -> pd.Series:
+    mask = d["ANO4"].between(*u["anios"])
+    if u.get("aglomerados") is not None:
+        mask &= d["AGLOMERADO"].isin(u["aglomerados"])
+    mask &= d["H15"] == 1
+    mask &= d["CH06"].between(*u["edad"])
+    mask &= d["ESTADO"].isin(u["estados"])
+    return mask.fillna(False).astype(bool)
+
+
+def sketches_fuente(fh, chunk_rows: int = CHUNK_ROWS) -> dict:
+    """
+    Recorre un archivo por bloques y devuelve {(ano4, trimestre): sketch},
+    con sketch = {"filas", "hogares" (HLL), "ingreso" (t-digest)}.
+    """
+    por_periodo = {}
+    lector = pd.read_csv(fh, sep=";", dtype=str, encoding="latin-1",
+                         usecols=lambda c: c.strip().upper() in COLS, chunksize=chunk_rows)
+    for bloque in lector:
+        bloque.columns = [c.strip().upper() for c in bloque.columns]
+        if not set(COLS) <= set(bloque.columns):
+            return {}
+        num = bloque[["ANO4", "TRIMESTRE", "AGLOMERADO", "H15", "CH06", "ESTADO", COL_INGRESO]] \
+            .apply(pd.to_numeric, errors="coerce")
+        hashes = hash_hogares(bloque["CODUSU"].fillna(""), bloque["NRO_HOGAR"].fillna(""))
+        universo = _mascara_universo(num).to_numpy()
+        ingreso = num[COL_INGRESO].to_numpy()
+
+        periodos = num[["ANO4", "TRIMESTRE"]].dropna().drop_duplicates().itertuples(index=False)
+        for ano, tri in periodos:
+            en = ((num["ANO4"] == ano) & (num["TRIMESTRE"] == tri)).to_numpy()
+            s = por_periodo.setdefault((int(ano), int(tri)), nuevo_sketch())
+            s["filas"] += int(en.sum())
+            hll_agregar(s["hogares"], hashes[en])
+            s["ingreso"] = tdigest_agregar(s["ingreso"], ingreso[en & universo])
+    return por_periodo
+
+
+def nuevo_sketch() -> dict:
+    return {"filas": 0, "hogares": hll_nuevo(), "ingreso": tdigest_nuevo()}
+
+
+def combinar_sketches(a: dict, b: dict) -> dict:
+    return {
+        "filas": a["filas"] + b["filas"],
+        "hogares": hll_combinar(a["hogares"], b["hogares"]),
+        "ingreso": tdigest_combinar(a["ingreso"], b["ingreso"]),
+    }
+
+
+def combinar_por(sketches: dict, clave) -> dict:
+    """Junta {(ano4, trimestre): sketch} por clave(periodo) (ej. por año)."""
+    out = {}
+    for periodo, s in sketches.items():
+        k = clave(periodo)
+        out[k] = combinar_sketches(out[k], s) if k in out else s
+    return out
+
+
+# ---------------------- Persistencia -----------------------
+def sketches_a_json(sketches: dict) -> str:
+    """Registros del HLL en base64; centroides como listas (para combinar entre procesos)."""
+    return json.dumps({
+        f"{a}-T{t}": {
+            "filas": s["filas"],
+            "hogares": base64.b64encode(s["hogares"].tobytes()).decode("ascii"),
+            "ingreso": {k: v.tolist() for k, v in s["ingreso"].items()},
+        }
+        for (a, t), s in sketches.items()
+    })
+
+
+def sketches_desde_json(texto: str) -> dict:
+    out = {}
+    for etiqueta, s in json.loads(texto).items():
+        a, t = map(int, etiqueta.split("-T"))
+        out[(a, t)] = {
+            "filas": s["filas"],
+            "hogares": np.frombuffer(base64.b64decode(s["hogares"]), dtype=np.uint8).copy(),
+            "ingreso": {k: np.asarray(v, dtype="float64") for k, v in s["ingreso"].items()},
+        }
+    return out
+
+
+# ---------------------- Reportes ----------------------------
+def resumen_periodos(sketches: dict) -> pd.DataFrame:
+    filas = []
+    for (a, t), s in sorted(sketches.items()):
+        hogares, err = hll_estimar(s["hogares"])
+        filas.append({
+            "PERIODO": f"{a}-T{t}", "filas": s["filas"],
+            "hogares_aprox": round(hogares), "hogares_min": round(hogares * (1 - err)),
+            "hogares_max": round(hogares * (1 + err)),
+            "n_ingreso": int(tdigest_total(s["ingreso"])),
+        })
+    return pd.DataFrame(filas)
+
+
+def cortes_por_anio(sketches: dict, cuantiles=CUANTILES) -> pd.DataFrame:
+    """Cuantiles de P47T por ANO4 (como los calcula eliminar_outliers_ingresos_por_anio)."""
+    filas = []
+    for ano, s in sorted(combinar_por(sketches, lambda p: p[0]).items()):
+        fila = {"ANO4": ano, "n": int(tdigest_total(s["ingreso"])), "centroides": len(s["ingreso"]["pesos"])}
+        for q in cuantiles:
+            est, lo, hi = tdigest_cuantil(s["ingreso"], q)
+            fila[f"q{q:g}"] = est
+            fila[f"q{q:g}_min"] = lo
+            fila[f"q{q:g}_max"] = hi
+        filas.append(fila)
+    return pd.DataFrame(filas)
+
+
+# ---------------------- Proceso principal -------------------
+def construir(input_dir: Path = INPUT_DIR) -> dict:
+    """Sketches por período de todas las fuentes (cada una en su hilo, después combinadas)."""
+    total = {}
+    for fuente, res in leer_fuentes(listar_fuentes(input_dir), sketches_fuente):
+        if isinstance(res, Exception):
+            print(f"   ! error leyendo {nombre_fuente(fuente)}: {res}")
+            continue
+        for periodo, s in res.items():
+            total[periodo] = combinar_sketches(total[periodo], s) if periodo in total else s
+        print(f"   + {nombre_fuente(fuente)}: {len(res)} período(s)")
+    return total
+
+
+def main():
+    print("1) Armando sketches por archivo y período…")
+    sketches = construir(INPUT_DIR)
+    if not sketches:
+        raise FileNotFoundError(f"No se encontraron TXT ni ZIP en {INPUT_DIR.resolve()}")
+
+    print("2) Combinando y resumiendo…")
+    OUT_DIR.mkdir(exist_ok=True)
+    periodos = resumen_periodos(sketches)
+    cortes = cortes_por_anio(sketches)
+    periodos.to_csv(OUT_DIR / "preview_hogares.csv", index=False)
+    cortes.to_csv(OUT_DIR / "preview_cortes_ingreso.csv", index=False)
+    (OUT_DIR / "preview_sketches.json").write_text(sketches_a_json(sketches), encoding="utf-8")
+
+    q = f"q{Q_OUTLIERS:g}"
+    print(cortes[["ANO4", "n", q, f"{q}_min", f"{q}_max"]].round(0).to_string(index=False))
+    print(f"✅ Listo: {OUT_DIR}/preview_hogares.csv y preview_cortes_ingreso.csv")
+
+
+if __name__ == "__main__":
+    main()
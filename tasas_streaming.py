@@ -0,0 +1,183 @@
+# ============================================================
+# TASAS LABORALES EN STREAMING DESDE LOS TXT CRUDOS
+# Sin limpiar ni materializar la base de personas: cada TXT se lee
+# por bloques, a cada bloque se le aplican las reglas de universo
+# (estilo filtrar_universo) y se acumulan sumas parciales de
+# PONDERA por período × aglomerado × ESTADO. Las parciales se
+# suman entre bloques/archivos (son combinables) y al final se
+# calculan las tasas. La memoria no depende del tamaño del archivo.
+#
+# Nota: en streaming no se resuelven duplicados (ver limpieza_tp).
+# ============================================================
+
+import pandas as pd
+from pathlib import Path
+
+from hogares import es_archivo_hogar
+from huellas_fuentes import descartar_copias
+
+# ---------------------- Configuración -----------------------
+INPUT_DIR = Path("data")
+OUTPUT_PATH = Path("processed") / "tasas_streaming.csv"
+SUMAS_PATH = Path("processed") / "tasas_sumas.csv"   # sumas con aperturas (servicio_tasas / eph tasas)
+
+CHUNK_ROWS = 200_000
+
+COLS_STREAM = ["ANO4", "TRIMESTRE", "AGLOMERADO", "H15", "CH06", "ESTADO", "PONDERA"]
+NIVELES = ["ano4", "trimestre", "aglomerado", "estado"]
+APERTURAS = ("CH04", "CAT_OCUP")   # sexo y categoría ocupacional
+
+# Reglas de universo (mismas que filtrar_universo, salvo que acá
+# se conservan inactivos porque entran en el denominador)
+REGLAS = {
+    "anios": (2016, 2025),
+    "aglomerados": None,     # None = todos (nacional)
+    "edad_min": 18,
+    "edad_max_valida": 110,
+}
+
+
+# ---------------------- Bloques -----------------------------
+def filtrar_bloque(df: pd.DataFrame, reglas: dict = REGLAS) -> pd.DataFrame:
+    """Aplica las reglas de universo a un bloque en una sola máscara."""
+    for c in COLS_STREAM:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+
+    mask = df["ANO4"].between(*reglas["anios"])
+    if reglas.get("aglomerados") is not None:
+        mask &= df["AGLOMERADO"].isin(reglas["aglomerados"])
+    mask &= df["H15"] == 1
+    mask &= df["CH06"].between(0, reglas["edad_max_valida"]) & (df["CH06"] >= reglas["edad_min"])
+    mask &= df["ESTADO"].isin([1, 2, 3])
+    mask &= df["PONDERA"].notna()
+    return df[mask]
+
+
+def sumas_parciales(df: pd.DataFrame, por=()) -> pd.Series:
+    """
+    PONDERA sumado por período × aglomerado × [por] × ESTADO. Con aperturas
+    los NaN de `por` quedan como grupo propio (ej. CAT_OCUP de los inactivos),
+    así sumar sobre la apertura devuelve el total.
+    """
+    claves = ["ANO4", "TRIMESTRE", "AGLOMERADO", *por, "ESTADO"]
+    s = df.groupby(claves, sort=False, dropna=not por)["PONDERA"].sum()
+    s.index = s.index.set_names([c.lower() for c in claves])
+    return s
+
+
+def combinar_parciales(a: pd.Series, b: pd.Series) -> pd.Series:
+    """Las parciales se combinan sumando (sirve entre bloques, archivos o procesos)."""
+    if a is None:
+        return b
+    return a.add(b, fill_value=0)
+
+
+def sumas_archivo(f: Path, reglas: dict = REGLAS, chunk_rows: int = CHUNK_ROWS, por=()) -> pd.Series:
+    """Recorre un TXT por bloques y devuelve sus sumas parciales (con aperturas `por`)."""
+    acumulado = None
+    columnas = COLS_STREAM + list(por)
+    lector = pd.read_csv(
+        f, sep=";", usecols=lambda c: c in columnas,
+        dtype=str, encoding="latin-1", chunksize=chunk_rows
+    )
+    for bloque in lector:
+        if not set(columnas) <= set(bloque.columns):
+            return acumulado
+        for c in por:
+            bloque[c] = pd.to_numeric(bloque[c], errors="coerce")
+        parcial = sumas_parciales(filtrar_bloque(bloque, reglas), por)
+        acumulado = combinar_parciales(acumulado, parcial)
+    return acumulado
+
+
+# ---------------------- Tasas ------------------------------
+def tasas_desde_parciales(sumas: pd.Series) -> pd.DataFrame:
+    """
+    De sumas por (…, estado) a tasas por (…):
+      actividad    = (1 + 2) / (1 + 2 + 3) * 100
+      empleo       = 1 / (1 + 2 + 3) * 100
+      desocupacion = 2 / (1 + 2) * 100
+    """
+    t = sumas.unstack("estado", fill_value=0).reindex(columns=[1, 2, 3], fill_value=0)
+    ocup, desoc, inac = t[1], t[2], t[3]
+    pob = ocup + desoc + inac
+    pea = ocup + desoc
+
+    out = pd.DataFrame({
+        "poblacion": pob,
+        "tasa_actividad": pea / pob.where(pob > 0) * 100,
+        "tasa_empleo": ocup / pob.where(pob > 0) * 100,
+        "tasa_desocupacion": desoc / pea.where(pea > 0) * 100,
+    }).reset_index()
+
+    if {"ano4", "trimestre"} <= set(out.columns):
+        out = out.sort_values(list(t.index.names)).reset_index(drop=True)
+        out.insert(2, "PERIODO", out["ano4"].astype(int).astype(str) + "-T" + out["trimestre"].astype(int).astype(str))
+    return out
+
+
+def archivos_txt(input_dir: Path) -> list:
+    """usu_individual sueltos de input_dir, sin copias exactas."""
+    files = sorted(f for f in Path(input_dir).glob("*.txt") if not es_archivo_hogar(f))
+    return [f for f, _ in descartar_copias([(f, None) for f in files])]
+
+
+def sumas_streaming(input_dir: Path = INPUT_DIR, reglas: dict = REGLAS, por=()) -> pd.Series:
+    """Sumas parciales de todos los TXT, combinadas."""
+    files = archivos_txt(input_dir)
+    if not files:
+        raise FileNotFoundError(f"No se encontraron TXT en {Path(input_dir).resolve()}")
+
+    total = None
+    for f in files:
+        try:
+            parcial = sumas_archivo(f, reglas, por=por)
+        except Exception as e:
+            print(f"   ! error leyendo {f.name}: {e}")
+            continue
+        if parcial is None:
+            continue
+        total = combinar_parciales(total, parcial)
+        print(f"   + procesado: {f.name}")
+
+    if total is None:
+        raise ValueError("No se pudo leer ningún archivo con las columnas esperadas.")
+    return total
+
+
+def tasas_streaming(input_dir: Path = INPUT_DIR, reglas: dict = REGLAS) -> pd.DataFrame:
+    return tasas_desde_parciales(sumas_streaming(input_dir, reglas))
+
+
+def cargar_sumas(input_dir: Path = INPUT_DIR, path: Path = SUMAS_PATH) -> pd.Series:
+    """
+    Sumas por período × aglomerado × CH04 × CAT_OCUP × ESTADO (con
+    inactivos, todos los aglomerados). Se guardan en path y se reusan
+    mientras ningún TXT de input_dir sea más nuevo que el archivo.
+    """
+    path = Path(path)
+    files = archivos_txt(input_dir)
+    if path.exists() and files and path.stat().st_mtime >= max(f.stat().st_mtime for f in files):
+        niveles = NIVELES[:3] + [c.lower() for c in APERTURAS] + ["estado"]
+        return pd.read_csv(path).set_index(niveles)["pondera"]
+
+    sumas = sumas_streaming(input_dir, por=APERTURAS)
+    path.parent.mkdir(exist_ok=True)
+    sumas.rename("pondera").reset_index().to_csv(path, index=False)
+    return sumas
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    print("1) Tasas en streaming desde los TXT…")
+    tasas = tasas_streaming(INPUT_DIR)
+
+    OUTPUT_PATH.parent.mkdir(exist_ok=True)
+    tasas.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ Listo: {OUTPUT_PATH} ({len(tasas)} filas)")
+
+    print(tasas[tasas["aglomerado"].isin([7, 9])].round(2).tail(6).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# ============================================================
+# FLUJOS DEL MERCADO LABORAL (MATRICES DE TRANSICIÓN)
+# Además de las tasas (stocks) calculamos los flujos entre
+# ocupado / desocupado / inactivo de un trimestre al siguiente,
+# ponderados con PONDERA, por aglomerado.
+#
+# Usa el índice del panel (panel_vinculacion.py): los pares de
+# trimestres consecutivos son filas vecinas del índice, así que
+# todas las matrices salen de un único np.bincount ponderado.
+# ============================================================
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+from panel_vinculacion import _columna, construir_indice_panel, etiqueta_periodo
+
+# ---------------------- Configuración -----------------------
+OUTPUT_PATH = Path("processed") / "transiciones_estado.csv"
+
+# ESTADO EPH → código 0..2
+ESTADOS = {1: "ocupado", 2: "desocupado", 3: "inactivo"}
+N_EST = len(ESTADOS)
+
+
+# ---------------------- Cálculo ----------------------------
+def matriz_transiciones(df: pd.DataFrame, indice: pd.DataFrame = None):
+    """
+    Suma ponderada de transiciones de ESTADO entre trimestres consecutivos.
+
+    Devuelve (cubo, periodos, aglomerados):
+      - cubo[p, a, i, j] = PONDERA (del trimestre de origen) de las personas
+        del aglomerado a que pasan del estado i en periodos[p] al estado j
+        en periodos[p] + 1
+      - periodos    : PERIODO_IDX de origen
+      - aglomerados : códigos de AGLOMERADO
+    """
+    if indice is None:
+        indice = construir_indice_panel(df)
+
+    ids = indice["ID_PANEL"].to_numpy()
+    per = indice["PERIODO_IDX"].to_numpy()
+    filas = indice["FILA"].to_numpy()
+
+    # pares = filas vecinas del índice, misma persona, trimestre siguiente
+    par = (ids[1:] == ids[:-1]) & (per[1:] - per[:-1] == 1)
+    origen, destino = filas[:-1][par], filas[1:][par]
+    per_origen = per[:-1][par]
+
+    estado = pd.to_numeric(_columna(df, "ESTADO"), errors="coerce").to_numpy(dtype=float)
+    peso = pd.to_numeric(_columna(df, "PONDERA"), errors="coerce").to_numpy(dtype=float)
+    aglo = pd.to_numeric(_columna(df, "AGLOMERADO"), errors="coerce").to_numpy(dtype=float)
+
+    e0, e1 = estado[origen], estado[destino]
+    w, a = peso[origen], aglo[origen]
+    ok = np.isin(e0, list(ESTADOS)) & np.isin(e1, list(ESTADOS)) & ~np.isnan(w) & ~np.isnan(a)
+    e0, e1, w, a, per_origen = e0[ok], e1[ok], w[ok], a[ok], per_origen[ok]
+
+    periodos, p_cod = np.unique(per_origen, return_inverse=True)
+    aglomerados, a_cod = np.unique(a.astype(np.int64), return_inverse=True)
+    n_per, n_ag = len(periodos), len(aglomerados)
+
+    celda = ((p_cod * n_ag + a_cod) * N_EST + (e0.astype(np.int64) - 1)) * N_EST + (e1.astype(np.int64) - 1)
+    cubo = np.bincount(celda, weights=w, minlength=n_per * n_ag * N_EST * N_EST)
+
+    return cubo.reshape(n_per, n_ag, N_EST, N_EST), periodos, aglomerados
+
+
+def tabla_transiciones(df: pd.DataFrame, indice: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Versión en formato largo de matriz_transiciones():
+    una fila por período × aglomerado × estado_origen × estado_destino,
+    con la población ponderada y la proporción sobre el estado de origen.
+    """
+    cubo, periodos, aglomerados = matriz_transiciones(df, indice)
+
+    total_origen = cubo.sum(axis=3, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        prop = np.where(total_origen > 0, cubo / total_origen, np.nan)
+
+    p, a, i, j = np.indices(cubo.shape).reshape(4, -1)
+    nombres = np.array(list(ESTADOS.values()))
+    tabla = pd.DataFrame({
+        "periodo_origen": [etiqueta_periodo(x) for x in periodos[p]],
+        "periodo_destino": [etiqueta_periodo(x + 1) for x in periodos[p]],
+        "aglomerado": aglomerados[a],
+        "estado_origen": nombres[i],
+        "estado_destino": nombres[j],
+        "pondera": cubo.ravel(),
+        "proporcion": prop.ravel(),
+    })
+
+    # sacamos combinaciones período × aglomerado sin pares
+    con_datos = cubo.sum(axis=(2, 3))[p, a] > 0
+    return tabla[con_datos].reset_index(drop=True)
+
+
+# ---------------------- Proceso principal -------------------
+def main():
+    from limpieza_tp import INPUT_DIR, cargar_multiples_txt, tipar_columnas
+
+    print("1) Cargando TXT…")
+    df = tipar_columnas(cargar_multiples_txt(INPUT_DIR))
+
+    print("2) Índice del panel + transiciones…")
+    tabla = tabla_transiciones(df)
+    print(f"   Filas de la tabla: {len(tabla)}")
+
+    OUTPUT_PATH.parent.mkdir(exist_ok=True)
+    tabla.to_csv(OUTPUT_PATH, index=False)
+    print(f"✅ Listo: {OUTPUT_PATH}")
+
+    if tabla.empty:
+        print("   (no se encontraron pares del panel entre trimestres consecutivos)")
+        return
+
+    # (Opcional) última matriz de los aglomerados del TP
+    ultimo = tabla["periodo_origen"].iloc[-1]
+    for ag in [7, 9]:
+        sub = tabla[(tabla["periodo_origen"] == ultimo) & (tabla["aglomerado"] == ag)]
+        if sub.empty:
+            continue
+        print(f"\nAglomerado {ag} – {ultimo}:")
+        print(sub.pivot(index="estado_origen", columns="estado_destino", values="proporcion").round(3))
+
+
+if __name__ == "__main__":
+    main()
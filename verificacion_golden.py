@@ -0,0 +1,281 @@
+# ============================================================
+# VERIFICACIÓN CONTRA SALIDAS "GOLDEN"
+# Antes de aceptar una optimización de resolver_duplicados, de
+# eliminar_outliers_ingresos_por_anio, de las tasas o de
+# model_for_city, las salidas tienen que ser las mismas. En vez de
+# diffear CSV de varios MB, se guarda una huella de cada salida:
+#   - por partición (período × aglomerado si existen esas columnas):
+#       filas y hash de filas independiente del orden
+#       (suma mod 2^64 de los hashes de cada fila)
+#   - por partición y columna: hash de la columna (mismo criterio),
+#     faltantes, suma, media, desvío, mínimo y máximo
+#     (las columnas predicho / imputado quedan como checksums)
+# y se compara una corrida nueva contra esa huella con tolerancias:
+# el reporte dice qué archivo / partición / columna / métrica difiere.
+#   python verificacion_golden.py registrar  [archivos…]
+#   python verificacion_golden.py verificar  [archivos…] [--rtol 1e-9] [--atol 1e-9]
+# ============================================================
+
+import json
+import sys
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+# ---------------------- Configuración -----------------------
+GOLDEN_DIR = Path("processed") / "golden"
+OUT_PATH = Path("processed") / "verificacion_golden.csv"
+
+# Salidas del pipeline que se verifican por defecto (las que existan)
+SALIDAS = [
+    "personas_2016_2025_todos_trimestres_limpio.csv",
+    "personas_2016_2025_todos_trimestres_limpio_sin_outliers.csv",
+    "personas_T2_2016_2025_posadas_comodoro_limpio_final.csv",
+    "processed/eph_train_ingreso_real.csv",
+    "processed/eph_missing_ingreso_real.csv",
+    "processed/train_pred_posadas.csv",
+    "processed/train_pred_rada_tilly.csv",
+    "processed/missing_imputado_posadas.csv",
+    "processed/missing_imputado_rada_tilly.csv",
+    "processed/tasas_streaming.csv",
+]
+
+# Columnas de partición, en orden de preferencia (crudas o ya normalizadas)
+PARTICIONES = [["ANO4", "TRIMESTRE", "AGLOMERADO"], ["ano4", "trimestre", "aglomerado"]]
+
+DECIMALES = 6     # los float se redondean antes de hashear (ruido de la última cifra)
+RTOL = 1e-9
+ATOL = 1e-9
+METRICAS = ["suma", "media", "desvio", "minimo", "maximo"]
+
+
+# ---------------------- Hashes -----------------------------
+def _columnas_particion(df: pd.DataFrame) -> list:
+    for cols in PARTICIONES:
+        presentes = [c for c in cols if c in df.columns]
+        if presentes:
+            return presentes
+    return []
+
+
+def _etiqueta(v) -> str:
+    """'2016' tanto si la columna se leyó como int como si quedó float (2016.0)."""
+    if isinstance(v, (float, np.floating)) and float(v).is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _normalizar(s: pd.Series) -> pd.Series:
+    """int y float con el mismo valor hashean igual (1 == 1.0); texto como str."""
+    if pd.api.types.is_bool_dtype(s) or pd.api.types.is_numeric_dtype(s):
+        return s.astype("float64").round(DECIMALES)
+    return s.astype("string")
+
+
+def _sumas_por_grupo(h: np.ndarray, orden: np.ndarray, inicios: np.ndarray) -> np.ndarray:
+    """Suma uint64 (con desborde, mod 2^64) de h por grupo ya ordenado."""
+    if not len(h):
+        return np.zeros(0, dtype=np.uint64)
+    return np.add.reduceat(h[orden], inicios)
+
+
+def huella_salida(df: pd.DataFrame) -> dict:
+    """Huella por partición: filas, hash de filas y hash + estadísticas por columna."""
+    part = _columnas_particion(df)
+    if part:
+        codigos = df.groupby(part, sort=True, dropna=False).ngroup().to_numpy()
+        claves = df[part].drop_duplicates().sort_values(part)
+        etiquetas = ["|".join(map(_etiqueta, fila)) for fila in claves.itertuples(index=False)]
+    else:
+        codigos = np.zeros(len(df), dtype=np.int64)
+        etiquetas = ["todo"]
+
+    orden = np.argsort(codigos, kind="stable")
+    limites = np.flatnonzero(np.diff(codigos[orden])) + 1
+    inicios = np.concatenate([[0], limites]) if len(df) else np.zeros(0, dtype=np.int64)
+    filas = np.diff(np.append(inicios, len(df)))
+
+    norm = pd.DataFrame({c: _normalizar(df[c]) for c in df.columns})
+    hash_filas = _sumas_por_grupo(pd.util.hash_pandas_object(norm, index=False).to_numpy(), orden, inicios)
+
+    columnas = {}
+    for c in df.columns:
+        s = norm[c]
+        hc = _sumas_por_grupo(pd.util.hash_pandas_object(s, index=False).to_numpy(), orden, inicios)
+        nulos = np.bincount(codigos, weights=s.isna().to_numpy(), minlength=len(etiquetas))
+        stats = {"hash": [str(x) for x in hc], "faltantes": nulos.astype(int).tolist()}
+        if pd.api.types.is_float_dtype(s):
+            g = s.groupby(codigos)
+            agg = g.agg(["sum", "mean", "std", "min", "max"]).reindex(range(len(etiquetas)))
+            for m, a in zip(METRICAS, ["sum", "mean", "std", "min", "max"]):
+                stats[m] = [None if pd.isna(v) else float(v) for v in agg[a]]
+        columnas[str(c)] = stats
+
+    return {
+        "particion": part,
+        "filas": int(len(df)),
+        "columnas": [str(c) for c in df.columns],
+        "particiones": etiquetas,
+        "filas_por_particion": filas.astype(int).tolist(),
+        "hash_filas": [str(x) for x in hash_filas],
+        "por_columna": columnas,
+    }
+
+
+# ---------------------- Persistencia -----------------------
+def ruta_golden(archivo) -> Path:
+    return GOLDEN_DIR / (Path(archivo).name + ".json")
+
+
+def registrar(archivo):
+    huella = huella_salida(pd.read_csv(archivo, low_memory=False))
+    huella["archivo"] = str(archivo)
+    GOLDEN_DIR.mkdir(parents=True, exist_ok=True)
+    with open(ruta_golden(archivo), "w", encoding="utf-8") as fh:
+        json.dump(huella, fh, ensure_ascii=False)
+    return huella
+
+
+# ---------------------- Comparación ------------------------
+def _cerca(a, b, rtol, atol) -> bool:
+    if a is None or b is None:
+        return a is None and b is None
+    return abs(a - b) <= atol + rtol * abs(b)
+
+
+def comparar(ref: dict, nueva: dict, rtol: float = RTOL, atol: float = ATOL) -> list:
+    """
+    Diferencias como dicts (particion, columna, metrica, esperado, obtenido).
+    Numéricas: se comparan las estadísticas con tolerancia (un hash distinto
+    por ruido de redondeo no cuenta). No numéricas: el hash, sin tolerancia.
+    Si todas las columnas coinciden pero el hash de filas no, los valores
+    se recombinaron entre filas: se informa como 'hash_filas'.
+    """
+    dif = []
+
+    def anotar(particion, columna, metrica, esperado, obtenido):
+        dif.append({"particion": particion, "columna": columna, "metrica": metrica,
+                    "esperado": esperado, "obtenido": obtenido})
+
+    faltan = [c for c in ref["columnas"] if c not in nueva["columnas"]]
+    sobran = [c for c in nueva["columnas"] if c not in ref["columnas"]]
+    for c in faltan:
+        anotar("", c, "columna_faltante", c, None)
+    for c in sobran:
+        anotar("", c, "columna_nueva", None, c)
+    if ref["particion"] != nueva["particion"]:
+        anotar("", "", "particion", ",".join(ref["particion"]), ",".join(nueva["particion"]))
+        return dif
+
+    i_ref = {p: i for i, p in enumerate(ref["particiones"])}
+    i_new = {p: i for i, p in enumerate(nueva["particiones"])}
+    for p in ref["particiones"]:
+        if p not in i_new:
+            anotar(p, "", "particion_faltante", ref["filas_por_particion"][i_ref[p]], 0)
+    for p in nueva["particiones"]:
+        if p not in i_ref:
+            anotar(p, "", "particion_nueva", 0, nueva["filas_por_particion"][i_new[p]])
+
+    comunes = [c for c in ref["columnas"] if c in nueva["por_columna"]]
+    for p, i in i_ref.items():
+        j = i_new.get(p)
+        if j is None:
+            continue
+        fr, fn = ref["filas_por_particion"][i], nueva["filas_por_particion"][j]
+        if fr != fn:
+            anotar(p, "", "filas", fr, fn)
+        if ref["hash_filas"][i] == nueva["hash_filas"][j] and not (faltan or sobran):
+            continue  # partición idéntica
+
+        distintas = 0
+        for c in comunes:
+            cr, cn = ref["por_columna"][c], nueva["por_columna"][c]
+            if cr["hash"][i] == cn["hash"][j]:
+                continue
+            distintas += 1
+            fuera = []
+            if cr["faltantes"][i] != cn["faltantes"][j]:
+                fuera.append(("faltantes", cr["faltantes"][i], cn["faltantes"][j]))
+            for m in METRICAS:
+                if m in cr and m in cn and not _cerca(cn[m][j], cr[m][i], rtol, atol):
+                    fuera.append((m, cr[m][i], cn[m][j]))
+            if not fuera and "suma" not in cr:
+                fuera.append(("hash", cr["hash"][i], cn["hash"][j]))  # no numérica: sin tolerancia
+            for metrica, e, o in fuera:
+                anotar(p, c, metrica, e, o)
+        if not (distintas or faltan or sobran) and ref["hash_filas"][i] != nueva["hash_filas"][j]:
+            anotar(p, "", "hash_filas", ref["hash_filas"][i], nueva["hash_filas"][j])
+    return dif
+
+
+def verificar(archivo, rtol: float = RTOL, atol: float = ATOL) -> pd.DataFrame:
+    """Compara el archivo contra su huella golden; un DataFrame vacío = todo igual."""
+    with open(ruta_golden(archivo), encoding="utf-8") as fh:
+        ref = json.load(fh)
+    nueva = huella_salida(pd.read_csv(archivo, low_memory=False))
+    out = pd.DataFrame(comparar(ref, nueva, rtol, atol),
+                       columns=["particion", "columna", "metrica", "esperado", "obtenido"])
+    out.insert(0, "archivo", str(archivo))
+    return out
+
+
+# ---------------------- Línea de comandos ------------------
+def _argumentos(argv) -> tuple:
+    """(archivos, rtol, atol) desde 'archivo… --rtol X --atol X' (también --rtol=X)."""
+    archivos, opciones = [], {"--rtol": RTOL, "--atol": ATOL}
+    it = iter(argv)
+    for arg in it:
+        nombre, igual, valor = arg.partition("=")
+        if nombre in opciones:
+            valor = valor if igual else next(it, "")
+            try:
+                opciones[nombre] = float(valor)
+            except ValueError:
+                raise SystemExit(f"{nombre} necesita un número (recibido: {valor!r})")
+        else:
+            archivos.append(arg)
+    return archivos, opciones["--rtol"], opciones["--atol"]
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in ("registrar", "verificar"):
+        print("uso: python verificacion_golden.py registrar|verificar [archivos…] [--rtol X] [--atol X]")
+        return 2
+
+    accion, resto = argv[0], argv[1:]
+    archivos, rtol, atol = _argumentos(resto)
+    archivos = archivos or [a for a in SALIDAS if Path(a).exists()]
+
+    if accion == "registrar":
+        for a in archivos:
+            h = registrar(a)
+            print(f"   + {a}: {h['filas']} filas, {len(h['particiones'])} particiones → {ruta_golden(a)}")
+        print(f"✅ Listo: huellas golden en {GOLDEN_DIR}")
+        return 0
+
+    reportes = []
+    for a in archivos:
+        if not ruta_golden(a).exists():
+            print(f"   ? {a}: sin huella golden (correr 'registrar' primero)")
+            continue
+        r = verificar(a, rtol, atol)
+        reportes.append(r)
+        if r.empty:
+            print(f"   ✅ {a}: igual")
+        else:
+            partes = r["particion"].replace("", np.nan).dropna().nunique()
+            cols = sorted(set(r["columna"]) - {""})
+            print(f"   ⚠️ {a}: {len(r)} diferencias en {partes} particiones; columnas: {', '.join(cols[:10])}")
+
+    reporte = pd.concat(reportes, ignore_index=True) if reportes else pd.DataFrame()
+    if not reporte.empty:
+        OUT_PATH.parent.mkdir(exist_ok=True)
+        reporte.to_csv(OUT_PATH, index=False)
+        print(f"Detalle → {OUT_PATH}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())